@@ -0,0 +1,266 @@
+"""
+JWT authentication that trusts the user claims signed into the token,
+so requests that only check who the user is and whether they are staff
+do not load the user from the database.
+"""
+import copy
+import threading
+from collections import OrderedDict
+from time import monotonic
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+)
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken, Token
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from accounts.models import User
+from core.cache import is_shared_between_processes
+
+
+USER_CLAIMS = ("email", "is_staff")
+
+# Current claims of each user, published on login and on every change
+USER_CLAIMS_KEY = "accounts:user-claims:{user_id}"
+
+LOCAL_USER_CACHE_SIZE = 1024
+
+# Least recently used first
+_local_users: OrderedDict[int, tuple[float, User]] = OrderedDict()
+_local_users_lock = threading.Lock()
+
+
+def get_user_claims(user: User) -> dict:
+    return {claim: getattr(user, claim) for claim in USER_CLAIMS}
+
+
+def get_current_claims(user: User) -> dict:
+    return {**get_user_claims(user), "is_active": user.is_active}
+
+
+def record_user_change(user: User) -> None:
+    """
+    Publish the current claims of a changed user, so tokens signed with
+    older ones fall back to the database, and drop the local copy.
+    Kept as long as a refresh token lives, since refreshing re-signs them.
+    """
+    cache.set(
+        USER_CLAIMS_KEY.format(user_id=user.pk),
+        get_current_claims(user),
+        api_settings.REFRESH_TOKEN_LIFETIME.total_seconds(),
+    )
+    with _local_users_lock:
+        _local_users.pop(user.pk, None)
+
+
+def record_user_claims(user: User) -> None:
+    """
+    Publish the claims of a user just read from the database,
+    unless a change published newer ones meanwhile.
+    """
+    cache.add(
+        USER_CLAIMS_KEY.format(user_id=user.pk),
+        get_current_claims(user),
+        api_settings.REFRESH_TOKEN_LIFETIME.total_seconds(),
+    )
+
+
+async def arecord_user_claims(user: User) -> None:
+    await cache.aadd(
+        USER_CLAIMS_KEY.format(user_id=user.pk),
+        get_current_claims(user),
+        api_settings.REFRESH_TOKEN_LIFETIME.total_seconds(),
+    )
+
+
+def published_claims_key(token: Token) -> str | None:
+    """
+    Return the cache key of the claims to compare the token with.
+    Without claims in the token, or when changes published by one
+    worker would not reach the others, return None: the token has to
+    be checked against the database.
+    """
+    if any(claim not in token for claim in USER_CLAIMS):
+        return None
+    if not is_shared_between_processes(DEFAULT_CACHE_ALIAS):
+        return None
+    return USER_CLAIMS_KEY.format(user_id=token[api_settings.USER_ID_CLAIM])
+
+
+def claims_match(token: Token, current: dict | None) -> bool:
+    return current == {
+        **{claim: token[claim] for claim in USER_CLAIMS}, "is_active": True
+    }
+
+
+def has_current_claims(token: Token) -> bool:
+    """
+    Return whether the token claims match the published ones.
+    Without published claims, e.g. once the cache evicted them,
+    the token has to be checked against the database.
+    """
+    key = published_claims_key(token)
+    return key is not None and claims_match(token, cache.get(key))
+
+
+async def ahas_current_claims(token: Token) -> bool:
+    key = published_claims_key(token)
+    return key is not None and claims_match(token, await cache.aget(key))
+
+
+def load_user(user_id: int) -> User:
+    """
+    Return the user row from a small process-local cache
+    that keeps it for ACCOUNTS_USER_CACHE_TIMEOUT seconds.
+    :raises User.DoesNotExist: If the user was deleted.
+    """
+    with _local_users_lock:
+        cached = _local_users.get(user_id)
+        if cached is not None and cached[0] >= monotonic():
+            _local_users.move_to_end(user_id)
+            # Requests must not see each other's changes to the instance
+            return copy.copy(cached[1])
+
+    user = User.objects.get(pk=user_id)
+    with _local_users_lock:
+        _local_users[user_id] = (
+            monotonic() + settings.ACCOUNTS_USER_CACHE_TIMEOUT, user
+        )
+        _local_users.move_to_end(user_id)
+        while len(_local_users) > LOCAL_USER_CACHE_SIZE:
+            _local_users.popitem(last=False)
+    return copy.copy(user)
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """
+    Refresh token carrying the user claims,
+    which its access tokens copy.
+    """
+
+    @classmethod
+    def for_user(cls, user: User) -> "ClaimsRefreshToken":
+        token = super().for_user(user)
+        token.payload.update(get_user_claims(user))
+        record_user_claims(user)
+        return token
+
+
+class ClaimsUser(TokenUser):
+    """
+    User backed by the token claims. Attributes outside the claims,
+    permissions included, come from the user row, loaded on first use.
+    """
+
+    @cached_property
+    def id(self) -> int:
+        # Tokens carry the id as a string
+        return User._meta.pk.to_python(
+            self.token[api_settings.USER_ID_CLAIM]
+        )
+
+    @cached_property
+    def pk(self) -> int:
+        return self.id
+
+    @cached_property
+    def email(self) -> str:
+        return self.token["email"]
+
+    @cached_property
+    def user(self) -> User:
+        return load_user(self.id)
+
+    @property
+    def is_superuser(self) -> bool:
+        return self.user.is_superuser
+
+    def get_all_permissions(self, obj: object = None) -> set:
+        return self.user.get_all_permissions(obj)
+
+    def has_perm(self, perm: str, obj: object = None) -> bool:
+        return self.user.has_perm(perm, obj)
+
+    def has_perms(self, perm_list: list[str], obj: object = None) -> bool:
+        return self.user.has_perms(perm_list, obj)
+
+    def has_module_perms(self, module: str) -> bool:
+        return self.user.has_module_perms(module)
+
+    def __str__(self) -> str:
+        return self.email
+
+    def __getattr__(self, attr: str) -> object:
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self.user, attr)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Authenticate with the claims of tokens issued by ClaimsRefreshToken
+    while they match the published ones. Older tokens, tokens of users
+    changed since they were issued, users whose claims are no longer
+    cached and every token when the cache is not shared between
+    processes are checked against the database like JWTAuthentication.
+    """
+
+    def get_user(self, validated_token: Token) -> User | ClaimsUser:
+        if api_settings.USER_ID_CLAIM in validated_token and (
+            has_current_claims(validated_token)
+        ):
+            return ClaimsUser(validated_token)
+        user = super().get_user(validated_token)
+        # Lets the next requests with current claims skip the database
+        record_user_claims(user)
+        return user
+
+    async def aget_user(self, validated_token: Token) -> User | ClaimsUser:
+        """
+        Like get_user, looking the user up with the async ORM.
+        """
+        if api_settings.USER_ID_CLAIM in validated_token and (
+            await ahas_current_claims(validated_token)
+        ):
+            return ClaimsUser(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            )
+        try:
+            user = await self.user_model.objects.aget(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(
+                _("User not found"), code="user_not_found"
+            )
+        self.check_user(user, validated_token)
+        await arecord_user_claims(user)
+        return user
+
+    def check_user(self, user: User, validated_token: Token) -> None:
+        """
+        The checks JWTAuthentication.get_user runs on the loaded user.
+        """
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive"
+            )
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."),
+                code="password_changed",
+            )
@@ -0,0 +1,110 @@
+"""
+Password hashing on a bounded pool of threads.
+
+Hashing is CPU bound by design and hashlib releases the GIL while it
+runs. The pool caps how many hashes run at once, so registration or
+login bursts cannot oversubscribe the cores. It does not free the
+request thread, which blocks until its hash is done. Once all hashers
+are busy and the queue is full, requests wait ACCOUNTS_HASHING_WAIT
+seconds for a slot and are then turned away with 503 and Retry-After.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class HashingUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many sign-ins at once, try again shortly."
+    default_code = "hashing_unavailable"
+
+    def __init__(self, wait: int) -> None:
+        super().__init__()
+        # Sent as Retry-After by the DRF exception handler
+        self.wait = wait
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """
+    PBKDF2 with the iteration count set by PASSWORD_HASH_ITERATIONS.
+    Hashes with another count are rehashed on the next login.
+    """
+
+    @property
+    def iterations(self) -> int:
+        return (
+            settings.PASSWORD_HASH_ITERATIONS
+            or hashers.PBKDF2PasswordHasher.iterations
+        )
+
+
+class HashingPool:
+    def __init__(self, workers: int, queue_size: int, wait: float) -> None:
+        self.executor = ThreadPoolExecutor(
+            workers, thread_name_prefix="password-hashing"
+        )
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+        self.wait = wait
+
+    def run(self, function: Callable, *args: object) -> object:
+        """
+        Run the function on the pool and return its result,
+        blocking the calling thread until it is done.
+        :raises HashingUnavailable: If no slot frees up in time.
+        """
+        if not self.slots.acquire(timeout=self.wait):
+            raise HashingUnavailable(max(1, round(self.wait)))
+
+        def call() -> object:
+            try:
+                return function(*args)
+            finally:
+                self.slots.release()
+
+        try:
+            future = self.executor.submit(call)
+        except BaseException:
+            self.slots.release()
+            raise
+        return future.result()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> HashingPool:
+    # Created on first use, so forked workers do not share it
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = HashingPool(
+                settings.ACCOUNTS_HASHING_WORKERS,
+                settings.ACCOUNTS_HASHING_QUEUE,
+                settings.ACCOUNTS_HASHING_WAIT,
+            )
+        return _pool
+
+
+def hash_password(password: str) -> str:
+    return get_pool().run(hashers.make_password, password)
+
+
+def check_password_hash(password: str, encoded: str) -> tuple[bool, bool]:
+    """
+    Return whether the password matches the hash
+    and whether the hash should be replaced by a current one.
+    """
+    def check() -> tuple[bool, bool]:
+        outdated = []
+        correct = hashers.check_password(
+            password, encoded, setter=outdated.append
+        )
+        return correct, bool(outdated)
+
+    return get_pool().run(check)
@@ -1,7 +1,10 @@
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from accounts.hashing import check_password_hash, hash_password
+
 
 class UserManager(BaseUserManager):
     """Define a model manager for a User model with no username field."""
@@ -62,3 +65,23 @@ class User(AbstractUser):
     REQUIRED_FIELDS = []
 
     objects = UserManager()
+
+    def set_password(self, raw_password: str | None) -> None:
+        """Hash the password on the hashing pool."""
+        self.password = (
+            make_password(None) if raw_password is None
+            else hash_password(raw_password)
+        )
+        self._password = raw_password
+
+    def check_password(self, raw_password: str) -> bool:
+        """
+        Check the password on the hashing pool,
+        rehashing it if the hasher settings changed.
+        """
+        correct, outdated = check_password_hash(raw_password, self.password)
+        if correct and outdated:
+            self.set_password(raw_password)
+            self._password = None
+            self.save(update_fields=["password"])
+        return correct
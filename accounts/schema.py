@@ -0,0 +1,20 @@
+"""
+OpenAPI extensions for drf_spectacular, loaded by AccountsConfig.ready.
+"""
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from drf_spectacular.drainage import set_override
+
+from accounts.authentication import ClaimsJWTAuthentication
+
+
+class ClaimsJWTScheme(SimpleJWTScheme):
+    """
+    Describe ClaimsJWTAuthentication as the bearer JWT it extends.
+    """
+
+    target_class = "accounts.authentication.ClaimsJWTAuthentication"
+
+
+# Both authenticators take the same token, so they share the jwtAuth
+# scheme instead of warning about two components under one name
+set_override(ClaimsJWTAuthentication, "suppress_collision_warning", True)
@@ -2,6 +2,13 @@ from typing import Any
 
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+
+from accounts.authentication import ClaimsRefreshToken, get_user_claims
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -31,3 +38,27 @@ class UserSerializer(serializers.ModelSerializer):
             user.save()
 
         return user
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = ClaimsRefreshToken
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Sign the current user claims into refreshed tokens, so rotated
+    refresh tokens never keep a stale staff flag alive.
+    """
+
+    token_class = ClaimsRefreshToken
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, str]:
+        refresh = self.token_class(attrs["refresh"])
+        user = get_user_model().objects.filter(**{
+            api_settings.USER_ID_FIELD: refresh.get(
+                api_settings.USER_ID_CLAIM
+            )
+        }).first()
+        if user is not None:
+            refresh.payload.update(get_user_claims(user))
+        return super().validate({**attrs, "refresh": str(refresh)})
@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.authentication import record_user_change
+from accounts.models import User
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_claims(instance: User, **kwargs: dict) -> None:
+    record_user_change(instance)
+
+
+@receiver(post_delete, sender=User)
+def revoke_user_claims(instance: User, **kwargs: dict) -> None:
+    instance.is_active = False
+    record_user_change(instance)
@@ -1,9 +1,31 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from drf_spectacular.generators import SchemaGenerator
 from rest_framework import status
 from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from accounts.authentication import (
+    USER_CLAIMS_KEY,
+    ClaimsRefreshToken,
+    ClaimsUser,
+)
+from accounts.hashing import HashingPool, HashingUnavailable
 
 
 USER_CREATE_URL = reverse("accounts:create")
+ME_URL = reverse("accounts:me")
+TOKEN_URL = reverse("accounts:token_obtain_pair")
+TOKEN_REFRESH_URL = reverse("accounts:token_refresh")
+GENRE_URL = reverse("theatre:genre-list")
 
 
 class CustomUserTest(APITestCase):
@@ -30,3 +52,228 @@ class CustomUserTest(APITestCase):
         }
         response = self.client.post(USER_CREATE_URL, payload)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ClaimsAuthenticationTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            "staff@test.com", "mypass1!s", is_staff=True
+        )
+        # The test cache is locmem, stand in for redis
+        patcher = mock.patch(
+            "accounts.authentication.is_shared_between_processes",
+            return_value=True,
+        )
+        self.shared = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def authenticate(self, token: RefreshToken) -> None:
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {token.access_token}"
+        )
+
+    def user_queries(self, method: str, url: str, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(url, data)
+        return response, [
+            query for query in queries if "accounts_user" in query["sql"]
+        ]
+
+    def test_token_carries_claims(self):
+        response = self.client.post(
+            TOKEN_URL, {"email": "staff@test.com", "password": "mypass1!s"}
+        )
+
+        token = AccessToken(response.data["access"])
+        self.assertEqual(token["email"], "staff@test.com")
+        self.assertTrue(token["is_staff"])
+
+    def test_catalogue_read_without_user_query(self):
+        self.authenticate(ClaimsRefreshToken.for_user(self.user))
+
+        response, queries = self.user_queries("get", GENRE_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(queries, [])
+
+    def test_token_without_claims_loads_user(self):
+        self.authenticate(RefreshToken.for_user(self.user))
+
+        response, queries = self.user_queries("get", GENRE_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 1)
+
+    def test_claims_user_loads_row_lazily(self):
+        token = ClaimsRefreshToken.for_user(self.user).access_token
+        user = ClaimsUser(token)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(user.id, self.user.id)
+            self.assertTrue(user.is_staff)
+        with self.assertNumQueries(1):
+            self.assertEqual(user.date_joined, self.user.date_joined)
+            self.assertFalse(user.is_superuser)
+
+    def test_staff_change_invalidates_claims(self):
+        self.authenticate(ClaimsRefreshToken.for_user(self.user))
+        self.user.is_staff = False
+        self.user.save()
+
+        response = self.client.post(GENRE_URL, {"name": "Drama"})
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_evicted_claims_fall_back_to_database(self):
+        self.authenticate(ClaimsRefreshToken.for_user(self.user))
+        self.user.is_staff = False
+        self.user.save()
+        cache.delete(USER_CLAIMS_KEY.format(user_id=self.user.id))
+
+        response = self.client.post(GENRE_URL, {"name": "Drama"})
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_database_check_republishes_claims(self):
+        self.authenticate(ClaimsRefreshToken.for_user(self.user))
+        cache.delete(USER_CLAIMS_KEY.format(user_id=self.user.id))
+
+        _, first = self.user_queries("get", GENRE_URL)
+        _, second = self.user_queries("get", GENRE_URL)
+
+        self.assertEqual(len(first), 1)
+        self.assertEqual(second, [])
+
+    def test_process_local_cache_falls_back_to_database(self):
+        self.shared.return_value = False
+        self.authenticate(ClaimsRefreshToken.for_user(self.user))
+
+        response, queries = self.user_queries("get", GENRE_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 1)
+        self.shared.assert_called_with("default")
+
+    def test_profile_update_invalidates_claims(self):
+        self.authenticate(ClaimsRefreshToken.for_user(self.user))
+
+        self.client.patch(ME_URL, {"email": "new@test.com"})
+        response, queries = self.user_queries("get", GENRE_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 1)
+
+    def test_deleted_user_is_rejected(self):
+        self.authenticate(ClaimsRefreshToken.for_user(self.user))
+        self.user.delete()
+
+        response = self.client.get(GENRE_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_schema_documents_the_bearer_token(self):
+        schema = SchemaGenerator().get_schema(request=None, public=True)
+
+        self.assertIn(
+            {"jwtAuth": []}, schema["paths"][GENRE_URL]["get"]["security"]
+        )
+        self.assertEqual(
+            schema["components"]["securitySchemes"]["jwtAuth"]["scheme"],
+            "bearer",
+        )
+
+    def test_refresh_signs_current_claims(self):
+        refresh = ClaimsRefreshToken.for_user(self.user)
+        self.user.is_staff = False
+        self.user.save()
+
+        response = self.client.post(
+            TOKEN_REFRESH_URL, {"refresh": str(refresh)}
+        )
+
+        self.assertFalse(AccessToken(response.data["access"])["is_staff"])
+        self.assertFalse(RefreshToken(response.data["refresh"])["is_staff"])
+
+
+@override_settings(
+    PASSWORD_HASHERS=[
+        "accounts.hashing.PBKDF2PasswordHasher",
+        "django.contrib.auth.hashers.MD5PasswordHasher",
+    ],
+    PASSWORD_HASH_ITERATIONS=1000,
+)
+class PasswordHashingTest(APITestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("user@test.com")
+        self.user.password = make_password("mypass1!s", hasher="md5")
+        self.user.save()
+
+    def login(self):
+        return self.client.post(
+            TOKEN_URL, {"email": "user@test.com", "password": "mypass1!s"}
+        )
+
+    def test_login_upgrades_hash(self):
+        response = self.login()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$1000$"))
+
+        with self.settings(PASSWORD_HASH_ITERATIONS=2000):
+            self.login()
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$2000$"))
+
+    def test_wrong_password_keeps_hash(self):
+        password = self.user.password
+
+        response = self.client.post(
+            TOKEN_URL, {"email": "user@test.com", "password": "wrong"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password, password)
+
+    def test_busy_pool_answers_service_unavailable(self):
+        with mock.patch.object(
+            HashingPool, "run", side_effect=HashingUnavailable(2)
+        ):
+            response = self.client.post(
+                USER_CREATE_URL,
+                {"email": "new@test.com", "password": "mypass1!s"},
+            )
+
+        self.assertEqual(
+            response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+        self.assertEqual(response["Retry-After"], "2")
+        self.assertFalse(
+            get_user_model().objects.filter(email="new@test.com").exists()
+        )
+
+
+class HashingPoolTest(APITestCase):
+    def test_rejects_work_beyond_queue(self):
+        pool = HashingPool(workers=1, queue_size=0, wait=0.01)
+        started, release = threading.Event(), threading.Event()
+
+        def hash_slowly():
+            started.set()
+            release.wait()
+            return "hash"
+
+        worker = threading.Thread(target=pool.run, args=(hash_slowly,))
+        worker.start()
+        started.wait()
+        try:
+            with self.assertRaises(HashingUnavailable):
+                pool.run(str)
+        finally:
+            release.set()
+            worker.join()
+
+        self.assertEqual(pool.run(str, 1), "1")
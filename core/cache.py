@@ -0,0 +1,294 @@
+"""
+Two-tier cache backend: a small in-process LRU in front of a shared
+cache, configured in CACHES as
+
+    "default": {
+        "BACKEND": "core.cache.TieredCache",
+        "OPTIONS": {
+            "SHARED_ALIAS": "shared",
+            "MAX_ENTRIES": 1000,
+            "LOCAL_TIMEOUT": 5,
+        },
+    }
+
+Values read or written through it are kept locally for at most
+LOCAL_TIMEOUT seconds, so writes made by other processes show up after
+that delay. Counters are incremented on the shared cache only, so
+anything that must be exact across workers reads the shared alias.
+"""
+import pickle
+import threading
+from collections import OrderedDict
+from time import monotonic, sleep
+from typing import Callable
+
+from django.core.cache import BaseCache, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+MISSING = object()
+
+# Backends whose entries only the process that wrote them can see
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+
+class TieredCache(BaseCache):
+    def __init__(self, location: str, params: dict) -> None:
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self.shared_alias = options.get("SHARED_ALIAS", "shared")
+        self.local_timeout = options.get("LOCAL_TIMEOUT", 5)
+        # How long a recompute may hold a key before others take over
+        self.lock_timeout = options.get("LOCK_TIMEOUT", 10)
+        self.lock_poll_interval = options.get("LOCK_POLL_INTERVAL", 0.05)
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self._computing = {}
+        self._stats = dict.fromkeys((
+            "local_hits",
+            "shared_hits",
+            "misses",
+            "evictions",
+            "coalesced",
+        ), 0)
+
+    @property
+    def shared(self) -> BaseCache:
+        return caches[self.shared_alias]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "local_entries": len(self._local)}
+
+    def count(self, stat: str) -> None:
+        with self._lock:
+            self._stats[stat] += 1
+
+    def resolve_timeout(self, timeout: float | None) -> float | None:
+        return self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+    def get_local(self, key: str) -> object:
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, value = entry
+            if expires_at <= monotonic():
+                del self._local[key]
+                return MISSING
+            self._local.move_to_end(key)
+            self._stats["local_hits"] += 1
+        return pickle.loads(value)
+
+    def set_local(
+        self,
+        key: str,
+        value: object,
+        timeout: float | None = None
+    ) -> None:
+        ttl = self.local_timeout if timeout is None else min(
+            timeout, self.local_timeout
+        )
+        if ttl <= 0:
+            self.delete_local(key)
+            return
+
+        # Pickled like LocMemCache, so callers never share an object
+        value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._local[key] = (monotonic() + ttl, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self._max_entries:
+                self._local.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def delete_local(self, key: str) -> None:
+        with self._lock:
+            self._local.pop(key, None)
+
+    def get(
+        self,
+        key: str,
+        default: object = None,
+        version: int | None = None
+    ) -> object:
+        local_key = self.make_and_validate_key(key, version)
+        value = self.get_local(local_key)
+        if value is not MISSING:
+            return value
+
+        value = self.shared.get(key, MISSING, version)
+        if value is MISSING:
+            self.count("misses")
+            return default
+        self.count("shared_hits")
+        self.set_local(local_key, value)
+        return value
+
+    def get_many(self, keys: list[str], version: int | None = None) -> dict:
+        found = {}
+        for key in keys:
+            value = self.get_local(self.make_and_validate_key(key, version))
+            if value is not MISSING:
+                found[key] = value
+
+        remaining = [key for key in keys if key not in found]
+        shared = self.shared.get_many(remaining, version) if remaining else {}
+        for key, value in shared.items():
+            self.set_local(self.make_and_validate_key(key, version), value)
+        with self._lock:
+            self._stats["shared_hits"] += len(shared)
+            self._stats["misses"] += len(remaining) - len(shared)
+        return {**found, **shared}
+
+    def set(
+        self,
+        key: str,
+        value: object,
+        timeout: float | None = DEFAULT_TIMEOUT,
+        version: int | None = None
+    ) -> None:
+        timeout = self.resolve_timeout(timeout)
+        self.shared.set(key, value, timeout, version)
+        local_key = self.make_and_validate_key(key, version)
+        self.set_local(local_key, value, timeout)
+
+    def add(
+        self,
+        key: str,
+        value: object,
+        timeout: float | None = DEFAULT_TIMEOUT,
+        version: int | None = None
+    ) -> bool:
+        timeout = self.resolve_timeout(timeout)
+        if not self.shared.add(key, value, timeout, version):
+            return False
+        local_key = self.make_and_validate_key(key, version)
+        self.set_local(local_key, value, timeout)
+        return True
+
+    def touch(
+        self,
+        key: str,
+        timeout: float | None = DEFAULT_TIMEOUT,
+        version: int | None = None
+    ) -> bool:
+        return self.shared.touch(key, self.resolve_timeout(timeout), version)
+
+    def delete(self, key: str, version: int | None = None) -> bool:
+        self.delete_local(self.make_and_validate_key(key, version))
+        return self.shared.delete(key, version)
+
+    def incr(
+        self,
+        key: str,
+        delta: int = 1,
+        version: int | None = None
+    ) -> int:
+        self.delete_local(self.make_and_validate_key(key, version))
+        return self.shared.incr(key, delta, version)
+
+    def has_key(self, key: str, version: int | None = None) -> bool:
+        local_key = self.make_and_validate_key(key, version)
+        return self.get_local(local_key) is not MISSING or (
+            self.shared.has_key(key, version)
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._local.clear()
+        self.shared.clear()
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], object],
+        timeout: float | None = DEFAULT_TIMEOUT,
+        version: int | None = None
+    ) -> object:
+        """
+        Return the cached value, or compute and cache it. While a key is
+        being computed, other threads of the process wait for the result,
+        and other processes poll the shared cache for it, so a cold key
+        is computed once instead of by every request at the same time.
+        Nothing is cached when `compute` returns None.
+        """
+        value = self.get(key, MISSING, version)
+        if value is not MISSING:
+            return value
+
+        local_key = self.make_and_validate_key(key, version)
+        with self._lock:
+            computing = self._computing.get(local_key)
+            if computing is None:
+                computing = self._computing[local_key] = threading.Event()
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            computing.wait(self.lock_timeout)
+            value = self.get(key, MISSING, version)
+            if value is not MISSING:
+                self.count("coalesced")
+                return value
+            return compute()
+
+        try:
+            return self.compute_once(key, compute, timeout, version)
+        finally:
+            with self._lock:
+                del self._computing[local_key]
+            computing.set()
+
+    def compute_once(
+        self,
+        key: str,
+        compute: Callable[[], object],
+        timeout: float | None,
+        version: int | None
+    ) -> object:
+        lock_key = f"{key}:computing"
+        acquired = self.shared.add(lock_key, True, self.lock_timeout, version)
+        if not acquired:
+            # Another process is computing it
+            deadline = monotonic() + self.lock_timeout
+            while monotonic() < deadline:
+                sleep(self.lock_poll_interval)
+                value = self.shared.get(key, MISSING, version)
+                if value is not MISSING:
+                    self.count("coalesced")
+                    self.set_local(
+                        self.make_and_validate_key(key, version), value
+                    )
+                    return value
+                if not self.shared.has_key(lock_key, version):
+                    # Released without a value, take over if nobody
+                    # else did in the meantime
+                    acquired = self.shared.add(
+                        lock_key, True, self.lock_timeout, version
+                    )
+                    break
+
+        try:
+            value = compute()
+            if value is not None:
+                self.set(key, value, timeout, version)
+            return value
+        finally:
+            # Never release a lock another process holds
+            if acquired:
+                self.shared.delete(lock_key, version)
+
+
+def is_shared_between_processes(alias: str) -> bool:
+    """
+    Return whether entries one process writes to the cache reach the
+    others, through the shared tier for a TieredCache.
+    """
+    cache = caches[alias]
+    if isinstance(cache, TieredCache):
+        cache = cache.shared
+    return not isinstance(cache, PROCESS_LOCAL_BACKENDS)
@@ -0,0 +1,120 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Model
+from django.http import HttpResponse
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+
+
+_replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+
+PRIMARY_PIN_KEY = "db:primary-pin:{user_id}"
+
+
+@contextmanager
+def replica_reads(enabled: bool = True) -> Iterator[None]:
+    """
+    Let the ORM read from the replicas inside the block.
+    """
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def pin_to_primary(user_id: int) -> None:
+    """
+    Keep the user's reads on the primary for a while after a write,
+    so they see their own changes whatever the replication lag.
+    """
+    cache.set(
+        PRIMARY_PIN_KEY.format(user_id=user_id),
+        True,
+        settings.DATABASE_STICKY_PRIMARY_SECONDS,
+    )
+
+
+def is_pinned_to_primary(user_id: int | None) -> bool:
+    return user_id is not None and cache.get(
+        PRIMARY_PIN_KEY.format(user_id=user_id), False
+    )
+
+
+def can_read_replicas(request: Request) -> bool:
+    return request.method in SAFE_METHODS and not is_pinned_to_primary(
+        request.user.pk
+    )
+
+
+class ReplicaReadMixin:
+    """
+    Serve the safe requests of a viewset from the replicas,
+    unless the user wrote something within the sticky primary window.
+    Set `replica_actions` to keep the other actions on the primary.
+    """
+
+    replica_actions = None
+
+    def uses_replicas(self, request: Request) -> bool:
+        return (
+            self.replica_actions is None
+            or self.action in self.replica_actions
+        ) and can_read_replicas(request)
+
+    def dispatch(
+        self,
+        request: Request,
+        *args: tuple,
+        **kwargs: dict
+    ) -> HttpResponse:
+        token = _replica_reads.set(False)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            _replica_reads.reset(token)
+
+    def initial(self, request: Request, *args: tuple, **kwargs: dict) -> None:
+        # The user is known once authentication has run
+        super().initial(request, *args, **kwargs)
+        _replica_reads.set(self.uses_replicas(request))
+
+
+class ReplicaRouter:
+    """
+    Send reads to a random replica only where replica_reads() allows it,
+    everything else, including all writes, goes to the primary.
+    """
+
+    def db_for_read(self, model: type[Model], **hints: dict) -> str | None:
+        if settings.DATABASE_REPLICAS and _replica_reads.get():
+            return random.choice(settings.DATABASE_REPLICAS)
+        return None
+
+    def db_for_write(self, model: type[Model], **hints: dict) -> str:
+        return "default"
+
+    def allow_relation(
+        self,
+        obj1: Model,
+        obj2: Model,
+        **hints: dict
+    ) -> bool:
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(
+        self,
+        db: str,
+        app_label: str,
+        **hints: dict
+    ) -> bool | None:
+        # Replicas receive the schema through replication
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
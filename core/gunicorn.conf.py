@@ -0,0 +1,79 @@
+"""
+Gunicorn configuration, every setting can be overridden
+through the environment (see .env.sample).
+
+    gunicorn --config core/gunicorn.conf.py
+
+The default gthread worker serves core.wsgi. Setting
+GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker (the "asgi" extra)
+serves core.asgi instead, including the async views, and turns off
+persistent database connections, see DATABASES in core/settings.py.
+"""
+import multiprocessing
+import os
+
+from utils.config import get_env_variable
+
+
+ASGI_WORKER_CLASS = "uvicorn.workers.UvicornWorker"
+
+bind = get_env_variable("GUNICORN_BIND", "0.0.0.0:8000")
+
+worker_class = get_env_variable("GUNICORN_WORKER_CLASS", "gthread")
+workers = int(get_env_variable(
+    "GUNICORN_WORKERS", str(multiprocessing.cpu_count() * 2 + 1)
+))
+# Only used by the gthread worker
+threads = int(get_env_variable("GUNICORN_THREADS", "4"))
+
+wsgi_app = (
+    "core.asgi:application"
+    if worker_class == ASGI_WORKER_CLASS
+    else "core.wsgi:application"
+)
+
+# Recycle workers so slow leaks cannot grow without bound,
+# with jitter so they do not all restart at once
+max_requests = int(get_env_variable("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(
+    get_env_variable("GUNICORN_MAX_REQUESTS_JITTER", "100")
+)
+
+keepalive = int(get_env_variable("GUNICORN_KEEPALIVE", "5"))
+timeout = int(get_env_variable("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(get_env_variable("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+
+preload_app = get_env_variable("GUNICORN_PRELOAD", "False") == "True"
+
+# Heartbeat files on tmpfs, container overlay filesystems can stall
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = get_env_variable("GUNICORN_WORKER_TMP_DIR", "/dev/shm")
+
+accesslog = get_env_variable("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = get_env_variable("GUNICORN_LOG_LEVEL", "info")
+
+
+def on_starting(server: object) -> None:
+    # Throttle counters and published claims only hold when every
+    # worker shares them, which a per-process locmem cache cannot do
+    if server.cfg.workers <= 1:
+        return
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    from django.conf import settings
+
+    if settings.SHARED_CACHE == "locmem":
+        raise RuntimeError(
+            "SHARED_CACHE=locmem is not shared between the "
+            f"{server.cfg.workers} workers, use redis or memcached, "
+            "or set GUNICORN_WORKERS=1"
+        )
+
+
+def post_fork(server: object, worker: object) -> None:
+    # With preload_app the master may have opened database connections,
+    # which must never be shared between worker processes
+    if server.cfg.preload_app:
+        from django.db import connections
+
+        connections.close_all()
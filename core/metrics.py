@@ -0,0 +1,370 @@
+"""
+Per-view request metrics in the Prometheus text format.
+
+MetricsMiddleware labels each request with the router basename and
+action of its view, e.g. view="performance" action="list", and records
+how long it took, the database queries it ran, the time spent from the
+view being called to the response being rendered outside those queries
+(authentication, permissions, throttling, pagination, serialization and
+rendering alike) and the size of the response. Views that run more than
+METRICS_QUERY_BUDGET queries are counted and logged.
+
+Each worker process keeps its own metrics and serves them on /metrics,
+so counters restart with the worker. Queries are counted by a wrapper
+every connection gets when a request starts, in the thread that runs
+the sync code of the request, and credited to the request of the
+current context, so they are counted under ASGI too.
+"""
+import hmac
+import logging
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Awaitable, Callable, Iterator
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import request_started
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.dispatch import receiver
+from django.http import HttpRequest, HttpResponse
+
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+METRICS = {
+    "http_request_duration_seconds": (
+        "histogram",
+        "Time to respond to the request.",
+        LATENCY_BUCKETS,
+    ),
+    "http_view_non_db_seconds": (
+        "histogram",
+        "Time in the view, its checks and the renderer outside queries.",
+        LATENCY_BUCKETS,
+    ),
+    "http_response_size_bytes": (
+        "histogram",
+        "Size of the response body, streamed responses excluded.",
+        SIZE_BUCKETS,
+    ),
+    "http_db_queries": (
+        "histogram",
+        "Database queries run by the request.",
+        QUERY_BUCKETS,
+    ),
+    "http_db_query_duration_seconds_total": (
+        "counter",
+        "Time spent running database queries.",
+        None,
+    ),
+    "http_requests_total": (
+        "counter",
+        "Responses sent, by status code.",
+        None,
+    ),
+    "http_query_budget_exceeded_total": (
+        "counter",
+        "Requests that ran more queries than METRICS_QUERY_BUDGET.",
+        None,
+    ),
+}
+
+
+def format_labels(labels: tuple[tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(name, str(value).replace("\\", r"\\").replace(
+            '"', r"\""
+        ).replace("\n", r"\n"))
+        for name, value in labels
+    )
+    return f"{{{pairs}}}"
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        # One count per bucket and one for values above them all
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def render(self, name: str, labels: tuple) -> list[str]:
+        lines = []
+        total = 0
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            total += count
+            bucket_labels = format_labels((*labels, ("le", bound)))
+            lines.append(f"{name}_bucket{bucket_labels} {total}")
+        lines.append(f"{name}_sum{format_labels(labels)} {self.sum}")
+        lines.append(f"{name}_count{format_labels(labels)} {total}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.counters = defaultdict(float)
+
+    def observe(self, name: str, labels: tuple, value: float) -> None:
+        with self.lock:
+            histogram = self.histograms.get((name, labels))
+            if histogram is None:
+                histogram = self.histograms[name, labels] = Histogram(
+                    METRICS[name][2]
+                )
+            histogram.observe(value)
+
+    def inc(self, name: str, labels: tuple, amount: float = 1) -> None:
+        with self.lock:
+            self.counters[name, labels] += amount
+
+    def clear(self) -> None:
+        with self.lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    def render(self) -> str:
+        series = defaultdict(list)
+        with self.lock:
+            for (name, labels), histogram in self.histograms.items():
+                series[name].extend(histogram.render(name, labels))
+            for (name, labels), value in self.counters.items():
+                series[name].append(f"{name}{format_labels(labels)} {value}")
+
+        lines = []
+        for name, (kind, description, _) in METRICS.items():
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(series[name])
+        lines.extend(render_cache_stats())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def render_cache_stats() -> list[str]:
+    """
+    Export the counters of the tiered default cache, see core.cache.
+    """
+    cache = caches["default"]
+    if not hasattr(cache, "stats"):
+        return []
+    stats = cache.stats()
+    lines = [
+        "# HELP cache_local_entries Entries in the local cache tier.",
+        "# TYPE cache_local_entries gauge",
+        f"cache_local_entries {stats.pop('local_entries')}",
+        "# HELP cache_events_total Lookups and evictions of the cache.",
+        "# TYPE cache_events_total counter",
+    ]
+    for event, count in stats.items():
+        lines.append(f'cache_events_total{{event="{event}"}} {count}')
+    return lines
+
+
+def get_view_labels(view_func: Callable, request: HttpRequest) -> tuple:
+    """
+    Return the router basename and action of a DRF viewset,
+    the URL name and request method of any other view.
+    """
+    initkwargs = getattr(view_func, "initkwargs", {})
+    actions = getattr(view_func, "actions", None) or {}
+    method = request.method.lower()
+    view = initkwargs.get("basename") or request.resolver_match.view_name
+    return ("view", view), ("action", actions.get(method, method))
+
+
+class RequestMetrics:
+    def __init__(self) -> None:
+        self.started = perf_counter()
+        self.labels = (("view", "unmatched"), ("action", "unmatched"))
+        self.view_started = None
+        self.view_query_seconds = 0.0
+        self.queries = 0
+        self.query_seconds = 0.0
+
+    def record_query(
+        self,
+        execute: Callable,
+        sql: str,
+        params: object,
+        many: bool,
+        context: dict
+    ) -> object:
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.query_seconds += perf_counter() - started
+
+    def start_view(self, labels: tuple) -> None:
+        self.labels = labels
+        self.view_started = perf_counter()
+        self.view_query_seconds = self.query_seconds
+
+    @contextmanager
+    def count_queries(self) -> Iterator[None]:
+        """
+        Count the queries run in this context, including the threads
+        sync_to_async runs with a copy of it, within the block.
+        """
+        token = _current_metrics.set(self)
+        try:
+            yield
+        finally:
+            _current_metrics.reset(token)
+
+    def record(self, response: HttpResponse) -> None:
+        finished = perf_counter()
+        labels = self.labels
+        registry.observe(
+            "http_request_duration_seconds", labels, finished - self.started
+        )
+        registry.inc(
+            "http_requests_total",
+            (*labels, ("status", response.status_code)),
+        )
+        if self.view_started is not None:
+            registry.observe(
+                "http_view_non_db_seconds",
+                labels,
+                max(0.0, finished - self.view_started - (
+                    self.query_seconds - self.view_query_seconds
+                )),
+            )
+        if not response.streaming:
+            registry.observe(
+                "http_response_size_bytes", labels, len(response.content)
+            )
+        registry.observe("http_db_queries", labels, self.queries)
+        registry.inc(
+            "http_db_query_duration_seconds_total", labels, self.query_seconds
+        )
+        if self.queries > settings.METRICS_QUERY_BUDGET:
+            registry.inc("http_query_budget_exceeded_total", labels)
+            logger.warning(
+                "%s %s ran %d queries, over the budget of %d",
+                *(value for _, value in labels),
+                self.queries,
+                settings.METRICS_QUERY_BUDGET,
+            )
+
+
+_current_metrics: ContextVar[RequestMetrics | None] = ContextVar(
+    "current_metrics", default=None
+)
+
+
+def record_query(
+    execute: Callable,
+    sql: str,
+    params: object,
+    many: bool,
+    context: dict
+) -> object:
+    metrics = _current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics.record_query(execute, sql, params, many, context)
+
+
+@receiver(request_started)
+def install_query_counter(**kwargs: object) -> None:
+    """
+    Wrap the connections of the thread starting the request, which
+    is the one running its sync code under WSGI and ASGI alike.
+    """
+    for alias in (DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS):
+        wrappers = connections[alias].execute_wrappers
+        if record_query not in wrappers:
+            # First, as execute_wrapper() blocks pop the last one
+            wrappers.insert(0, record_query)
+
+
+class MetricsMiddleware:
+    """
+    Record the metrics of every request, put first in MIDDLEWARE
+    so the time spent in the other middleware counts too.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(
+        self,
+        get_response: Callable[[HttpRequest], HttpResponse]
+    ) -> None:
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if self.async_mode:
+            return self.__acall__(request)
+
+        metrics = request.metrics = RequestMetrics()
+        with metrics.count_queries():
+            response = self.get_response(request)
+        if request.metrics is not None:
+            metrics.record(response)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> Awaitable[HttpResponse]:
+        metrics = request.metrics = RequestMetrics()
+        with metrics.count_queries():
+            response = await self.get_response(request)
+        if request.metrics is not None:
+            metrics.record(response)
+        return response
+
+    def process_view(
+        self,
+        request: HttpRequest,
+        view_func: Callable,
+        view_args: tuple,
+        view_kwargs: dict
+    ) -> None:
+        if view_func is metrics_view:
+            # Scrapes would skew the numbers they report
+            request.metrics = None
+            return
+        request.metrics.start_view(get_view_labels(view_func, request))
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """
+    Serve the metrics of this worker to clients sending
+    "Authorization: Bearer <METRICS_TOKEN>". Without a token
+    they are only served when DEBUG is on.
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponse(status=403)
+    elif not hmac.compare_digest(
+        request.headers.get("Authorization", "").encode(),
+        f"Bearer {token}".encode(),
+    ):
+        return HttpResponse(status=401)
+    return HttpResponse(
+        registry.render(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
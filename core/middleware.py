@@ -0,0 +1,43 @@
+from typing import Awaitable, Callable
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.http import HttpRequest, HttpResponse
+from django.utils.decorators import sync_and_async_middleware
+from rest_framework.permissions import SAFE_METHODS
+
+from core.db_router import pin_to_primary
+
+
+def wrote_as_user(request: HttpRequest, response: HttpResponse) -> bool:
+    user = getattr(request, "user", None)
+    return (
+        request.method not in SAFE_METHODS
+        and response.status_code < 400
+        and user is not None
+        and user.is_authenticated
+    )
+
+
+@sync_and_async_middleware
+def sticky_primary_middleware(
+    get_response: Callable[[HttpRequest], HttpResponse]
+) -> Callable:
+    """
+    Pin users to the primary database after a successful write.
+    DRF copies the authenticated user onto the request,
+    so JWT users are seen here once the view has run.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request: HttpRequest) -> Awaitable[HttpResponse]:
+            response = await get_response(request)
+            if wrote_as_user(request, response):
+                await sync_to_async(pin_to_primary)(request.user.pk)
+            return response
+    else:
+        def middleware(request: HttpRequest) -> HttpResponse:
+            response = get_response(request)
+            if wrote_as_user(request, response):
+                pin_to_primary(request.user.pk)
+            return response
+
+    return middleware
@@ -0,0 +1,84 @@
+"""
+JSON renderer and parser backed by orjson when it is installed,
+falling back to the stdlib json module DRF uses otherwise.
+
+orjson writes datetimes natively and hands everything else it does not
+know (Decimals, UUIDs, lazy strings, ...) to DRF's encoder, so both
+backends produce the same documents.
+"""
+from typing import IO, Mapping
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+JSON_BACKEND = "orjson" if orjson else "json"
+
+if orjson:
+    ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+# JavaScript line terminators DRF escapes so the JSON stays valid JS
+LINE_TERMINATORS = (
+    ("\u2028".encode(), b"\\u2028"),
+    ("\u2029".encode(), b"\\u2029"),
+)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Render compact JSON with orjson. Indented output for clients that
+    ask for it goes through DRF's renderer, where speed does not matter.
+    """
+
+    def render(
+        self,
+        data: object,
+        accepted_media_type: str | None = None,
+        renderer_context: Mapping | None = None
+    ) -> bytes:
+        if orjson is None or data is None or self.get_indent(
+            accepted_media_type or "", renderer_context or {}
+        ):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+
+        content = orjson.dumps(
+            data, default=JSONEncoder().default, option=ORJSON_OPTIONS
+        )
+        for character, escaped in LINE_TERMINATORS:
+            if character in content:
+                content = content.replace(character, escaped)
+        return content
+
+
+class FastJSONParser(JSONParser):
+    """
+    Parse UTF-8 request bodies with orjson,
+    other charsets go through DRF's parser.
+    """
+
+    renderer_class = FastJSONRenderer
+
+    def parse(
+        self,
+        stream: IO[bytes],
+        media_type: str | None = None,
+        parser_context: Mapping | None = None
+    ) -> object:
+        encoding = (parser_context or {}).get("encoding", "utf-8")
+        if orjson is None or encoding.lower() not in ("utf-8", "utf8"):
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 import os
+import sys
 from datetime import timedelta
 from pathlib import Path
 
@@ -28,6 +29,8 @@ SECRET_KEY = get_env_variable("SECRET_KEY")
 # SECURITY WARNING: don"t run with debug turned on in production!
 DEBUG = get_env_variable("DEBUG") == "True"
 
+TESTING = sys.argv[1:2] == ["test"]
+
 ALLOWED_HOSTS = ["127.0.0.1", "0.0.0.0", "localhost"]
 
 
@@ -44,7 +47,6 @@ INSTALLED_APPS = [
     "rest_framework",
     "rest_framework_simplejwt",
     "django_filters",
-    "debug_toolbar",
     "drf_spectacular",
     "drf_spectacular_sidecar",
     "theatre",
@@ -58,6 +60,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -65,9 +68,22 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    "core.middleware.sticky_primary_middleware",
 ]
 
+if DEBUG:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index("core.middleware.sticky_primary_middleware"),
+        "debug_toolbar.middleware.DebugToolbarMiddleware",
+    )
+
+# Views running more queries than this are counted and logged,
+# see core.metrics
+METRICS_QUERY_BUDGET = int(get_env_variable("METRICS_QUERY_BUDGET", "20"))
+# Bearer token required to read /metrics, only served with DEBUG when empty
+METRICS_TOKEN = get_env_variable("METRICS_TOKEN", "")
+
 ROOT_URLCONF = "core.urls"
 
 TEMPLATES = [
@@ -104,14 +120,183 @@ DATABASES = {
         "PASSWORD": get_env_variable("POSTGRES_PASSWORD"),
         "HOST": get_env_variable("POSTGRES_HOST"),
         "PORT": get_env_variable("POSTGRES_PORT"),
+        # Keep connections open between requests instead of paying
+        # the connect, TLS and auth round trips every time
+        "CONN_MAX_AGE": int(get_env_variable("POSTGRES_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": (
+            get_env_variable("POSTGRES_CONN_HEALTH_CHECKS", "True") == "True"
+        ),
+        "OPTIONS": {
+            "connect_timeout": int(
+                get_env_variable("POSTGRES_CONNECT_TIMEOUT", "5")
+            ),
+        },
     }
 }
 
+# Connection pool per worker process, requires the "pool" extra
+# (psycopg 3 and psycopg-pool) instead of psycopg2. Each gunicorn thread
+# holds at most one connection, so the pool defaults to one per thread.
+if get_env_variable("POSTGRES_POOL", "False") == "True":
+    from psycopg_pool import ConnectionPool
+
+    DATABASES["prod"]["CONN_MAX_AGE"] = 0
+    DATABASES["prod"]["OPTIONS"]["pool"] = {
+        "min_size": int(get_env_variable("POSTGRES_POOL_MIN_SIZE", "1")),
+        "max_size": int(get_env_variable(
+            "POSTGRES_POOL_MAX_SIZE", get_env_variable("GUNICORN_THREADS", "4")
+        )),
+        "timeout": float(get_env_variable("POSTGRES_POOL_TIMEOUT", "10")),
+        "max_lifetime": float(
+            get_env_variable("POSTGRES_POOL_MAX_LIFETIME", "3600")
+        ),
+    }
+    if DATABASES["prod"]["CONN_HEALTH_CHECKS"]:
+        DATABASES["prod"]["OPTIONS"]["pool"]["check"] = (
+            ConnectionPool.check_connection
+        )
+
+# The Uvicorn worker runs the sync code of every request in a thread of
+# its own, so connections kept open past a request would pile up, one
+# per thread. Without a pool they are closed at the end of each request.
+ASGI_WORKER = (
+    get_env_variable("GUNICORN_WORKER_CLASS", "gthread")
+    == "uvicorn.workers.UvicornWorker"
+)
+if ASGI_WORKER:
+    DATABASES["prod"]["CONN_MAX_AGE"] = 0
+
 DATABASES["default"] = DATABASES["dev" if DEBUG else "prod"]
 
+# Read replicas that serve safe requests of the catalogue viewsets,
+# see core.db_router
+DATABASE_REPLICAS = []
+if DEBUG:
+    if get_env_variable("SQLITE_REPLICA", "False") == "True":
+        # A second alias on the same file is enough to exercise routing
+        DATABASES["replica"] = {
+            **DATABASES["dev"], "TEST": {"MIRROR": "default"}
+        }
+        DATABASE_REPLICAS.append("replica")
+else:
+    replica_hosts = get_env_variable("POSTGRES_REPLICA_HOSTS", "")
+    for index, address in enumerate(
+        filter(None, replica_hosts.split(",")), start=1
+    ):
+        host, _, port = address.strip().partition(":")
+        DATABASES[f"replica_{index}"] = {
+            **DATABASES["prod"],
+            "HOST": host,
+            "PORT": port or DATABASES["prod"]["PORT"],
+            "OPTIONS": dict(DATABASES["prod"]["OPTIONS"]),
+            "TEST": {"MIRROR": "default"},
+        }
+        DATABASE_REPLICAS.append(f"replica_{index}")
+
+DATABASE_ROUTERS = ["core.db_router.ReplicaRouter"]
+
+# Seconds a user's reads stay on the primary after they write,
+# long enough to outlast the replication lag
+DATABASE_STICKY_PRIMARY_SECONDS = int(
+    get_env_variable("DATABASE_STICKY_PRIMARY_SECONDS", "10")
+)
+
+# Caches
+# https://docs.djangoproject.com/en/5.1/ref/settings/#caches
+
+# The default cache keeps recently used entries in process memory for
+# LOCAL_CACHE_TIMEOUT seconds in front of the cache shared by all
+# workers, see core.cache. SHARED_CACHE picks the shared backend, redis
+# unless DEBUG is on. Throttle counters, published claims and primary
+# pins are only right when every worker sees them, so gunicorn refuses
+# to start several workers on locmem, see core/gunicorn.conf.py.
+SHARED_CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+    "memcached": "django.core.cache.backends.memcached.PyMemcacheCache",
+}
+SHARED_CACHE_LOCATIONS = {
+    "locmem": "shared",
+    "redis": "redis://127.0.0.1:6379/0",
+    "memcached": "127.0.0.1:11211",
+}
+SHARED_CACHE = get_env_variable(
+    "SHARED_CACHE", "locmem" if DEBUG or TESTING else "redis"
+)
+
+CACHES = {
+    "default": {
+        "BACKEND": "core.cache.TieredCache",
+        "OPTIONS": {
+            "SHARED_ALIAS": "shared",
+            "MAX_ENTRIES": int(
+                get_env_variable("LOCAL_CACHE_MAX_ENTRIES", "1000")
+            ),
+            "LOCAL_TIMEOUT": float(
+                get_env_variable("LOCAL_CACHE_TIMEOUT", "5")
+            ),
+        },
+    },
+    "shared": {
+        "BACKEND": SHARED_CACHE_BACKENDS[SHARED_CACHE],
+        "LOCATION": get_env_variable(
+            "SHARED_CACHE_LOCATION", SHARED_CACHE_LOCATIONS[SHARED_CACHE]
+        ),
+    },
+}
+if SHARED_CACHE == "locmem":
+    # Past MAX_ENTRIES LocMemCache culls a third of its keys at random,
+    # throttle counters and claims included, so keep well clear of it
+    CACHES["shared"]["OPTIONS"] = {
+        "MAX_ENTRIES": int(
+            get_env_variable("SHARED_CACHE_MAX_ENTRIES", "10000")
+        ),
+    }
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
+# Password hashing, see accounts.hashing. The preferred hasher comes
+# first, the rest still verify older hashes, which are upgraded on login.
+PASSWORD_HASHER_CLASSES = {
+    "pbkdf2_sha256": "accounts.hashing.PBKDF2PasswordHasher",
+    "pbkdf2_sha1": "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "argon2": "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "bcrypt_sha256": "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "scrypt": "django.contrib.auth.hashers.ScryptPasswordHasher",
+}
+PASSWORD_HASHER = get_env_variable(
+    "PASSWORD_HASHER", "md5" if TESTING else "pbkdf2_sha256"
+)
+PASSWORD_HASHERS = [
+    "django.contrib.auth.hashers.MD5PasswordHasher"
+    if PASSWORD_HASHER == "md5"
+    else PASSWORD_HASHER_CLASSES[PASSWORD_HASHER],
+    *(
+        hasher for name, hasher in PASSWORD_HASHER_CLASSES.items()
+        if name != PASSWORD_HASHER
+    ),
+]
+# Defaults to Django's count for the release
+PASSWORD_HASH_ITERATIONS = int(
+    get_env_variable("PASSWORD_HASH_ITERATIONS", "0")
+)
+
+# Hashes computed at once per process. Callers still block until their
+# hash is done, this bounds CPU use rather than freeing worker threads.
+ACCOUNTS_HASHING_WORKERS = int(
+    get_env_variable("ACCOUNTS_HASHING_WORKERS", str(os.cpu_count() or 1))
+)
+# Requests allowed to wait for a hasher, and for how many seconds
+ACCOUNTS_HASHING_QUEUE = int(
+    get_env_variable(
+        "ACCOUNTS_HASHING_QUEUE", str(ACCOUNTS_HASHING_WORKERS * 4)
+    )
+)
+ACCOUNTS_HASHING_WAIT = float(
+    get_env_variable("ACCOUNTS_HASHING_WAIT", "1")
+)
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -153,21 +338,32 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.DjangoModelPermissionsOrAnonReadOnly"
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": (
-       "rest_framework_simplejwt.authentication.JWTAuthentication",
+       "accounts.authentication.ClaimsJWTAuthentication",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_CLASSES": [
-       "rest_framework.throttling.AnonRateThrottle",
-       "rest_framework.throttling.UserRateThrottle"
+       "core.throttling.AnonSlidingWindowThrottle",
+       "core.throttling.UserSlidingWindowThrottle",
+       "core.throttling.ScopedSlidingWindowThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
        "anon": "100/day",
-       "user": "1000/day"
+       "user": "1000/day",
+       # Scopes named by views with throttle_scope(s)
+       "reservations": "30/hour",
+       "seat_holds": "120/hour",
     },
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
+    # The browsable API renders whole HTML forms per response,
+    # so it is only offered while developing
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
-        "rest_framework.renderers.BrowsableAPIRenderer",
+        "core.renderers.FastJSONRenderer",
+        *(["rest_framework.renderers.BrowsableAPIRenderer"] if DEBUG else []),
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "core.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ],
 }
 
@@ -187,9 +383,33 @@ SPECTACULAR_SETTINGS = {
 SIMPLE_JWT = {
    "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
    "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
-   "ROTATE_REFRESH_TOKENS": True
+   "ROTATE_REFRESH_TOKENS": True,
+   "TOKEN_OBTAIN_SERIALIZER": (
+       "accounts.serializers.ClaimsTokenObtainPairSerializer"
+   ),
+   "TOKEN_REFRESH_SERIALIZER": (
+       "accounts.serializers.ClaimsTokenRefreshSerializer"
+   ),
 }
 
+# Seconds a process reuses a user row loaded for a claims-only token
+ACCOUNTS_USER_CACHE_TIMEOUT = 5
+
+SEAT_HOLD_DURATION = timedelta(minutes=5)
+
+# Cache holding the rate limit counters, read without the local tier
+# so every worker sees the same counts. It must be a cache all workers
+# share, which is why gunicorn will not run several on locmem.
+THROTTLE_CACHE_ALIAS = "shared"
+
+THEATRE_CACHE_ALIAS = "default"
+THEATRE_CACHE_TIMEOUT = 60 * 60
+# Opt in to building performance, play and ticket list pages from
+# .values() rows, see theatre.fast_serializers
+THEATRE_FAST_LIST_SERIALIZERS = get_env_variable(
+    "THEATRE_FAST_LIST_SERIALIZERS", "False"
+) == "True"
+
 JAZZMIN_UI_TWEAKS = {
     "navbar_small_text": True,
     "footer_small_text": True,
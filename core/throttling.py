@@ -0,0 +1,115 @@
+"""
+Rate limits kept in a cache shared by every worker.
+
+Each client and scope uses two counters, the requests of the current
+fixed window and of the previous one. The previous count is weighted by
+how much of that window still overlaps the sliding window ending now,
+which approximates a true sliding log in constant memory. Each request
+is counted with an atomic increment before the decision is made from
+the returned count, so concurrent workers cannot overshoot the limit.
+"""
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from rest_framework.request import Request
+from rest_framework.throttling import (
+    AnonRateThrottle,
+    ScopedRateThrottle,
+    SimpleRateThrottle,
+    UserRateThrottle,
+)
+
+
+if TYPE_CHECKING:
+    # rest_framework.views loads the throttles named in the settings
+    from rest_framework.views import APIView
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    wait_seconds = None
+
+    @property
+    def cache(self) -> BaseCache:
+        return caches[settings.THROTTLE_CACHE_ALIAS]
+
+    def allow_request(self, request: Request, view: "APIView") -> bool:
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        window, offset = divmod(self.timer(), self.duration)
+        current_key = f"{self.key}:{int(window)}"
+        previous_key = f"{self.key}:{int(window) - 1}"
+
+        # Count the request first, so concurrent requests each see
+        # a distinct count and cannot all slip under the limit
+        # Kept until it has served as the previous window
+        self.cache.add(current_key, 0, self.duration * 2)
+        try:
+            current = self.cache.incr(current_key)
+        except ValueError:
+            # Evicted since it was added
+            self.cache.set(current_key, 1, self.duration * 2)
+            current = 1
+        previous = self.cache.get(previous_key, 0)
+
+        weight = 1 - offset / self.duration
+        if previous * weight + current > self.num_requests:
+            # Rejected requests do not count against the client
+            self.cache.decr(current_key)
+            self.wait_seconds = self.get_wait(previous, current - 1, offset)
+            return False
+        return True
+
+    def get_wait(self, previous: int, current: int, offset: float) -> float:
+        """
+        Seconds until the weight of the previous window drops enough
+        to let one more request in, or until the window rolls over.
+        """
+        if current < self.num_requests and previous:
+            return max(0.0, self.duration * (
+                1 - (self.num_requests - 1 - current) / previous
+            ) - offset)
+        return self.duration - offset
+
+    def wait(self) -> float | None:
+        return self.wait_seconds
+
+
+class AnonSlidingWindowThrottle(SlidingWindowThrottle, AnonRateThrottle):
+    """
+    Limit anonymous clients by IP address with the "anon" rate.
+    """
+
+
+class UserSlidingWindowThrottle(SlidingWindowThrottle, UserRateThrottle):
+    """
+    Limit users by id, and anonymous clients by IP address,
+    with the "user" rate.
+    """
+
+
+class ScopedSlidingWindowThrottle(SlidingWindowThrottle, ScopedRateThrottle):
+    """
+    Limit the views that name a scope, on top of the global rates.
+    Views set `throttle_scope` for all their actions, or map actions to
+    scopes with `throttle_scopes`, e.g. {"create": "reservations"}.
+    Clients are limited by user id, or by IP address when anonymous.
+    The scope, and so the rate, is only known once the view is, so like
+    ScopedRateThrottle it is looked up per request in `allow_request`.
+    """
+
+    def allow_request(self, request: Request, view: "APIView") -> bool:
+        self.scope = getattr(view, "throttle_scopes", {}).get(
+            getattr(view, "action", None),
+            getattr(view, "throttle_scope", None),
+        )
+        if not self.scope:
+            return True
+
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
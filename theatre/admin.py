@@ -6,6 +6,7 @@ from theatre.models import (
     Performance,
     Play,
     Reservation,
+    SeatHold,
     TheatreHall,
     Ticket,
 )
@@ -59,3 +60,9 @@ class ReservationAdmin(admin.ModelAdmin):
 class TicketAdmin(admin.ModelAdmin):
     list_display = ("row", "seat", "performance", "reservation")
     list_filter = ("performance", "reservation")
+
+
+@admin.register(SeatHold)
+class SeatHoldAdmin(admin.ModelAdmin):
+    list_display = ("row", "seat", "performance", "user", "expires_at")
+    list_filter = ("performance", "expires_at")
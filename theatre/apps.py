@@ -4,3 +4,15 @@ from django.apps import AppConfig
 class TheatreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "theatre"
+
+    def ready(self) -> None:
+        from health_check.plugins import plugin_dir
+
+        import theatre.signals  # noqa: F401
+        from theatre.health import (
+            DatabasePoolHealthCheck,
+            TieredCacheHealthCheck,
+        )
+
+        plugin_dir.register(DatabasePoolHealthCheck)
+        plugin_dir.register(TieredCacheHealthCheck)
@@ -0,0 +1,165 @@
+"""
+Async read-only twins of the busiest theatre routes, served under
+/api/theatre/async/ for ASGI deployments.
+
+They reuse the viewsets for querysets, filters, serializers, permissions
+and throttles, and only evaluate the queries with the async ORM, so a
+worker does not tie up a thread while a slow client waits on a response.
+"""
+from functools import wraps
+from typing import Awaitable, Callable
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.db.models import Model, QuerySet
+from django.http import Http404, HttpRequest, HttpResponse
+from django.views.decorators.http import require_safe
+from rest_framework.exceptions import (
+    APIException,
+    NotAuthenticated,
+    PermissionDenied,
+)
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.viewsets import GenericViewSet
+
+from accounts.authentication import ClaimsJWTAuthentication
+from core.db_router import ReplicaReadMixin, replica_reads
+from core.renderers import FastJSONRenderer
+from theatre.holds import taken_seats
+from theatre.pagination import AsyncPagination
+from theatre.seat_map import build_seat_map
+from theatre.views import PerformanceViewSet, PlayViewSet
+
+
+async def authenticate(request: Request) -> None:
+    """
+    Authenticate the JWT of the request like the API does,
+    looking the user up with the async ORM when the claims do not do.
+    """
+    authentication = ClaimsJWTAuthentication()
+    request.user = AnonymousUser()
+    header = authentication.get_header(request)
+    raw_token = header and authentication.get_raw_token(header)
+    if not raw_token:
+        return
+
+    token = authentication.get_validated_token(raw_token)
+    request.user = await authentication.aget_user(token)
+    request.auth = token
+
+
+def check_permissions(viewset: GenericViewSet) -> None:
+    try:
+        viewset.check_permissions(viewset.request)
+    except PermissionDenied:
+        # The request carries no authenticators DRF could ask about
+        if not viewset.request.user.is_authenticated:
+            raise NotAuthenticated()
+        raise
+
+
+def render(response: Response) -> Response:
+    response.accepted_renderer = FastJSONRenderer()
+    response.accepted_media_type = FastJSONRenderer.media_type
+    response.renderer_context = {}
+    return response.render()
+
+
+def async_read_view(
+    viewset_class: type[GenericViewSet],
+    action: str
+) -> Callable:
+    """
+    Turn `handler(view, **kwargs)` into an async GET view that runs
+    the authentication, permission and throttle checks of the viewset
+    and handles API exceptions the way the viewset would.
+    """
+    def decorator(
+        handler: Callable[..., Awaitable[Response]]
+    ) -> Callable[..., Awaitable[HttpResponse]]:
+        @require_safe
+        @wraps(handler)
+        async def view(request: HttpRequest, **kwargs: dict) -> HttpResponse:
+            viewset = viewset_class(
+                action=action,
+                request=Request(request),
+                args=(),
+                kwargs=kwargs,
+                format_kwarg=None,
+                headers={},
+            )
+            try:
+                await authenticate(viewset.request)
+                check_permissions(viewset)
+                await sync_to_async(viewset.check_throttles)(viewset.request)
+                replicas = issubclass(
+                    viewset_class, ReplicaReadMixin
+                ) and await sync_to_async(viewset.uses_replicas)(
+                    viewset.request
+                )
+                with replica_reads(replicas):
+                    response = await handler(viewset, **kwargs)
+            except (APIException, Http404) as exc:
+                response = viewset.handle_exception(exc)
+            return render(response)
+
+        return view
+
+    return decorator
+
+
+async def filtered_queryset(viewset: GenericViewSet) -> QuerySet:
+    # Filter forms and the search index check may hit the database
+    return await sync_to_async(
+        lambda: viewset.filter_queryset(viewset.get_queryset())
+    )()
+
+
+async def paginated_list(viewset: GenericViewSet) -> Response:
+    paginator = AsyncPagination()
+    page = await paginator.apaginate_queryset(
+        await filtered_queryset(viewset), viewset.request
+    )
+    serializer = viewset.get_serializer(page, many=True)
+    return paginator.get_paginated_response(serializer.data)
+
+
+async def get_object(viewset: GenericViewSet, pk: int) -> Model:
+    obj = await viewset.get_queryset().filter(pk=pk).afirst()
+    if obj is None:
+        raise Http404
+    return obj
+
+
+@async_read_view(PerformanceViewSet, "list")
+async def performance_list(viewset: PerformanceViewSet) -> Response:
+    return await paginated_list(viewset)
+
+
+@async_read_view(PerformanceViewSet, "retrieve")
+async def performance_detail(
+    viewset: PerformanceViewSet,
+    pk: int
+) -> Response:
+    performance = await get_object(viewset, pk)
+    return Response(viewset.get_serializer(performance).data)
+
+
+@async_read_view(PerformanceViewSet, "seats")
+async def performance_seats(
+    viewset: PerformanceViewSet,
+    pk: int
+) -> Response:
+    performance = await get_object(viewset, pk)
+    hall = performance.theatre_hall
+    seats = [seat async for seat in taken_seats(performance.id)]
+    serializer = viewset.get_serializer(build_seat_map(
+        performance.id, hall.rows, hall.seats_in_row, seats
+    ))
+    return Response(serializer.data)
+
+
+@async_read_view(PlayViewSet, "list")
+async def play_list(viewset: PlayViewSet) -> Response:
+    return await paginated_list(viewset)
@@ -0,0 +1,474 @@
+import asyncio
+import statistics
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter, process_time
+from typing import Callable, Iterator
+from uuid import uuid4
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.http import HttpResponse
+from django.test import AsyncClient, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.viewsets import GenericViewSet
+
+from accounts.authentication import ClaimsRefreshToken
+from accounts.models import User
+from core.renderers import JSON_BACKEND, FastJSONRenderer
+from theatre.models import Performance
+from theatre.serializers import (
+    PlayDetailSerializer,
+    ReservationDetailSerializer,
+)
+from theatre.urls import router
+from theatre.views import (
+    PerformanceViewSet,
+    PlayViewSet,
+    ReservationViewSet,
+    TicketViewSet,
+)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[round(fraction * (len(ordered) - 1))]
+
+
+def measure(
+    request: Callable[[], HttpResponse],
+    iterations: int,
+    warmup: int = 1,
+    prepare: Callable[[], None] | None = None
+) -> dict:
+    """
+    Call the request repeatedly and summarise latency,
+    query count and response size. `prepare` runs untimed
+    before every request.
+    """
+    for _ in range(warmup):
+        request()
+
+    latencies = []
+    query_counts = []
+    for _ in range(iterations):
+        if prepare is not None:
+            prepare()
+        with CaptureQueriesContext(connection) as queries:
+            start = perf_counter()
+            response = request()
+            latencies.append((perf_counter() - start) * 1000)
+        query_counts.append(len(queries))
+
+    return {
+        "status": response.status_code,
+        "p50_ms": round(percentile(latencies, 0.5), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "queries": round(statistics.median(query_counts)),
+        "bytes": len(response.content),
+    }
+
+
+def theatre_routes(
+    client: APIClient
+) -> Iterator[tuple[str, str, str, Callable[[], HttpResponse]]]:
+    """
+    Yield (name, method, path, request) for the list, detail and extra
+    GET detail routes of every viewset registered in theatre.urls.
+    """
+    for _, viewset, basename in router.registry:
+        list_path = reverse(f"theatre:{basename}-list")
+        yield (
+            f"theatre:{basename}-list",
+            "GET",
+            list_path,
+            lambda path=list_path: client.get(path),
+        )
+
+        results = client.get(list_path).data["results"]
+        if not results or not hasattr(viewset, "retrieve"):
+            continue
+        pk = results[0]["id"]
+
+        detail_path = reverse(f"theatre:{basename}-detail", args=[pk])
+        yield (
+            f"theatre:{basename}-detail",
+            "GET",
+            detail_path,
+            lambda path=detail_path: client.get(path),
+        )
+
+        for extra_action in viewset.get_extra_actions():
+            if not extra_action.detail or "get" not in extra_action.mapping:
+                continue
+            name = f"theatre:{basename}-{extra_action.url_name}"
+            path = reverse(name, args=[pk])
+            yield name, "GET", path, lambda path=path: client.get(path)
+
+
+def accounts_routes(
+    client: APIClient,
+    user: User,
+    password: str
+) -> Iterator[tuple[str, str, str, Callable[[], HttpResponse]]]:
+    """
+    Yield (name, method, path, request) for every route in accounts.urls.
+    """
+    anonymous = APIClient()
+    refresh = ClaimsRefreshToken.for_user(user)
+    credentials = {"email": user.email, "password": password}
+
+    path = reverse("accounts:me")
+    yield "accounts:me", "GET", path, lambda: client.get(path)
+
+    register_path = reverse("accounts:create")
+    yield (
+        "accounts:create",
+        "POST",
+        register_path,
+        lambda: anonymous.post(register_path, {
+            "email": f"{uuid4().hex}@example.com", "password": password
+        }),
+    )
+
+    token_path = reverse("accounts:token_obtain_pair")
+    yield (
+        "accounts:token_obtain_pair",
+        "POST",
+        token_path,
+        lambda: anonymous.post(token_path, credentials),
+    )
+
+    refresh_path = reverse("accounts:token_refresh")
+    yield (
+        "accounts:token_refresh",
+        "POST",
+        refresh_path,
+        lambda: anonymous.post(
+            refresh_path, {"refresh": str(ClaimsRefreshToken.for_user(user))}
+        ),
+    )
+
+    verify_path = reverse("accounts:token_verify")
+    yield (
+        "accounts:token_verify",
+        "POST",
+        verify_path,
+        lambda: anonymous.post(
+            verify_path, {"token": str(refresh.access_token)}
+        ),
+    )
+
+
+def benchmark_endpoints(
+    user: User,
+    password: str,
+    iterations: int
+) -> dict[str, dict]:
+    access_token = ClaimsRefreshToken.for_user(user).access_token
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+    routes = [
+        *theatre_routes(client),
+        *accounts_routes(client, user, password),
+    ]
+    cache = caches["default"]
+    return {
+        name: {
+            "method": method,
+            "path": path,
+            # Every request misses the response cache
+            "cold": measure(request, iterations, prepare=cache.clear),
+            "warm": measure(request, iterations),
+        }
+        for name, method, path, request in routes
+    }
+
+
+def summarise_throughput(
+    results: list[tuple[float, int]],
+    elapsed: float,
+    concurrency: int
+) -> dict:
+    latencies = [latency for latency, _ in results]
+    return {
+        "requests": len(results),
+        "concurrency": concurrency,
+        "errors": sum(status >= 400 for _, status in results),
+        "requests_per_s": round(len(results) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.5), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+    }
+
+
+def threaded_throughput(
+    send_request: Callable[[Client, int], HttpResponse],
+    headers: dict,
+    requests: int,
+    concurrency: int
+) -> dict:
+    """
+    Send the requests through the WSGI handler from a pool of threads,
+    one thread per concurrent request as a threaded WSGI server would.
+    """
+    local = threading.local()
+
+    def send(index: int) -> tuple[float, int]:
+        if not hasattr(local, "client"):
+            local.client = Client(headers=headers)
+        start = perf_counter()
+        response = send_request(local.client, index)
+        return (perf_counter() - start) * 1000, response.status_code
+
+    start = perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        results = list(executor.map(send, range(requests)))
+    return summarise_throughput(results, perf_counter() - start, concurrency)
+
+
+def wsgi_throughput(
+    path: str,
+    headers: dict,
+    requests: int,
+    concurrency: int
+) -> dict:
+    return threaded_throughput(
+        lambda client, _: client.get(path), headers, requests, concurrency
+    )
+
+
+async def asgi_throughput(
+    path: str,
+    headers: dict,
+    requests: int,
+    concurrency: int
+) -> dict:
+    """
+    Send the requests through the ASGI handler from one event loop,
+    with at most `concurrency` of them in flight.
+    """
+    client = AsyncClient()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send() -> tuple[float, int]:
+        async with semaphore:
+            start = perf_counter()
+            response = await client.get(path, headers=headers)
+            return (perf_counter() - start) * 1000, response.status_code
+
+    start = perf_counter()
+    results = await asyncio.gather(*(send() for _ in range(requests)))
+    return summarise_throughput(results, perf_counter() - start, concurrency)
+
+
+def benchmark_asgi(
+    user: User,
+    requests: int,
+    concurrency: int
+) -> dict[str, dict]:
+    """
+    Compare the sync viewsets served over WSGI with their async twins
+    served over ASGI, route by route, against the same dataset.
+    The sync play list is answered from the response cache after the
+    first request, the async one always queries the database.
+    """
+    access_token = ClaimsRefreshToken.for_user(user).access_token
+    headers = {"authorization": f"Bearer {access_token}"}
+    pk = Performance.objects.order_by("pk").values_list("pk", flat=True)[0]
+    routes = {
+        "performance-list": ([], "performance-list"),
+        "performance-detail": ([pk], "performance-detail"),
+        "performance-seats": ([pk], "performance-seats"),
+        "play-list": ([], "play-list"),
+    }
+
+    report = {}
+    for name, (args, url_name) in routes.items():
+        sync_path = reverse(f"theatre:{url_name}", args=args)
+        async_path = reverse(f"theatre:async-{url_name}", args=args)
+        report[name] = {
+            "wsgi": wsgi_throughput(
+                sync_path, headers, requests, concurrency
+            ),
+            "asgi": async_to_sync(asgi_throughput)(
+                async_path, headers, requests, concurrency
+            ),
+        }
+    return report
+
+
+def serializer_payloads(count: int) -> dict[str, list]:
+    """
+    Serialize `count` plays and reservations the way their detail
+    routes do, so only rendering is left to measure.
+    """
+    plays = PlayViewSet(action="retrieve").get_queryset().order_by("id")
+    reservations = ReservationViewSet(
+        action="retrieve"
+    ).get_queryset().order_by("id")
+    return {
+        "play-detail": PlayDetailSerializer(
+            plays[:count], many=True
+        ).data,
+        "reservation-detail": ReservationDetailSerializer(
+            reservations[:count], many=True
+        ).data,
+    }
+
+
+def render_throughput(
+    renderer: BaseRenderer,
+    payload: list,
+    iterations: int
+) -> dict:
+    renderer.render(payload)
+    start = perf_counter()
+    for _ in range(iterations):
+        content = renderer.render(payload)
+    elapsed = perf_counter() - start
+    return {
+        "bytes": len(content),
+        "mean_ms": round(elapsed / iterations * 1000, 3),
+        "mb_per_s": round(len(content) * iterations / elapsed / 1e6, 1),
+    }
+
+
+def benchmark_renderers(iterations: int, count: int = 100) -> dict:
+    """
+    Compare DRF's stdlib JSON renderer with FastJSONRenderer
+    on lists of detailed plays and reservations.
+    """
+    renderers = {
+        "json": JSONRenderer(),
+        f"fast ({JSON_BACKEND})": FastJSONRenderer(),
+    }
+    return {
+        name: {
+            renderer_name: render_throughput(renderer, payload, iterations)
+            for renderer_name, renderer in renderers.items()
+        }
+        for name, payload in serializer_payloads(count).items()
+    }
+
+
+def cpu_time(build: Callable[[], list], iterations: int) -> dict:
+    build()
+    start = process_time()
+    for _ in range(iterations):
+        data = build()
+    elapsed = process_time() - start
+    return {
+        "rows": len(data),
+        "cpu_ms": round(elapsed / iterations * 1000, 3),
+    }
+
+
+def list_view(
+    viewset_class: type[GenericViewSet],
+    user: User,
+    page_size: int
+) -> GenericViewSet:
+    request = Request(APIRequestFactory().get("/", {"page_size": page_size}))
+    request.user = user
+    return viewset_class(
+        action="list",
+        request=request,
+        args=(),
+        kwargs={},
+        format_kwarg=None,
+    )
+
+
+def list_serialization_cpu(
+    view: GenericViewSet,
+    page_size: int,
+    iterations: int
+) -> dict:
+    """
+    Measure the CPU time of loading and serializing one list page with
+    the DRF list serializer and with the fast list serializer.
+    """
+    queryset = view.filter_queryset(view.get_queryset())
+    fast_serializer = view.fast_list_serializer_class(
+        view.get_serializer_context()
+    )
+    drf = cpu_time(
+        lambda: view.get_serializer(
+            list(queryset[:page_size]), many=True
+        ).data,
+        iterations,
+    )
+    fast = cpu_time(
+        lambda: fast_serializer.serialize(
+            list(fast_serializer.get_rows(queryset)[:page_size])
+        ),
+        iterations,
+    )
+    return {
+        "drf": drf,
+        "fast": fast,
+        "speedup": round(drf["cpu_ms"] / fast["cpu_ms"], 2),
+    }
+
+
+def benchmark_list_serializers(
+    user: User,
+    iterations: int,
+    page_size: int = 100
+) -> dict:
+    viewsets = {
+        "performance-list": PerformanceViewSet,
+        "play-list": PlayViewSet,
+        "ticket-list": TicketViewSet,
+    }
+    return {
+        name: list_serialization_cpu(
+            list_view(viewset_class, user, page_size), page_size, iterations
+        )
+        for name, viewset_class in viewsets.items()
+    }
+
+
+def benchmark_hashing(
+    user: User,
+    password: str,
+    requests: int,
+    concurrency: int
+) -> dict:
+    """
+    Measure registration and token throughput under concurrent load,
+    which the password hashing pool bounds. Requests it turns away
+    count as errors.
+    """
+    register_path = reverse("accounts:create")
+    token_path = reverse("accounts:token_obtain_pair")
+    run_id = uuid4().hex
+    return {
+        "hasher": settings.PASSWORD_HASHER,
+        "workers": settings.ACCOUNTS_HASHING_WORKERS,
+        "queue": settings.ACCOUNTS_HASHING_QUEUE,
+        "accounts:create": threaded_throughput(
+            lambda client, index: client.post(register_path, {
+                "email": f"{run_id}-{index}@example.com",
+                "password": password,
+            }),
+            {},
+            requests,
+            concurrency,
+        ),
+        "accounts:token_obtain_pair": threaded_throughput(
+            lambda client, _: client.post(token_path, {
+                "email": user.email, "password": password
+            }),
+            {},
+            requests,
+            concurrency,
+        ),
+    }
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import time
+from typing import Callable
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from core.db_router import replica_reads
+
+
+CATALOGUE_VERSION_KEY = "theatre:catalogue:version"
+
+
+def get_cache() -> BaseCache:
+    return caches[settings.THEATRE_CACHE_ALIAS]
+
+
+def get_catalogue_version() -> int:
+    """
+    Return the current catalogue version, which is part of every
+    cached response key, so bumping it invalidates them all at once.
+    """
+    cache = get_cache()
+    version = cache.get(CATALOGUE_VERSION_KEY)
+    if version is None:
+        # Start from a timestamp so an evicted counter never
+        # comes back as a version that is still cached
+        cache.add(CATALOGUE_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(CATALOGUE_VERSION_KEY)
+    return version
+
+
+def bump_catalogue_version() -> None:
+    cache = get_cache()
+    try:
+        cache.incr(CATALOGUE_VERSION_KEY)
+    except ValueError:
+        cache.add(CATALOGUE_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def get_etag(data: object) -> str:
+    content = json.dumps(data, cls=JSONEncoder, sort_keys=True)
+    return f'"{hashlib.sha1(content.encode()).hexdigest()}"'
+
+
+class CachedResponseMixin:
+    """
+    Serve responses from the versioned catalogue cache
+    and answer If-None-Match requests with 304 Not Modified.
+    Responses are always rendered from the primary.
+    """
+
+    def get_cache_key(self, request: Request) -> str:
+        query = sorted(request.query_params.lists())
+        url = f"{request.build_absolute_uri(request.path)}?{query}"
+        return (
+            f"theatre:response:{get_catalogue_version()}:"
+            f"{self.basename}:{self.action}:"
+            f"{hashlib.sha1(url.encode()).hexdigest()}"
+        )
+
+    def get_cached_response(
+        self,
+        handler: Callable[..., Response],
+        request: Request,
+        *args: tuple,
+        **kwargs: dict
+    ) -> Response:
+        response = None
+
+        def render() -> tuple[object, str] | None:
+            nonlocal response
+            # A lagging replica would store rows older than the
+            # version in the key until the timeout
+            with replica_reads(False):
+                response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return None
+            return response.data, get_etag(response.data)
+
+        # Concurrent misses of one key wait for a single render
+        cached = get_cache().get_or_compute(
+            self.get_cache_key(request),
+            render,
+            settings.THEATRE_CACHE_TIMEOUT,
+        )
+        if cached is None:
+            # Not cacheable, this request rendered it
+            return response
+
+        data, etag = cached
+        if_none_match = request.headers.get("If-None-Match", "")
+        if etag in (tag.strip() for tag in if_none_match.split(",")):
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+            )
+        return Response(data, headers={"ETag": etag})
+
+
+class CachedListMixin(CachedResponseMixin):
+    def list(
+        self,
+        request: Request,
+        *args: tuple,
+        **kwargs: dict
+    ) -> Response:
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class CachedRetrieveMixin(CachedResponseMixin):
+    def retrieve(
+        self,
+        request: Request,
+        *args: tuple,
+        **kwargs: dict
+    ) -> Response:
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
@@ -0,0 +1,100 @@
+import csv
+import json
+from datetime import datetime
+from typing import Callable, Iterable, Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+
+from theatre.models import Ticket
+
+
+# Output column -> ticket lookup
+EXPORT_COLUMNS = {
+    "reservation_id": "reservation_id",
+    "reservation_created_at": "reservation__created_at",
+    "user_email": "reservation__user__email",
+    "ticket_id": "id",
+    "performance_id": "performance_id",
+    "show_time": "performance__show_time",
+    "play": "performance__play__title",
+    "theatre_hall": "performance__theatre_hall__name",
+    "row": "row",
+    "seat": "seat",
+}
+
+EXPORT_CONTENT_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def export_queryset(
+    start: datetime | None = None,
+    end: datetime | None = None
+) -> QuerySet:
+    """
+    Flat ticket rows of the reservations created in [start, end).
+    """
+    queryset = Ticket.objects.all()
+    if start is not None:
+        queryset = queryset.filter(reservation__created_at__gte=start)
+    if end is not None:
+        queryset = queryset.filter(reservation__created_at__lt=end)
+    return queryset.order_by("reservation_id", "id").values_list(
+        *EXPORT_COLUMNS.values()
+    )
+
+
+class EchoBuffer:
+    """
+    File-like object that hands back whatever csv.writer writes to it.
+    """
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def format_csv(rows: Iterable[tuple]) -> Iterator[str]:
+    writer = csv.writer(EchoBuffer())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        yield writer.writerow(
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in row
+        )
+
+
+def format_ndjson(rows: Iterable[tuple]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(
+            dict(zip(EXPORT_COLUMNS, row)), cls=DjangoJSONEncoder
+        ) + "\n"
+
+
+EXPORT_FORMATTERS: dict[str, Callable[[Iterable[tuple]], Iterator[str]]] = {
+    "csv": format_csv,
+    "ndjson": format_ndjson,
+}
+
+
+def stream_export(
+    queryset: QuerySet,
+    file_format: str,
+    chunk_size: int = 2000
+) -> Iterator[str]:
+    """
+    Stream the rows with a server-side cursor, yielding one string
+    per chunk of rows so memory does not grow with the export size.
+    """
+    lines = EXPORT_FORMATTERS[file_format](
+        queryset.iterator(chunk_size=chunk_size)
+    )
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) == chunk_size:
+            yield "".join(chunk)
+            chunk.clear()
+    if chunk:
+        yield "".join(chunk)
@@ -0,0 +1,183 @@
+"""
+Read-only list serializers that build documents straight from
+.values() rows, skipping model instances and DRF field objects.
+
+Each one produces exactly what its DRF counterpart does for the list
+action of the same viewset, tests/test_fast_serializers.py holds them
+to that.
+"""
+from abc import ABC, abstractmethod
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import F, QuerySet
+from rest_framework import serializers
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from theatre.models import Play
+
+
+# DRF's timezone handling and ISO 8601 formatting
+show_time_field = serializers.DateTimeField()
+
+
+class FastListSerializer(ABC):
+    """
+    Select the columns a list page needs with `get_rows`
+    and turn the page into documents with `serialize`.
+    """
+
+    def __init__(self, context: dict) -> None:
+        self.context = context
+
+    @abstractmethod
+    def get_rows(self, queryset: QuerySet) -> QuerySet:
+        pass
+
+    @abstractmethod
+    def serialize(self, rows: list[dict]) -> list[dict]:
+        pass
+
+
+class FastPerformanceListSerializer(FastListSerializer):
+    """
+    Counterpart of PerformanceListSerializer,
+    the queryset must carry the capacity annotations of the list action.
+    """
+
+    def get_rows(self, queryset: QuerySet) -> QuerySet:
+        return queryset.values(
+            "id",
+            "show_time",
+            "capacity",
+            "tickets_available",
+            play_title=F("play__title"),
+            theatre_hall_name=F("theatre_hall__name"),
+        )
+
+    def serialize(self, rows: list[dict]) -> list[dict]:
+        to_time = show_time_field.to_representation
+        return [
+            {
+                "id": row["id"],
+                "play_title": row["play_title"],
+                "theatre_hall_name": row["theatre_hall_name"],
+                "show_time": to_time(row["show_time"]),
+                "capacity": row["capacity"],
+                "tickets_available": row["tickets_available"],
+            }
+            for row in rows
+        ]
+
+
+class FastPlayListSerializer(FastListSerializer):
+    """
+    Counterpart of PlayListSerializer, loading the actor and genre names
+    of a page with one query each, like the list prefetch does.
+    """
+
+    def get_rows(self, queryset: QuerySet) -> QuerySet:
+        # The relations are loaded per page by serialize
+        return queryset.prefetch_related(None).values("id", "title", "poster")
+
+    def get_poster_url(self, name: str) -> str | None:
+        if not name:
+            return None
+        url = Play._meta.get_field("poster").storage.url(name)
+        request = self.context.get("request")
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+
+    def serialize(self, rows: list[dict]) -> list[dict]:
+        play_ids = [row["id"] for row in rows]
+        actors = defaultdict(list)
+        actor_rows = Play.actors.through.objects.filter(
+            play_id__in=play_ids
+        ).order_by("actor_id").values_list(
+            "play_id", "actor__first_name", "actor__last_name"
+        )
+        for play_id, first_name, last_name in actor_rows:
+            actors[play_id].append(f"{first_name} {last_name}")
+
+        genres = defaultdict(list)
+        genre_rows = Play.genres.through.objects.filter(
+            play_id__in=play_ids
+        ).order_by("genre_id").values_list("play_id", "genre__name")
+        for play_id, name in genre_rows:
+            genres[play_id].append(name)
+
+        return [
+            {
+                "id": row["id"],
+                "title": row["title"],
+                "actors": actors[row["id"]],
+                "genres": genres[row["id"]],
+                "poster": self.get_poster_url(row["poster"]),
+            }
+            for row in rows
+        ]
+
+
+class FastTicketListSerializer(FastListSerializer):
+    """
+    Counterpart of TicketListSerializer.
+    """
+
+    def get_rows(self, queryset: QuerySet) -> QuerySet:
+        return queryset.values(
+            "id",
+            "row",
+            "seat",
+            "reservation_id",
+            "performance_id",
+            play_title=F("performance__play__title"),
+            theatre_hall_name=F("performance__theatre_hall__name"),
+            show_time=F("performance__show_time"),
+        )
+
+    def serialize(self, rows: list[dict]) -> list[dict]:
+        to_time = show_time_field.to_representation
+        return [
+            {
+                "id": row["id"],
+                "row": row["row"],
+                "seat": row["seat"],
+                "performance": {
+                    "id": row["performance_id"],
+                    "play_title": row["play_title"],
+                    "theatre_hall_name": row["theatre_hall_name"],
+                    "show_time": to_time(row["show_time"]),
+                },
+                "reservation": row["reservation_id"],
+            }
+            for row in rows
+        ]
+
+
+class FastListMixin:
+    """
+    Serve the list action with `fast_list_serializer_class`
+    while THEATRE_FAST_LIST_SERIALIZERS is on.
+    """
+
+    fast_list_serializer_class = None
+
+    def list(
+        self,
+        request: Request,
+        *args: tuple,
+        **kwargs: dict
+    ) -> Response:
+        if not settings.THEATRE_FAST_LIST_SERIALIZERS:
+            return super().list(request, *args, **kwargs)
+
+        serializer = self.fast_list_serializer_class(
+            self.get_serializer_context()
+        )
+        rows = serializer.get_rows(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(list(rows)))
@@ -0,0 +1,46 @@
+import datetime
+
+from django.db.models import QuerySet
+from django.utils import timezone
+from django_filters import rest_framework as filters
+
+from theatre.models import Performance
+
+
+class PerformanceFilter(filters.FilterSet):
+    date = filters.DateFilter(method="filter_date")
+    upcoming = filters.BooleanFilter(method="filter_upcoming")
+
+    class Meta:
+        model = Performance
+        fields = {
+            "play": ["exact"],
+            "theatre_hall": ["exact"],
+            "show_time": ["exact", "gte", "lt"],
+        }
+
+    def filter_date(
+        self,
+        queryset: QuerySet,
+        name: str,
+        value: datetime.date
+    ) -> QuerySet:
+        # A half-open range keeps the show_time indexes usable,
+        # unlike a show_time__date lookup
+        start = timezone.make_aware(
+            datetime.datetime.combine(value, datetime.time.min)
+        )
+        return queryset.filter(
+            show_time__gte=start,
+            show_time__lt=start + datetime.timedelta(days=1),
+        )
+
+    def filter_upcoming(
+        self,
+        queryset: QuerySet,
+        name: str,
+        value: bool
+    ) -> QuerySet:
+        if value:
+            return queryset.filter(show_time__gte=timezone.now())
+        return queryset.filter(show_time__lt=timezone.now())
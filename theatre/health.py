@@ -0,0 +1,69 @@
+from django.core.cache import caches
+from django.db import connection
+from health_check.backends import BaseHealthCheckBackend
+from health_check.exceptions import ServiceWarning
+
+
+class DatabasePoolHealthCheck(BaseHealthCheckBackend):
+    """
+    Report how the serving worker process manages its database
+    connections: pool statistics when POSTGRES_POOL is enabled,
+    the persistent connection settings otherwise.
+    """
+
+    critical_service = False
+
+    def get_stats(self) -> dict:
+        pool = getattr(connection, "pool", None)
+        if pool is None:
+            return {
+                "pooled": False,
+                "conn_max_age": connection.settings_dict["CONN_MAX_AGE"],
+                "health_checks": connection.settings_dict[
+                    "CONN_HEALTH_CHECKS"
+                ],
+            }
+
+        stats = pool.get_stats()
+        size = stats.get("pool_size", 0)
+        return {
+            "pooled": True,
+            "size": size,
+            "max_size": stats.get("pool_max", 0),
+            "in_use": size - stats.get("pool_available", 0),
+            "waiting": stats.get("requests_waiting", 0),
+            "created": stats.get("connections_num", 0),
+        }
+
+    def check_status(self) -> None:
+        self.stats = self.get_stats()
+        if self.stats.get("waiting"):
+            raise ServiceWarning(
+                f"{self.stats['waiting']} requests are waiting "
+                f"for a database connection"
+            )
+
+    def pretty_status(self) -> str:
+        stats = ", ".join(
+            f"{name}={value}" for name, value in self.stats.items()
+        )
+        return f"{super().pretty_status()} ({stats})"
+
+
+class TieredCacheHealthCheck(BaseHealthCheckBackend):
+    """
+    Report the hit, miss and eviction counts of the serving worker's
+    local cache tier since it started.
+    """
+
+    critical_service = False
+
+    def check_status(self) -> None:
+        cache = caches["default"]
+        self.stats = cache.stats() if hasattr(cache, "stats") else {}
+
+    def pretty_status(self) -> str:
+        stats = ", ".join(
+            f"{name}={value}" for name, value in self.stats.items()
+        )
+        return f"{super().pretty_status()} ({stats})"
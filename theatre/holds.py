@@ -0,0 +1,171 @@
+from datetime import datetime
+from functools import reduce
+from operator import or_
+from typing import Iterable
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from theatre.models import Performance, SeatHold, Ticket
+
+
+class SeatsUnavailable(Exception):
+    def __init__(self, seats: Iterable[tuple[int, int]]) -> None:
+        self.seats = sorted(seats)
+        super().__init__(f"Seats are not available: {self.seats}")
+
+
+def lock_performances(performance_ids: Iterable[int]) -> None:
+    """
+    Lock the given performances until the end of the current transaction,
+    so seat holds and reservations for them are written one at a time.
+    On SQLite this is a no-op and the unique constraints on
+    SeatHold and Ticket are the last line of defence.
+    """
+    list(
+        Performance.objects.select_for_update()
+        .filter(pk__in=performance_ids)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+
+def active_holds(now: datetime | None = None) -> QuerySet:
+    return SeatHold.objects.filter(expires_at__gt=now or timezone.now())
+
+
+def taken_seats(performance_id: int) -> QuerySet:
+    """
+    (row, seat) pairs of a performance that are sold or held.
+    """
+    return Ticket.objects.filter(
+        performance_id=performance_id
+    ).values_list("row", "seat").union(
+        active_holds().filter(
+            performance_id=performance_id
+        ).values_list("row", "seat")
+    )
+
+
+def seats_filter(seats: Iterable[tuple[int, int, int]]) -> Q:
+    """
+    Build a filter matching exactly the given
+    (performance_id, row, seat) triples.
+    """
+    return reduce(or_, (
+        Q(performance_id=performance_id, row=row, seat=seat)
+        for performance_id, row, seat in seats
+    ))
+
+
+def acquire_holds(
+    user_id: int,
+    performance: Performance,
+    seats: Iterable[tuple[int, int]]
+) -> list[SeatHold]:
+    """
+    Hold the given (row, seat) pairs for the user and return the holds.
+    Holds the user already has on these seats are extended.
+    :raises SeatsUnavailable: If a seat is sold or held by someone else.
+    """
+    seats = set(seats)
+    if not seats:
+        return []
+    try:
+        with transaction.atomic():
+            lock_performances([performance.id])
+            now = timezone.now()
+            expires_at = now + settings.SEAT_HOLD_DURATION
+
+            existing_holds = {
+                (hold.row, hold.seat): hold
+                for hold in SeatHold.objects.filter(
+                    seats_filter(
+                        (performance.id, row, seat) for row, seat in seats
+                    )
+                )
+            }
+            unavailable = set(
+                Ticket.objects.filter(
+                    seats_filter(
+                        (performance.id, row, seat) for row, seat in seats
+                    )
+                ).values_list("row", "seat")
+            )
+            unavailable.update(
+                seat for seat, hold in existing_holds.items()
+                if hold.user_id != user_id and hold.expires_at > now
+            )
+            if unavailable:
+                raise SeatsUnavailable(unavailable)
+
+            own_holds = []
+            expired_hold_ids = []
+            for hold in existing_holds.values():
+                if hold.user_id == user_id:
+                    hold.expires_at = expires_at
+                    own_holds.append(hold)
+                else:
+                    expired_hold_ids.append(hold.pk)
+
+            SeatHold.objects.filter(pk__in=expired_hold_ids).delete()
+            SeatHold.objects.bulk_update(own_holds, ["expires_at"])
+            new_holds = SeatHold.objects.bulk_create(
+                SeatHold(
+                    row=row,
+                    seat=seat,
+                    performance=performance,
+                    user_id=user_id,
+                    expires_at=expires_at,
+                )
+                for row, seat in seats - {
+                    (hold.row, hold.seat) for hold in own_holds
+                }
+            )
+    except IntegrityError:
+        # A concurrent writer won the race for one of the seats
+        raise SeatsUnavailable(seats)
+
+    return sorted(
+        own_holds + new_holds, key=lambda hold: (hold.row, hold.seat)
+    )
+
+
+def release_holds(
+    user_id: int,
+    seats: Iterable[tuple[int, int, int]]
+) -> int:
+    """
+    Delete the user's holds on the given (performance_id, row, seat) triples.
+    """
+    seats = list(seats)
+    if not seats:
+        return 0
+    deleted, _ = SeatHold.objects.filter(
+        seats_filter(seats), user_id=user_id
+    ).delete()
+    return deleted
+
+
+def sweep_expired_holds(batch_size: int = 1000) -> int:
+    """
+    Delete expired holds in batches and return how many were removed.
+    Concurrent sweepers on PostgreSQL skip each other's locked rows.
+    """
+    now = timezone.now()
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            expired = SeatHold.objects.filter(expires_at__lte=now)
+            if connection.features.has_select_for_update_skip_locked:
+                expired = expired.select_for_update(skip_locked=True)
+            hold_ids = list(
+                expired.order_by("pk").values_list("pk", flat=True)[
+                    :batch_size
+                ]
+            )
+            if not hold_ids:
+                return deleted
+            deleted += SeatHold.objects.filter(pk__in=hold_ids).delete()[0]
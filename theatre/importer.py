@@ -0,0 +1,311 @@
+import csv
+from collections import defaultdict
+from typing import Iterable, TextIO
+
+from django.db import transaction
+from django.db.models import Value
+from django.db.models.functions import Concat
+
+from theatre.cache import bump_catalogue_version
+from theatre.models import Actor, Genre, Performance, Play, TheatreHall
+
+
+IMPORT_KINDS = ("genres", "actors", "theatre_halls", "plays", "performances")
+
+# CSV columns holding several names, e.g. "Drama;Tragedy"
+CSV_LIST_COLUMNS = {"plays": ("actors", "genres")}
+CSV_LIST_SEPARATOR = ";"
+
+
+class CatalogueImportError(Exception):
+    def __init__(self, errors: dict) -> None:
+        self.errors = errors
+        super().__init__(f"Catalogue import failed: {errors}")
+
+
+def read_csv(kind: str, file: TextIO) -> list[dict]:
+    """
+    Read the rows of one import kind from CSV,
+    splitting list columns on CSV_LIST_SEPARATOR.
+    """
+    rows = []
+    for row in csv.DictReader(file):
+        for column in CSV_LIST_COLUMNS.get(kind, ()):
+            row[column] = [
+                name.strip()
+                for name in (row.get(column) or "").split(CSV_LIST_SEPARATOR)
+                if name.strip()
+            ]
+        rows.append(row)
+    return rows
+
+
+def full_name(first_name: str, last_name: str) -> str:
+    return f"{first_name} {last_name}"
+
+
+class CatalogueImporter:
+    """
+    Upsert a validated catalogue batch with a fixed number of queries
+    per kind, resolving references by name in memory.
+
+    Genres and halls are matched by their unique name, actors by full
+    name and plays by title. The cast and genres of an imported play
+    are replaced by the ones listed, and performances that already
+    exist for the same play, hall and time are left as they are.
+    """
+
+    def __init__(self, data: dict, batch_size: int = 1000) -> None:
+        self.data = {kind: data.get(kind, []) for kind in IMPORT_KINDS}
+        self.batch_size = batch_size
+        self.errors = defaultdict(dict)
+        self.report = {}
+
+    def error(self, kind: str, index: int, field: str, message: str) -> None:
+        self.errors[kind].setdefault(index, {}).setdefault(
+            field, []
+        ).append(message)
+
+    def unique_rows(
+        self,
+        kind: str,
+        key: str,
+        keys: Iterable[str]
+    ) -> dict[str, int]:
+        """
+        Map every key to the index of its row, reporting repeated keys.
+        """
+        indexes = {}
+        for index, value in enumerate(keys):
+            if value in indexes:
+                self.error(kind, index, key, "Listed more than once.")
+            indexes.setdefault(value, index)
+        return indexes
+
+    def run(self, dry_run: bool = False) -> dict:
+        """
+        Import everything in one transaction and return created and
+        existing counts per kind.
+        :raises CatalogueImportError: If any row references an unknown
+        name or repeats another row, in which case nothing is written.
+        """
+        with transaction.atomic():
+            genres = self.import_genres()
+            actors = self.import_actors()
+            halls = self.import_halls()
+            plays = self.import_plays(actors, genres)
+            self.import_performances(plays, halls)
+
+            if self.errors:
+                raise CatalogueImportError(dict(self.errors))
+            if dry_run:
+                transaction.set_rollback(True)
+            else:
+                # bulk operations bypass the signals that version the cache
+                transaction.on_commit(bump_catalogue_version)
+
+        return self.report
+
+    def count(self, kind: str, created: int, existing: int) -> None:
+        self.report[kind] = {"created": created, "existing": existing}
+
+    def import_genres(self) -> dict[str, int]:
+        rows = self.data["genres"]
+        names = self.unique_rows("genres", "name", (
+            row["name"] for row in rows
+        ))
+        referenced = {
+            name for play in self.data["plays"] for name in play["genres"]
+        }
+        existing = set(
+            Genre.objects.filter(name__in=names).values_list("name", flat=True)
+        )
+
+        Genre.objects.bulk_create(
+            (Genre(name=name) for name in names if name not in existing),
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+        self.count("genres", len(names) - len(existing), len(existing))
+        return dict(
+            Genre.objects.filter(
+                name__in=names.keys() | referenced
+            ).values_list("name", "id")
+        )
+
+    def actors_by_name(self, names: Iterable[str]) -> dict[str, int]:
+        actors = Actor.objects.annotate(
+            full_name=Concat("first_name", Value(" "), "last_name")
+        ).filter(full_name__in=names).order_by("-id")
+        # Ordered by descending id, so duplicates resolve to the oldest
+        return dict(actors.values_list("full_name", "id"))
+
+    def import_actors(self) -> dict[str, int]:
+        rows = self.data["actors"]
+        names = self.unique_rows("actors", "last_name", (
+            full_name(row["first_name"], row["last_name"]) for row in rows
+        ))
+        existing = self.actors_by_name(names)
+
+        Actor.objects.bulk_create(
+            (
+                Actor(
+                    first_name=rows[index]["first_name"],
+                    last_name=rows[index]["last_name"],
+                )
+                for name, index in names.items()
+                if name not in existing
+            ),
+            batch_size=self.batch_size,
+        )
+        self.count("actors", len(names) - len(existing), len(existing))
+        referenced = {
+            name for play in self.data["plays"] for name in play["actors"]
+        }
+        return self.actors_by_name(names.keys() | referenced)
+
+    def import_halls(self) -> dict[str, int]:
+        rows = self.data["theatre_halls"]
+        names = self.unique_rows("theatre_halls", "name", (
+            row["name"] for row in rows
+        ))
+        referenced = {row["theatre_hall"] for row in self.data["performances"]}
+        existing = TheatreHall.objects.filter(name__in=names).count()
+
+        TheatreHall.objects.bulk_create(
+            (TheatreHall(**rows[index]) for index in names.values()),
+            batch_size=self.batch_size,
+            update_conflicts=True,
+            unique_fields=["name"],
+            update_fields=["rows", "seats_in_row"],
+        )
+        self.count("theatre_halls", len(names) - existing, existing)
+        return dict(
+            TheatreHall.objects.filter(
+                name__in=names.keys() | referenced
+            ).values_list("name", "id")
+        )
+
+    def plays_by_title(self, titles: Iterable[str]) -> dict[str, Play]:
+        plays = Play.objects.filter(title__in=titles).order_by("-id")
+        return {play.title: play for play in plays.only("id", "title")}
+
+    def import_plays(
+        self,
+        actors: dict[str, int],
+        genres: dict[str, int]
+    ) -> dict[str, int]:
+        rows = self.data["plays"]
+        titles = self.unique_rows("plays", "title", (
+            row["title"] for row in rows
+        ))
+        existing = self.plays_by_title(titles)
+
+        described = []
+        for title, play in existing.items():
+            if "description" in rows[titles[title]]:
+                play.description = rows[titles[title]]["description"]
+                described.append(play)
+        Play.objects.bulk_update(
+            described, ["description"], batch_size=self.batch_size
+        )
+        Play.objects.bulk_create(
+            (
+                Play(title=title, description=rows[index].get("description"))
+                for title, index in titles.items()
+                if title not in existing
+            ),
+            batch_size=self.batch_size,
+        )
+        self.count("plays", len(titles) - len(existing), len(existing))
+
+        referenced = {row["play"] for row in self.data["performances"]}
+        plays = {
+            title: play.id
+            for title, play in self.plays_by_title(
+                titles.keys() | referenced
+            ).items()
+        }
+        self.import_play_relations(
+            Play.actors.through, "actor_id", "actors", plays, actors
+        )
+        self.import_play_relations(
+            Play.genres.through, "genre_id", "genres", plays, genres
+        )
+        return plays
+
+    def import_play_relations(
+        self,
+        through: type,
+        column: str,
+        field: str,
+        plays: dict[str, int],
+        targets: dict[str, int]
+    ) -> None:
+        """
+        Replace the actors or genres of the imported plays
+        with one delete and one bulk insert of through rows.
+        """
+        links = set()
+        for index, row in enumerate(self.data["plays"]):
+            for name in row[field]:
+                if name not in targets:
+                    self.error("plays", index, field, f"Unknown {name!r}.")
+                    continue
+                links.add((plays[row["title"]], targets[name]))
+
+        through.objects.filter(play_id__in={
+            plays[row["title"]] for row in self.data["plays"]
+        }).delete()
+        through.objects.bulk_create(
+            (
+                through(play_id=play_id, **{column: target_id})
+                for play_id, target_id in links
+            ),
+            batch_size=self.batch_size,
+        )
+
+    def import_performances(
+        self,
+        plays: dict[str, int],
+        halls: dict[str, int]
+    ) -> None:
+        rows = self.data["performances"]
+        schedule = set()
+        for index, row in enumerate(rows):
+            known = True
+            for field, names in (("play", plays), ("theatre_hall", halls)):
+                if row[field] not in names:
+                    known = False
+                    self.error(
+                        "performances", index, field,
+                        f"Unknown {row[field]!r}."
+                    )
+            if known:
+                schedule.add((
+                    plays[row["play"]],
+                    halls[row["theatre_hall"]],
+                    row["show_time"],
+                ))
+
+        existing = set(Performance.objects.filter(
+            play_id__in={play_id for play_id, _, _ in schedule}
+        ).values_list("play_id", "theatre_hall_id", "show_time"))
+        new_slots = list(schedule - existing)
+        performances = Performance.objects.bulk_create(
+            (
+                Performance(play_id=play_id, theatre_hall_id=hall_id)
+                for play_id, hall_id, _ in new_slots
+            ),
+            batch_size=self.batch_size,
+        )
+
+        # show_time is auto_now_add, so the schedule is written afterwards
+        for performance, (_, _, show_time) in zip(performances, new_slots):
+            performance.show_time = show_time
+        Performance.objects.bulk_update(
+            performances, ["show_time"], batch_size=self.batch_size
+        )
+        self.count(
+            "performances", len(new_slots), len(schedule) - len(new_slots)
+        )
@@ -0,0 +1,218 @@
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework.views import APIView
+
+from accounts.models import User
+from theatre.benchmarks import (
+    benchmark_asgi,
+    benchmark_endpoints,
+    benchmark_hashing,
+    benchmark_list_serializers,
+    benchmark_renderers,
+)
+from theatre.seeding import SEED_USER_PASSWORD, Seeder, SeedScale
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database and run a benchmark suite: "
+        "'routes' measures latency, query count and response size of "
+        "every theatre and accounts route with a cold and a warm response "
+        "cache, 'asgi' compares the throughput "
+        "of the sync views over WSGI with the async views over ASGI, "
+        "'renderers' measures JSON rendering of detail payloads, "
+        "'lists' compares the CPU time of the DRF and fast list "
+        "serializers, 'hashing' measures registration and login "
+        "throughput under concurrent load."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--scale",
+            type=float,
+            default=1.0,
+            help="Multiplier for the default dataset volumes.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--suite",
+            choices=("routes", "asgi", "renderers", "lists", "hashing"),
+            default="routes",
+        )
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=500,
+            help="Requests per route in the asgi and hashing suites.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=50,
+            help="Requests in flight at once in the asgi and hashing suites.",
+        )
+        parser.add_argument(
+            "--output",
+            default="benchmark_report.json",
+            help="Path of the JSON report.",
+        )
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help="Reuse the test database between runs.",
+        )
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        setup_test_environment(debug=False)
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, keepdb=options["keepdb"]
+        )
+        try:
+            report = self.run_benchmark(options)
+        finally:
+            connection.creation.destroy_test_db(
+                old_name, verbosity=0, keepdb=options["keepdb"]
+            )
+            teardown_test_environment()
+
+        with open(options["output"], "w") as report_file:
+            json.dump(report, report_file, indent=2, sort_keys=True)
+            report_file.write("\n")
+
+        getattr(self, f"print_{options['suite']}")(report[options["suite"]])
+        self.stdout.write(
+            self.style.SUCCESS(f"Report written to {options['output']}")
+        )
+
+    def run_benchmark(self, options: dict) -> dict:
+        if User.objects.exists():
+            dataset = {"reused": True}
+        else:
+            dataset = Seeder(
+                SeedScale().scaled(options["scale"]),
+                seed=options["seed"],
+                stdout=self.stdout,
+            ).run()
+        user = User.objects.filter(reservations__isnull=False).first()
+        # Responses cached by an earlier run describe other data
+        caches["default"].clear()
+
+        # Rate limits would turn later iterations into 429 responses
+        with mock.patch.object(APIView, "throttle_classes", []):
+            results = getattr(self, f"run_{options['suite']}")(user, options)
+
+        return {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "commit": self.get_commit(),
+            "python": platform.python_version(),
+            "database": connection.vendor,
+            "scale": options["scale"],
+            "seed": options["seed"],
+            "iterations": options["iterations"],
+            "dataset": dataset,
+            "suite": options["suite"],
+            options["suite"]: results,
+        }
+
+    def run_routes(self, user: User, options: dict) -> dict:
+        return benchmark_endpoints(
+            user, SEED_USER_PASSWORD, options["iterations"]
+        )
+
+    def print_routes(self, results: dict) -> None:
+        for name, route in results.items():
+            for cache_state in ("cold", "warm"):
+                result = route[cache_state]
+                self.stdout.write(
+                    f"{name:<40} {cache_state} {result['status']:>4} "
+                    f"p50 {result['p50_ms']:>9.2f}ms "
+                    f"p95 {result['p95_ms']:>9.2f}ms "
+                    f"{result['queries']:>4} queries "
+                    f"{result['bytes']:>8} bytes"
+                )
+
+    def run_asgi(self, user: User, options: dict) -> dict:
+        return benchmark_asgi(
+            user, options["requests"], options["concurrency"]
+        )
+
+    def print_asgi(self, results: dict) -> None:
+        for name, servers in results.items():
+            for server, result in servers.items():
+                self.stdout.write(
+                    f"{name:<24} {server:<5} "
+                    f"{result['requests_per_s']:>9.1f} req/s "
+                    f"p50 {result['p50_ms']:>9.2f}ms "
+                    f"p95 {result['p95_ms']:>9.2f}ms "
+                    f"{result['errors']:>4} errors"
+                )
+
+    def run_renderers(self, user: User, options: dict) -> dict:
+        return benchmark_renderers(options["iterations"])
+
+    def print_renderers(self, results: dict) -> None:
+        for name, renderers in results.items():
+            for renderer, result in renderers.items():
+                self.stdout.write(
+                    f"{name:<24} {renderer:<16} "
+                    f"{result['mb_per_s']:>9.1f} MB/s "
+                    f"{result['mean_ms']:>9.3f}ms "
+                    f"{result['bytes']:>9} bytes"
+                )
+
+    def run_lists(self, user: User, options: dict) -> dict:
+        return benchmark_list_serializers(user, options["iterations"])
+
+    def print_lists(self, results: dict) -> None:
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<24} {result['drf']['rows']:>4} rows "
+                f"drf {result['drf']['cpu_ms']:>9.3f}ms "
+                f"fast {result['fast']['cpu_ms']:>9.3f}ms "
+                f"x{result['speedup']:.2f}"
+            )
+
+    def run_hashing(self, user: User, options: dict) -> dict:
+        return benchmark_hashing(
+            user,
+            SEED_USER_PASSWORD,
+            options["requests"],
+            options["concurrency"],
+        )
+
+    def print_hashing(self, results: dict) -> None:
+        self.stdout.write(
+            f"{results['hasher']} on {results['workers']} workers, "
+            f"{results['queue']} queued"
+        )
+        for name in ("accounts:create", "accounts:token_obtain_pair"):
+            result = results[name]
+            self.stdout.write(
+                f"{name:<28} "
+                f"{result['requests_per_s']:>9.1f} req/s "
+                f"p50 {result['p50_ms']:>9.2f}ms "
+                f"p95 {result['p95_ms']:>9.2f}ms "
+                f"{result['errors']:>4} errors"
+            )
+
+    @staticmethod
+    def get_commit() -> str | None:
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "HEAD"],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
@@ -0,0 +1,72 @@
+from datetime import datetime
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.utils import timezone
+
+from theatre.export import EXPORT_CONTENT_TYPES, export_queryset, stream_export
+
+
+def aware_datetime(value: str) -> datetime:
+    moment = datetime.fromisoformat(value)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream the tickets of every reservation created in a period "
+        "as flat CSV or NDJSON rows."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--format",
+            dest="file_format",
+            choices=tuple(EXPORT_CONTENT_TYPES),
+            default="csv",
+        )
+        parser.add_argument(
+            "--start",
+            type=aware_datetime,
+            default=None,
+            help="Include reservations created at or after (ISO 8601).",
+        )
+        parser.add_argument(
+            "--end",
+            type=aware_datetime,
+            default=None,
+            help="Include reservations created before (ISO 8601).",
+        )
+        parser.add_argument(
+            "--output",
+            default=None,
+            help="File to write to, standard output by default.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        start, end = options["start"], options["end"]
+        if start is not None and end is not None and start >= end:
+            raise CommandError("--end must be later than --start.")
+
+        chunks = stream_export(
+            export_queryset(start, end),
+            options["file_format"],
+            chunk_size=options["chunk_size"],
+        )
+        if options["output"] is None:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+
+        with open(options["output"], "w", newline="") as file:
+            for chunk in chunks:
+                file.write(chunk)
+        self.stderr.write(
+            self.style.SUCCESS(f"Exported reservations to {options['output']}")
+        )
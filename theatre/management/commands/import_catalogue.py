@@ -0,0 +1,73 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+
+from theatre.importer import (
+    IMPORT_KINDS,
+    CatalogueImporter,
+    CatalogueImportError,
+    read_csv,
+)
+from theatre.serializers import CatalogueImportSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Upsert genres, actors, halls, plays and performances in one "
+        "transaction. A .json file holds a whole batch keyed by kind, "
+        "a .csv file holds the kind named by its file name "
+        "(e.g. plays.csv, with ';' between actor and genre names)."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("files", nargs="+", type=Path)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate and report without writing anything.",
+        )
+
+    def read(self, files: list[Path]) -> dict:
+        data = {kind: [] for kind in IMPORT_KINDS}
+        for file in files:
+            if file.suffix == ".json":
+                batch = json.loads(file.read_text(encoding="utf-8"))
+                for kind in IMPORT_KINDS:
+                    data[kind].extend(batch.get(kind, []))
+            elif file.suffix == ".csv" and file.stem in IMPORT_KINDS:
+                with file.open(encoding="utf-8-sig", newline="") as csv_file:
+                    data[file.stem].extend(read_csv(file.stem, csv_file))
+            else:
+                raise CommandError(
+                    f"Cannot import {file}: expected a .json file or a .csv "
+                    f"file named after one of {', '.join(IMPORT_KINDS)}."
+                )
+        return data
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        serializer = CatalogueImportSerializer(
+            data=self.read(options["files"])
+        )
+        if not serializer.is_valid():
+            raise CommandError(json.dumps(serializer.errors, indent=2))
+
+        try:
+            report = CatalogueImporter(
+                serializer.validated_data, batch_size=options["batch_size"]
+            ).run(dry_run=options["dry_run"])
+        except CatalogueImportError as error:
+            raise CommandError(json.dumps(error.errors, indent=2))
+
+        summary = ", ".join(
+            f"{counts['created']} new and "
+            f"{counts['existing']} existing {kind}"
+            for kind, counts in report.items()
+        )
+        prefix = "Validated" if options["dry_run"] else "Imported"
+        self.stdout.write(self.style.SUCCESS(f"{prefix} {summary}"))
@@ -0,0 +1,86 @@
+from dataclasses import fields, replace
+from datetime import datetime
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from theatre.seeding import Seeder, SeedScale
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic dataset of genres, actors, plays, halls, "
+        "performances and reservations with bulk inserts."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--scale",
+            type=float,
+            default=1.0,
+            help="Multiplier for the default volumes (1.0 = 100k tickets).",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Random seed, the same seed produces the same dataset.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--start-date",
+            type=datetime.fromisoformat,
+            default=None,
+            help="First day of the schedule (YYYY-MM-DD), today by default.",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=90,
+            help="Number of days the performances are spread over.",
+        )
+        for field in fields(SeedScale):
+            parser.add_argument(
+                f"--{field.name.replace('_', '-')}",
+                type=int,
+                default=None,
+                help=f"Override the scaled number of {field.name}.",
+            )
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        scale = SeedScale().scaled(options["scale"])
+        overrides = {
+            field.name: options[field.name]
+            for field in fields(SeedScale)
+            if options[field.name] is not None
+        }
+        start = options["start_date"]
+        if start is not None and timezone.is_naive(start):
+            start = timezone.make_aware(start)
+
+        seeder = Seeder(
+            replace(scale, **overrides),
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            start=start,
+            days=options["days"],
+            stdout=self.stdout,
+        )
+        try:
+            with transaction.atomic():
+                counts = seeder.run()
+        except IntegrityError as error:
+            raise CommandError(
+                f"Could not seed with --seed {options['seed']}, "
+                f"the database probably already holds its data: {error}"
+            )
+
+        summary = ", ".join(
+            f"{count} {name}" for name, count in counts.items()
+        )
+        self.stdout.write(self.style.SUCCESS(f"Seeded {summary}"))
@@ -1,19 +1,50 @@
 import time
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
 from django.db import connections
 from django.db.utils import OperationalError
 
 
 class Command(BaseCommand):
+    help = (
+        "Block until the database accepts connections, "
+        "e.g. before migrating and starting gunicorn."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--database", default="default")
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=60,
+            help="Seconds to wait before giving up.",
+        )
+        parser.add_argument("--interval", type=float, default=1)
+
     def handle(self, *args: tuple, **options: dict) -> None:
         self.stdout.write("Waiting for database...")
-        db_conn = None
-        while not db_conn:
+        db_conn = connections[options["database"]]
+        deadline = time.monotonic() + options["timeout"]
+        while True:
             try:
-                db_conn = connections["default"]
-                db_conn.cursor()
+                db_conn.ensure_connection()
+                break
             except OperationalError:
-                self.stdout.write("Database unavailable, waiting 1 second...")
-                time.sleep(1)
+                if time.monotonic() >= deadline:
+                    raise CommandError(
+                        f"Database unavailable after "
+                        f"{options['timeout']:g} seconds"
+                    )
+                self.stdout.write(
+                    f"Database unavailable, "
+                    f"waiting {options['interval']:g} second(s)..."
+                )
+                time.sleep(options["interval"])
+
+        # Do not hand an open connection over to the next command
+        db_conn.close()
         self.stdout.write(self.style.SUCCESS("Database available!"))
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.15 on 2026-10-18 18:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0002_seathold"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="performance",
+            index=models.Index(fields=["show_time"], name="show_time_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="performance",
+            index=models.Index(fields=["play", "show_time"], name="play_show_time_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="performance",
+            index=models.Index(
+                fields=["theatre_hall", "show_time"], name="hall_show_time_idx"
+            ),
+        ),
+    ]
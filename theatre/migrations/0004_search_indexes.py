@@ -0,0 +1,107 @@
+from django.db import OperationalError, migrations
+
+
+SEARCH_COLUMNS = {
+    "theatre_actor": ("first_name", "last_name"),
+    "theatre_play": ("title", "description"),
+}
+
+
+def postgresql_forwards(schema_editor, table, columns):
+    document = " || ' ' || ".join(
+        f"coalesce({column}, '')" for column in columns
+    )
+    schema_editor.execute(
+        f"ALTER TABLE {table} ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('simple', {document})) STORED"
+    )
+    schema_editor.execute(
+        f"CREATE INDEX {table}_search_idx ON {table} "
+        f"USING gin (search_vector)"
+    )
+
+
+def sqlite_forwards(schema_editor, table, columns):
+    fts_table = f"{table}_fts"
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    delete_old = (
+        f"INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) "
+        f"VALUES ('delete', old.id, {old_values});"
+    )
+    insert_new = (
+        f"INSERT INTO {fts_table}(rowid, {column_list}) "
+        f"VALUES (new.id, {new_values});"
+    )
+
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {fts_table} USING fts5("
+        f"{column_list}, content='{table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2')"
+    )
+    schema_editor.execute(
+        f"CREATE TRIGGER {fts_table}_ai AFTER INSERT ON {table} "
+        f"BEGIN {insert_new} END"
+    )
+    schema_editor.execute(
+        f"CREATE TRIGGER {fts_table}_ad AFTER DELETE ON {table} "
+        f"BEGIN {delete_old} END"
+    )
+    schema_editor.execute(
+        f"CREATE TRIGGER {fts_table}_au AFTER UPDATE ON {table} "
+        f"BEGIN {delete_old} {insert_new} END"
+    )
+    schema_editor.execute(
+        f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')"
+    )
+
+
+def sqlite_has_fts5(schema_editor):
+    try:
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE temp.theatre_fts5_probe USING fts5(probe)"
+        )
+    except OperationalError:
+        return False
+    schema_editor.execute("DROP TABLE temp.theatre_fts5_probe")
+    return True
+
+
+def create_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite" and not sqlite_has_fts5(schema_editor):
+        # SQLite built without FTS5, search falls back to LIKE
+        return
+    for table, columns in SEARCH_COLUMNS.items():
+        if vendor == "postgresql":
+            postgresql_forwards(schema_editor, table, columns)
+        elif vendor == "sqlite":
+            sqlite_forwards(schema_editor, table, columns)
+
+
+def drop_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for table in SEARCH_COLUMNS:
+        if vendor == "postgresql":
+            schema_editor.execute(
+                f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector"
+            )
+        elif vendor == "sqlite":
+            fts_table = f"{table}_fts"
+            for suffix in ("ai", "ad", "au"):
+                schema_editor.execute(
+                    f"DROP TRIGGER IF EXISTS {fts_table}_{suffix}"
+                )
+            schema_editor.execute(f"DROP TABLE IF EXISTS {fts_table}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theatre", "0003_performance_schedule_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -1,4 +1,5 @@
 from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
@@ -83,6 +84,18 @@ class Performance(models.Model):
     )
     show_time = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["show_time"], name="show_time_idx"),
+            models.Index(
+                fields=["play", "show_time"], name="play_show_time_idx"
+            ),
+            models.Index(
+                fields=["theatre_hall", "show_time"],
+                name="hall_show_time_idx"
+            ),
+        ]
+
     def __str__(self) -> str:
         return (
             f"Performance of {self.play.title} at {self.theatre_hall.name}"
@@ -128,5 +141,61 @@ class Ticket(models.Model):
     class Meta:
         unique_together = ["row", "seat", "performance"]
 
+    @staticmethod
+    def validate_seat(
+        row: int,
+        seat: int,
+        theatre_hall: TheatreHall,
+        error_to_raise: type[Exception]
+    ) -> None:
+        for value, limit, field_name in (
+            (row, theatre_hall.rows, "row"),
+            (seat, theatre_hall.seats_in_row, "seat"),
+        ):
+            if not (1 <= value <= limit):
+                raise error_to_raise({
+                    field_name: f"{field_name} number must be in range "
+                                f"[1, {limit}], not {value}"
+                })
+
+    def clean(self) -> None:
+        if None in (self.row, self.seat, self.performance_id):
+            return
+        Ticket.validate_seat(
+            self.row,
+            self.seat,
+            self.performance.theatre_hall,
+            ValidationError
+        )
+
     def __str__(self) -> str:
         return f"Row: {self.row}" f"Seat: {self.seat}"
+
+
+class SeatHold(models.Model):
+    row = models.PositiveIntegerField(
+        validators=[MinValueValidator(1), MaxValueValidator(100)]
+    )
+    seat = models.PositiveIntegerField(
+        validators=[MinValueValidator(1), MaxValueValidator(100)]
+    )
+    performance = models.ForeignKey(
+        Performance,
+        on_delete=models.CASCADE,
+        related_name="seat_holds"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="seat_holds"
+    )
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        unique_together = ["row", "seat", "performance"]
+
+    def __str__(self) -> str:
+        return (
+            f"Row: {self.row} Seat: {self.seat} "
+            f"held until {self.expires_at.strftime('%Y-%m-%d %H:%M:%S')}"
+        )
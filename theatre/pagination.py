@@ -1,7 +1,165 @@
-from rest_framework.pagination import PageNumberPagination
+from typing import Iterator
+
+from django.db.models import QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+class CustomCursorPagination(CursorPagination):
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def get_ordering(
+        self,
+        request: Request,
+        queryset: QuerySet,
+        view: APIView
+    ) -> tuple:
+        return (view.cursor_ordering,)
+
+
+class UncountedPage:
+    """
+    Page of results that only knows whether a next page exists,
+    used when the client opts out of the exact total count.
+    """
+
+    class Paginator:
+        num_pages = None
+
+        def __init__(self, count: int | None = None) -> None:
+            self.count = count
+
+    def __init__(
+        self,
+        object_list: list,
+        number: int,
+        has_next: bool,
+        count: int | None = None
+    ) -> None:
+        self.object_list = object_list
+        self.number = number
+        self._has_next = has_next
+        self.paginator = self.Paginator(count)
+
+    def __iter__(self) -> Iterator:
+        return iter(self.object_list)
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        return self.number > 1
+
+    def next_page_number(self) -> int:
+        return self.number + 1
+
+    def previous_page_number(self) -> int:
+        return self.number - 1
 
 
 class CustomPagination(PageNumberPagination):
+    """
+    Page number pagination with two opt-in modes:
+    ?count=false skips the COUNT(*) query, and ?pagination=cursor
+    switches views that define `cursor_ordering` to keyset pagination.
+    """
+
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 100
+    count_query_param = "count"
+    mode_query_param = "pagination"
+    cursor_paginator = None
+
+    def paginate_queryset(
+        self,
+        queryset: QuerySet,
+        request: Request,
+        view: APIView = None
+    ) -> list | None:
+        if (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            and getattr(view, "cursor_ordering", None)
+        ):
+            self.cursor_paginator = CustomCursorPagination()
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+
+        if request.query_params.get(self.count_query_param) == "false":
+            return self.paginate_queryset_without_count(queryset, request)
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_page_bounds(self, request: Request) -> tuple[int, int, int]:
+        """
+        Return the requested page number, page size and row offset.
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        try:
+            page_number = int(
+                request.query_params.get(self.page_query_param, 1)
+            )
+            if page_number < 1:
+                raise ValueError
+        except ValueError:
+            raise NotFound(self.invalid_page_message)
+
+        return page_number, page_size, (page_number - 1) * page_size
+
+    def set_page(
+        self,
+        results: list,
+        page_number: int,
+        page_size: int,
+        count: int | None = None
+    ) -> list:
+        if not results and page_number > 1:
+            raise NotFound(self.invalid_page_message)
+
+        self.page = UncountedPage(
+            results[:page_size], page_number, len(results) > page_size, count
+        )
+        return list(self.page)
+
+    def paginate_queryset_without_count(
+        self,
+        queryset: QuerySet,
+        request: Request
+    ) -> list:
+        page_number, page_size, offset = self.get_page_bounds(request)
+        results = list(queryset[offset:offset + page_size + 1])
+        return self.set_page(results, page_number, page_size)
+
+    def get_paginated_response(self, data: list) -> Response:
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class AsyncPagination(CustomPagination):
+    """
+    CustomPagination for the async views, evaluated with the async ORM.
+    Keyset pagination is not offered there.
+    """
+
+    async def apaginate_queryset(
+        self,
+        queryset: QuerySet,
+        request: Request
+    ) -> list:
+        page_number, page_size, offset = self.get_page_bounds(request)
+        count = None
+        if request.query_params.get(self.count_query_param) != "false":
+            count = await queryset.acount()
+
+        results = [
+            obj async for obj in queryset[offset:offset + page_size + 1]
+        ]
+        return self.set_page(results, page_number, page_size, count)
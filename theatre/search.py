@@ -0,0 +1,117 @@
+import re
+from functools import reduce
+from operator import and_, or_
+
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import BooleanField, FloatField, Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+from theatre.models import Actor, Play
+
+
+SEARCH_QUERY_PARAM = "q"
+MAX_SEARCH_TERMS = 8
+
+# Columns covered by the search vector (PostgreSQL) and the FTS5 index
+# (SQLite) created in migration 0004_search_indexes.
+SEARCH_FIELDS = {
+    Actor: ("first_name", "last_name"),
+    Play: ("title", "description"),
+}
+
+SEARCH_TERM_PATTERN = re.compile(r"\w+")
+
+_search_tables: dict[tuple, bool] = {}
+
+
+def get_search_terms(query: str) -> list[str]:
+    return SEARCH_TERM_PATTERN.findall(query.lower())[:MAX_SEARCH_TERMS]
+
+
+def has_search_table(connection: BaseDatabaseWrapper, table: str) -> bool:
+    """
+    Check once per database whether the FTS5 table exists,
+    since SQLite builds without FTS5 skip it in the migration.
+    """
+    key = (connection.alias, str(connection.settings_dict["NAME"]), table)
+    if key not in _search_tables:
+        _search_tables[key] = table in connection.introspection.table_names()
+    return _search_tables[key]
+
+
+def search(queryset: QuerySet, query: str) -> QuerySet:
+    """
+    Filter the queryset to rows matching every term of the query
+    as a word prefix and order them by relevance.
+    """
+    terms = get_search_terms(query)
+    if not terms:
+        return queryset.none()
+
+    connection = connections[queryset.db]
+    table = queryset.model._meta.db_table
+
+    if connection.vendor == "postgresql":
+        return search_vector(queryset, table, terms)
+
+    if connection.vendor == "sqlite" and has_search_table(
+        connection, f"{table}_fts"
+    ):
+        return search_fts5(queryset, table, terms)
+
+    fields = SEARCH_FIELDS[queryset.model]
+    return queryset.filter(reduce(and_, (
+        reduce(or_, (Q(**{f"{field}__icontains": term}) for field in fields))
+        for term in terms
+    )))
+
+
+def search_vector(
+    queryset: QuerySet,
+    table: str,
+    terms: list[str]
+) -> QuerySet:
+    """
+    Match against the stored, GIN-indexed search_vector column.
+    """
+    column = f'"{table}"."search_vector"'
+    tsquery = " & ".join(f"{term}:*" for term in terms)
+    return queryset.alias(
+        search_match=RawSQL(
+            f"{column} @@ to_tsquery('simple', %s)",
+            [tsquery],
+            output_field=BooleanField(),
+        ),
+        search_rank=RawSQL(
+            f"ts_rank({column}, to_tsquery('simple', %s))",
+            [tsquery],
+            output_field=FloatField(),
+        ),
+    ).filter(search_match=True).order_by("-search_rank", "pk")
+
+
+def search_fts5(
+    queryset: QuerySet,
+    table: str,
+    terms: list[str]
+) -> QuerySet:
+    """
+    Match against the external-content FTS5 table kept in sync by triggers.
+    bm25() is lower for better matches, so results are sorted ascending.
+    """
+    fts_table = f"{table}_fts"
+    match = " ".join(f'"{term}"*' for term in terms)
+    return queryset.alias(
+        search_rank=RawSQL(
+            f"SELECT bm25({fts_table}) FROM {fts_table} "
+            f"WHERE {fts_table} MATCH %s AND rowid = {table}.id",
+            [match],
+            output_field=FloatField(),
+        ),
+    ).filter(
+        pk__in=RawSQL(
+            f"SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH %s",
+            [match],
+        )
+    ).order_by("search_rank", "pk")
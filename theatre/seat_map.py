@@ -0,0 +1,71 @@
+import base64
+from typing import Iterable
+
+
+SEAT_MAP_ENCODING = "bitmap-base64"
+
+
+def encode_seat_map(
+    rows: int,
+    seats_in_row: int,
+    taken_seats: Iterable[tuple[int, int]]
+) -> tuple[str, int]:
+    """
+    Pack the taken seats of a hall into a row-major bitmap.
+
+    Seat (row, seat) maps to bit index (row - 1) * seats_in_row + (seat - 1),
+    most significant bit first, and a set bit means the seat is taken.
+    Seats outside the hall are ignored.
+    Return the base64 encoded bitmap and the number of taken seats.
+    """
+    bitmap = bytearray((rows * seats_in_row + 7) // 8)
+    taken = 0
+
+    for row, seat in taken_seats:
+        if not (1 <= row <= rows and 1 <= seat <= seats_in_row):
+            continue
+        index = (row - 1) * seats_in_row + (seat - 1)
+        mask = 0x80 >> (index % 8)
+        if not bitmap[index // 8] & mask:
+            bitmap[index // 8] |= mask
+            taken += 1
+
+    return base64.b64encode(bitmap).decode("ascii"), taken
+
+
+def build_seat_map(
+    performance_id: int,
+    rows: int,
+    seats_in_row: int,
+    taken_seats: Iterable[tuple[int, int]]
+) -> dict:
+    """
+    Return the seat map payload of PerformanceSeatMapSerializer.
+    """
+    seats, taken = encode_seat_map(rows, seats_in_row, taken_seats)
+    return {
+        "performance": performance_id,
+        "rows": rows,
+        "seats_in_row": seats_in_row,
+        "taken": taken,
+        "available": rows * seats_in_row - taken,
+        "encoding": SEAT_MAP_ENCODING,
+        "seats": seats,
+    }
+
+
+def decode_seat_map(
+    encoded: str,
+    rows: int,
+    seats_in_row: int
+) -> set[tuple[int, int]]:
+    """
+    Return the set of taken (row, seat) pairs of an encoded seat map.
+    """
+    bitmap = base64.b64decode(encoded)
+
+    return {
+        (index // seats_in_row + 1, index % seats_in_row + 1)
+        for index in range(rows * seats_in_row)
+        if bitmap[index // 8] & (0x80 >> (index % 8))
+    }
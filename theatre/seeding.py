@@ -0,0 +1,275 @@
+import random
+from dataclasses import dataclass, fields, replace
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Iterable, Iterator, TextIO
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import models, transaction
+from django.utils import timezone
+
+from theatre.cache import bump_catalogue_version
+from theatre.models import (
+    Actor,
+    Genre,
+    Performance,
+    Play,
+    Reservation,
+    TheatreHall,
+    Ticket,
+)
+
+
+SEED_USER_PASSWORD = "password"
+
+
+@dataclass(frozen=True)
+class SeedScale:
+    genres: int = 50
+    actors: int = 5000
+    plays: int = 2000
+    actors_per_play: int = 10
+    genres_per_play: int = 2
+    halls: int = 200
+    performances: int = 2000
+    users: int = 200
+    reservations: int = 20000
+    tickets_per_reservation: int = 5
+
+    def scaled(self, factor: float) -> "SeedScale":
+        """
+        Return a copy with every volume multiplied by the factor,
+        keeping the per-play and per-reservation ratios unchanged.
+        """
+        ratios = {
+            "actors_per_play",
+            "genres_per_play",
+            "tickets_per_reservation",
+        }
+        return replace(self, **{
+            field.name: max(1, round(getattr(self, field.name) * factor))
+            for field in fields(self)
+            if field.name not in ratios
+        })
+
+
+class Seeder:
+    """
+    Generate a synthetic theatre dataset with bulk inserts.
+    The same seed always produces the same dataset.
+    """
+
+    show_hours = (12, 15, 19)
+
+    def __init__(
+        self,
+        scale: SeedScale,
+        seed: int = 0,
+        batch_size: int = 5000,
+        start: datetime | None = None,
+        days: int = 90,
+        stdout: TextIO | None = None
+    ) -> None:
+        self.scale = scale
+        self.seed = seed
+        self.batch_size = batch_size
+        self.start = (start or timezone.now()).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        self.days = days
+        self.stdout = stdout
+        self.random = random.Random(seed)
+
+    def log(self, message: str) -> None:
+        if self.stdout is not None:
+            self.stdout.write(message)
+
+    def insert_batches(
+        self,
+        model: type[models.Model],
+        objects: Iterable[models.Model]
+    ) -> Iterator[list[models.Model]]:
+        """
+        Insert objects batch by batch without materialising
+        the whole iterable, yielding every inserted batch.
+        """
+        objects = iter(objects)
+        total = 0
+        while batch := list(islice(objects, self.batch_size)):
+            model.objects.bulk_create(batch)
+            total += len(batch)
+            yield batch
+        self.log(f"Created {total} {model._meta.verbose_name_plural}")
+
+    def bulk_create(
+        self,
+        model: type[models.Model],
+        objects: Iterable[models.Model]
+    ) -> list[models.Model]:
+        return [
+            obj
+            for batch in self.insert_batches(model, objects)
+            for obj in batch
+        ]
+
+    def bulk_insert(
+        self,
+        model: type[models.Model],
+        objects: Iterable[models.Model]
+    ) -> int:
+        """
+        Insert objects without keeping them in memory
+        and return how many rows were written.
+        """
+        return sum(
+            len(batch) for batch in self.insert_batches(model, objects)
+        )
+
+    def run(self) -> dict[str, int]:
+        genres = self.seed_genres()
+        actors = self.seed_actors()
+        plays = self.seed_plays(actors, genres)
+        halls = self.seed_halls()
+        performances = self.seed_performances(plays, halls)
+        users = self.seed_users()
+        tickets = self.seed_reservations(users, performances)
+        # bulk_create bypasses the signals that version the cache
+        transaction.on_commit(bump_catalogue_version)
+
+        return {
+            "genres": len(genres),
+            "actors": len(actors),
+            "plays": len(plays),
+            "theatre_halls": len(halls),
+            "performances": len(performances),
+            "users": len(users),
+            "tickets": tickets,
+        }
+
+    def seed_genres(self) -> list[Genre]:
+        return self.bulk_create(Genre, (
+            Genre(name=f"Genre {self.seed}-{index}")
+            for index in range(self.scale.genres)
+        ))
+
+    def seed_actors(self) -> list[Actor]:
+        return self.bulk_create(Actor, (
+            Actor(
+                first_name=f"First{self.random.randrange(10_000)}",
+                last_name=f"Last{index}",
+            )
+            for index in range(self.scale.actors)
+        ))
+
+    def seed_plays(
+        self,
+        actors: list[Actor],
+        genres: list[Genre]
+    ) -> list[Play]:
+        plays = self.bulk_create(Play, (
+            Play(
+                title=f"Play {index}",
+                description=f"Description of play {index}. " * 5,
+            )
+            for index in range(self.scale.plays)
+        ))
+
+        actors_per_play = min(self.scale.actors_per_play, len(actors))
+        genres_per_play = min(self.scale.genres_per_play, len(genres))
+        self.bulk_insert(Play.actors.through, (
+            Play.actors.through(play_id=play.id, actor_id=actor.id)
+            for play in plays
+            for actor in self.random.sample(actors, actors_per_play)
+        ))
+        self.bulk_insert(Play.genres.through, (
+            Play.genres.through(play_id=play.id, genre_id=genre.id)
+            for play in plays
+            for genre in self.random.sample(genres, genres_per_play)
+        ))
+        return plays
+
+    def seed_halls(self) -> list[TheatreHall]:
+        return self.bulk_create(TheatreHall, (
+            TheatreHall(
+                name=f"Hall {self.seed}-{index}",
+                rows=self.random.randint(10, 30),
+                seats_in_row=self.random.randint(10, 40),
+            )
+            for index in range(self.scale.halls)
+        ))
+
+    def seed_performances(
+        self,
+        plays: list[Play],
+        halls: list[TheatreHall]
+    ) -> list[Performance]:
+        performances = self.bulk_create(Performance, (
+            Performance(
+                play=self.random.choice(plays),
+                theatre_hall=self.random.choice(halls),
+            )
+            for _ in range(self.scale.performances)
+        ))
+
+        # show_time is auto_now_add, so the schedule is written afterwards
+        for performance in performances:
+            performance.show_time = self.start + timedelta(
+                days=self.random.randrange(self.days),
+                hours=self.random.choice(self.show_hours),
+            )
+        Performance.objects.bulk_update(
+            performances, ["show_time"], batch_size=self.batch_size
+        )
+        return performances
+
+    def seed_users(self) -> list[models.Model]:
+        user_model = get_user_model()
+        password = make_password(SEED_USER_PASSWORD)
+        return self.bulk_create(user_model, (
+            user_model(
+                email=f"user{self.seed}-{index}@example.com",
+                password=password,
+            )
+            for index in range(self.scale.users)
+        ))
+
+    def seed_reservations(
+        self,
+        users: list[models.Model],
+        performances: list[Performance]
+    ) -> int:
+        """
+        Create reservations and tickets, handing out the seats of each
+        performance in order so no two tickets ever collide.
+        """
+        reservations = self.bulk_create(Reservation, (
+            Reservation(user=self.random.choice(users))
+            for _ in range(self.scale.reservations)
+        ))
+        sold_seats = dict.fromkeys(
+            (performance.id for performance in performances), 0
+        )
+        open_performances = list(performances)
+
+        def generate_tickets() -> Iterable[Ticket]:
+            for reservation in reservations:
+                if not open_performances:
+                    return
+                performance = self.random.choice(open_performances)
+                hall = performance.theatre_hall
+                capacity = hall.rows * hall.seats_in_row
+                for _ in range(self.scale.tickets_per_reservation):
+                    sold = sold_seats[performance.id]
+                    if sold == capacity:
+                        open_performances.remove(performance)
+                        break
+                    sold_seats[performance.id] = sold + 1
+                    yield Ticket(
+                        row=sold // hall.seats_in_row + 1,
+                        seat=sold % hall.seats_in_row + 1,
+                        performance=performance,
+                        reservation=reservation,
+                    )
+
+        return self.bulk_insert(Ticket, generate_tickets())
@@ -1,13 +1,24 @@
-from django.db import transaction
+from django.db import IntegrityError, transaction
+from django.db.models import Value
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
 from accounts.serializers import UserSerializer
+from theatre.export import EXPORT_CONTENT_TYPES
+from theatre.holds import (
+    SeatsUnavailable,
+    acquire_holds,
+    active_holds,
+    lock_performances,
+    release_holds,
+)
 from theatre.models import (
     Actor,
     Genre,
     Performance,
     Play,
     Reservation,
+    SeatHold,
     TheatreHall,
     Ticket,
 )
@@ -101,6 +112,25 @@ class PerformanceListSerializer(PerformanceSerializer):
     theatre_hall_name = serializers.SlugRelatedField(
         slug_field="name", read_only=True, source="theatre_hall"
     )
+    capacity = serializers.IntegerField(read_only=True)
+    tickets_available = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Performance
+        fields = (
+            "id",
+            "play_title",
+            "theatre_hall_name",
+            "show_time",
+            "capacity",
+            "tickets_available",
+        )
+        read_only_fields = fields
+
+
+class TicketPerformanceSerializer(PerformanceListSerializer):
+    capacity = None
+    tickets_available = None
 
     class Meta:
         model = Performance
@@ -118,14 +148,44 @@ class PerformanceDetailSerializer(PerformanceSerializer):
         read_only_fields = fields
 
 
+class PerformanceSeatMapSerializer(serializers.Serializer):
+    performance = serializers.IntegerField(read_only=True)
+    rows = serializers.IntegerField(read_only=True)
+    seats_in_row = serializers.IntegerField(read_only=True)
+    taken = serializers.IntegerField(read_only=True)
+    available = serializers.IntegerField(read_only=True)
+    encoding = serializers.CharField(read_only=True)
+    seats = serializers.CharField(read_only=True)
+
+
 class TicketSerializer(serializers.ModelSerializer):
+    performance = serializers.PrimaryKeyRelatedField(
+        queryset=Performance.objects.select_related("theatre_hall")
+    )
+
     class Meta:
         model = Ticket
         fields = ("id", "row", "seat", "performance", "reservation")
 
+    def validate(self, attrs: dict) -> dict:
+        data = super().validate(attrs)
+        row = attrs.get("row", getattr(self.instance, "row", None))
+        seat = attrs.get("seat", getattr(self.instance, "seat", None))
+        performance = attrs.get(
+            "performance", getattr(self.instance, "performance", None)
+        )
+        if None not in (row, seat, performance):
+            Ticket.validate_seat(
+                row,
+                seat,
+                performance.theatre_hall,
+                serializers.ValidationError
+            )
+        return data
+
 
 class TicketListSerializer(TicketSerializer):
-    performance = PerformanceListSerializer(read_only=True)
+    performance = TicketPerformanceSerializer(read_only=True)
 
     class Meta:
         model = Ticket
@@ -142,20 +202,156 @@ class TicketDetailSerializer(TicketSerializer):
         read_only_fields = fields
 
 
+class PerformanceLookupField(serializers.PrimaryKeyRelatedField):
+    """
+    Resolve performances from the map preloaded by
+    ReservationTicketListSerializer instead of querying per ticket.
+    """
+
+    def to_internal_value(self, data: object) -> Performance:
+        performances = self.context.get("performances")
+        if performances is None:
+            return super().to_internal_value(data)
+        try:
+            return performances[int(data)]
+        except KeyError:
+            self.fail("does_not_exist", pk_value=data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+
+
+class ReservationTicketListSerializer(serializers.ListSerializer):
+    def to_internal_value(self, data: list) -> list:
+        if isinstance(data, list):
+            performance_ids = set()
+            for ticket in data:
+                try:
+                    performance_ids.add(int(ticket["performance"]))
+                except (KeyError, TypeError, ValueError):
+                    continue
+            self.context["performances"] = (
+                Performance.objects.select_related("theatre_hall")
+                .in_bulk(performance_ids)
+            )
+        return super().to_internal_value(data)
+
+
+class ReservationTicketSerializer(TicketSerializer):
+    performance = PerformanceLookupField(queryset=Performance.objects.all())
+
+    class Meta:
+        model = Ticket
+        fields = ("id", "row", "seat", "performance")
+        list_serializer_class = ReservationTicketListSerializer
+        # Seat uniqueness is checked for all tickets at once
+        # by ReservationSerializer.validate_tickets
+        validators = []
+
+
 class ReservationSerializer(serializers.ModelSerializer):
-    tickets = TicketSerializer(many=True, read_only=False, allow_empty=False)
+    tickets = ReservationTicketSerializer(many=True, allow_empty=False)
 
     class Meta:
         model = Reservation
         fields = ("id", "created_at", "tickets")
 
+    @staticmethod
+    def get_seat_conflicts(
+        tickets_data: list[dict],
+        user_id: int | None
+    ) -> list[dict]:
+        """
+        Return an error dict per ticket for seats that are listed twice
+        in the payload, already sold or held by another user,
+        using a single query.
+        """
+        seats_lookup = {
+            "performance__in": {
+                ticket["performance"] for ticket in tickets_data
+            },
+            "row__in": {ticket["row"] for ticket in tickets_data},
+            "seat__in": {ticket["seat"] for ticket in tickets_data},
+        }
+        sold_seats = Ticket.objects.filter(**seats_lookup).annotate(
+            held=Value(False)
+        ).values_list("performance_id", "row", "seat", "held")
+        held_seats = active_holds().filter(**seats_lookup).exclude(
+            user_id=user_id
+        ).annotate(
+            held=Value(True)
+        ).values_list("performance_id", "row", "seat", "held")
+        unavailable_seats = {
+            (performance_id, row, seat): held
+            for performance_id, row, seat, held in sold_seats.union(
+                held_seats, all=True
+            )
+        }
+        requested_seats = set()
+        errors = []
+
+        for ticket in tickets_data:
+            seat_key = (
+                ticket["performance"].id, ticket["row"], ticket["seat"]
+            )
+            if seat_key in unavailable_seats:
+                state = "held" if unavailable_seats[seat_key] else "taken"
+                errors.append({"seat": [
+                    f"Seat {ticket['seat']} in row {ticket['row']} "
+                    f"is already {state}."
+                ]})
+            elif seat_key in requested_seats:
+                errors.append({"seat": [
+                    f"Seat {ticket['seat']} in row {ticket['row']} "
+                    f"is listed more than once."
+                ]})
+            else:
+                errors.append({})
+            requested_seats.add(seat_key)
+
+        return errors
+
+    def validate_tickets(self, tickets_data: list[dict]) -> list[dict]:
+        user = getattr(self.context.get("request"), "user", None)
+        errors = self.get_seat_conflicts(
+            tickets_data, getattr(user, "id", None)
+        )
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return tickets_data
+
     def create(self, validated_data: dict) -> Reservation:
-        with transaction.atomic():
-            tickets_data = validated_data.pop("tickets")
-            reservation = Reservation.objects.create(**validated_data)
-            for ticket_data in tickets_data:
-                Ticket.objects.create(reservation=reservation, **ticket_data)
-            return reservation
+        tickets_data = validated_data.pop("tickets")
+        user_id = validated_data["user_id"]
+        try:
+            with transaction.atomic():
+                lock_performances(
+                    {ticket["performance"].id for ticket in tickets_data}
+                )
+                errors = self.get_seat_conflicts(tickets_data, user_id)
+                if any(errors):
+                    raise serializers.ValidationError({"tickets": errors})
+
+                reservation = Reservation.objects.create(**validated_data)
+                Ticket.objects.bulk_create(
+                    Ticket(reservation=reservation, **ticket_data)
+                    for ticket_data in tickets_data
+                )
+                release_holds(user_id, (
+                    (ticket["performance"].id, ticket["row"], ticket["seat"])
+                    for ticket in tickets_data
+                ))
+        except IntegrityError:
+            # Another reservation took a seat after validation passed
+            errors = self.get_seat_conflicts(tickets_data, user_id)
+            if any(errors):
+                raise serializers.ValidationError({"tickets": errors})
+            # Its rows are not visible to this transaction yet
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    "One of the seats was just taken, please try again."
+                ]
+            })
+        return reservation
 
 
 class ReservationListSerializer(ReservationSerializer):
@@ -180,3 +376,125 @@ class ReservationDetailSerializer(ReservationSerializer):
         model = Reservation
         fields = ("id", "created_at", "user", "tickets")
         read_only_fields = fields
+
+
+class ReservationExportSerializer(serializers.Serializer):
+    file_format = serializers.ChoiceField(
+        choices=tuple(EXPORT_CONTENT_TYPES), default="csv"
+    )
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs: dict) -> dict:
+        data = super().validate(attrs)
+        if "start" in attrs and "end" in attrs and (
+            attrs["start"] >= attrs["end"]
+        ):
+            raise serializers.ValidationError(
+                {"end": ["End must be later than start."]}
+            )
+        return data
+
+
+class GenreImportSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=63)
+
+
+class ActorImportSerializer(serializers.Serializer):
+    first_name = serializers.CharField(max_length=63)
+    last_name = serializers.CharField(max_length=63)
+
+
+class TheatreHallImportSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=63)
+    rows = serializers.IntegerField(min_value=1, max_value=100)
+    seats_in_row = serializers.IntegerField(min_value=1, max_value=100)
+
+
+class PlayImportSerializer(serializers.Serializer):
+    title = serializers.CharField(max_length=63)
+    description = serializers.CharField(
+        required=False, allow_blank=True, allow_null=True
+    )
+    actors = serializers.ListField(
+        child=serializers.CharField(), required=False, default=list
+    )
+    genres = serializers.ListField(
+        child=serializers.CharField(max_length=63),
+        required=False,
+        default=list,
+    )
+
+
+class PerformanceImportSerializer(serializers.Serializer):
+    play = serializers.CharField(max_length=63)
+    theatre_hall = serializers.CharField(max_length=63)
+    show_time = serializers.DateTimeField()
+
+
+class CatalogueImportSerializer(serializers.Serializer):
+    """
+    Plain (non-model) serializers, so validating a batch
+    never runs per-row uniqueness queries.
+    """
+
+    genres = GenreImportSerializer(many=True, required=False)
+    actors = ActorImportSerializer(many=True, required=False)
+    theatre_halls = TheatreHallImportSerializer(many=True, required=False)
+    plays = PlayImportSerializer(many=True, required=False)
+    performances = PerformanceImportSerializer(many=True, required=False)
+
+
+class ImportCountsSerializer(serializers.Serializer):
+    created = serializers.IntegerField()
+    existing = serializers.IntegerField()
+
+
+class CatalogueImportReportSerializer(serializers.Serializer):
+    """
+    Rows created and found existing per kind, as CatalogueImporter
+    reports them. Only describes the response in the API schema.
+    """
+
+    genres = ImportCountsSerializer()
+    actors = ImportCountsSerializer()
+    theatre_halls = ImportCountsSerializer()
+    plays = ImportCountsSerializer()
+    performances = ImportCountsSerializer()
+
+
+class SeatHoldSerializer(serializers.ModelSerializer):
+    performance = serializers.PrimaryKeyRelatedField(
+        queryset=Performance.objects.select_related("theatre_hall")
+    )
+
+    class Meta:
+        model = SeatHold
+        fields = ("id", "row", "seat", "performance", "expires_at")
+        read_only_fields = ("expires_at",)
+        # Conflicts are resolved by acquire_holds under a performance lock
+        validators = []
+
+    def validate(self, attrs: dict) -> dict:
+        data = super().validate(attrs)
+        Ticket.validate_seat(
+            attrs["row"],
+            attrs["seat"],
+            attrs["performance"].theatre_hall,
+            serializers.ValidationError
+        )
+        return data
+
+    def create(self, validated_data: dict) -> SeatHold:
+        row, seat = validated_data["row"], validated_data["seat"]
+        try:
+            [hold] = acquire_holds(
+                validated_data["user_id"],
+                validated_data["performance"],
+                [(row, seat)]
+            )
+        except SeatsUnavailable:
+            raise serializers.ValidationError({
+                "seat": [f"Seat {seat} in row {row} is not available."]
+            })
+        return hold
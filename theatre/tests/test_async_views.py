@@ -0,0 +1,160 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from theatre.models import (
+    Actor,
+    Genre,
+    Performance,
+    Play,
+    Reservation,
+    TheatreHall,
+    Ticket,
+)
+
+
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass"
+        )
+        token = RefreshToken.for_user(self.user).access_token
+        self.headers = {"authorization": f"Bearer {token}"}
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        hall = TheatreHall.objects.create(
+            name="Main", rows=5, seats_in_row=6
+        )
+        for title in ("Hamlet", "Macbeth", "Othello"):
+            play = Play.objects.create(title=title, description="Tragedy")
+            play.actors.add(
+                Actor.objects.create(first_name="Ian", last_name=title)
+            )
+            play.genres.add(Genre.objects.create(name=f"Drama {title}"))
+            Performance.objects.create(play=play, theatre_hall=hall)
+        self.performance = Performance.objects.first()
+        Ticket.objects.create(
+            row=2,
+            seat=3,
+            performance=self.performance,
+            reservation=Reservation.objects.create(user=self.user),
+        )
+
+    async def get(self, url: str, data: dict | None = None):
+        return await self.async_client.get(url, data, headers=self.headers)
+
+    async def assert_same_response(self, async_url: str, sync_url: str):
+        res = await self.get(async_url, {"page_size": 2})
+        expected = await sync_to_async(self.client.get)(
+            sync_url, {"page_size": 2}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        data, expected_data = res.json(), expected.json()
+        if "next" in data:
+            # Page links point at the route that served the page
+            self.assertEqual(
+                data.pop("next").replace("/async/", "/"),
+                expected_data.pop("next"),
+            )
+        self.assertEqual(data, expected_data)
+
+    async def test_performance_list(self):
+        await self.assert_same_response(
+            reverse("theatre:async-performance-list"),
+            reverse("theatre:performance-list"),
+        )
+
+    async def test_performance_detail(self):
+        await self.assert_same_response(
+            reverse(
+                "theatre:async-performance-detail",
+                args=[self.performance.id],
+            ),
+            reverse("theatre:performance-detail", args=[self.performance.id]),
+        )
+
+    async def test_performance_seats(self):
+        await self.assert_same_response(
+            reverse(
+                "theatre:async-performance-seats",
+                args=[self.performance.id],
+            ),
+            reverse("theatre:performance-seats", args=[self.performance.id]),
+        )
+
+    async def test_play_list(self):
+        await self.assert_same_response(
+            reverse("theatre:async-play-list"),
+            reverse("theatre:play-list"),
+        )
+
+    async def test_play_list_search(self):
+        res = await self.get(reverse("theatre:async-play-list"), {"q": "mac"})
+
+        self.assertEqual(
+            [play["title"] for play in res.json()["results"]], ["Macbeth"]
+        )
+
+    async def test_invalid_filter(self):
+        res = await self.get(
+            reverse("theatre:async-performance-list"), {"play": "unknown"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_missing_performance(self):
+        res = await self.get(
+            reverse("theatre:async-performance-detail", args=[0])
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_auth_required(self):
+        res = await self.async_client.get(
+            reverse("theatre:async-performance-list")
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("Bearer", res["WWW-Authenticate"])
+
+    async def test_invalid_token(self):
+        res = await self.async_client.get(
+            reverse("theatre:async-performance-list"),
+            headers={"authorization": "Bearer invalid"},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_inactive_user(self):
+        self.user.is_active = False
+        await self.user.asave()
+
+        res = await self.get(reverse("theatre:async-performance-list"))
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_deleted_user(self):
+        await Reservation.objects.filter(user=self.user).adelete()
+        await self.user.adelete()
+
+        res = await self.get(reverse("theatre:async-performance-list"))
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_read_only(self):
+        res = await self.async_client.post(
+            reverse("theatre:async-play-list"),
+            {"title": "New"},
+            headers=self.headers,
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
@@ -0,0 +1,231 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from drf_spectacular.generators import SchemaGenerator
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.cache import get_catalogue_version
+from theatre.models import Actor, Genre, Performance, Play, TheatreHall
+
+
+IMPORT_URL = reverse("theatre:catalogue-import")
+
+
+def season(plays: int = 2) -> dict:
+    return {
+        "genres": [{"name": "Drama"}, {"name": "Comedy"}],
+        "actors": [
+            {"first_name": "Judi", "last_name": "Dench"},
+            {"first_name": "Ian", "last_name": "McKellen"},
+        ],
+        "theatre_halls": [{"name": "Main", "rows": 10, "seats_in_row": 12}],
+        "plays": [
+            {
+                "title": f"Play {index}",
+                "description": "A play",
+                "actors": ["Judi Dench", "Ian McKellen"],
+                "genres": ["Drama"],
+            }
+            for index in range(plays)
+        ],
+        "performances": [
+            {
+                "play": f"Play {index}",
+                "theatre_hall": "Main",
+                "show_time": "2030-01-01T19:00:00Z",
+            }
+            for index in range(plays)
+        ],
+    }
+
+
+class CatalogueImportApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = get_user_model().objects.create_superuser(
+            email="admin@example.com",
+            password="adminpass",
+        )
+        self.client.force_authenticate(self.admin_user)
+
+    def test_import_season(self):
+        res = self.client.post(IMPORT_URL, season(), format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data["plays"], {"created": 2, "existing": 0})
+        play = Play.objects.get(title="Play 0")
+        self.assertEqual(
+            {actor.full_name for actor in play.actors.all()},
+            {"Judi Dench", "Ian McKellen"},
+        )
+        self.assertEqual(
+            [genre.name for genre in play.genres.all()], ["Drama"]
+        )
+        performance = Performance.objects.get(play=play)
+        self.assertEqual(performance.theatre_hall.name, "Main")
+        self.assertEqual(
+            performance.show_time.isoformat(), "2030-01-01T19:00:00+00:00"
+        )
+
+    def test_reimport_updates_in_place(self):
+        self.client.post(IMPORT_URL, season(), format="json")
+        batch = season()
+        batch["theatre_halls"][0]["rows"] = 20
+        batch["plays"][0]["actors"] = ["Judi Dench"]
+
+        res = self.client.post(IMPORT_URL, batch, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            res.data["performances"], {"created": 0, "existing": 2}
+        )
+        self.assertEqual(Genre.objects.count(), 2)
+        self.assertEqual(Actor.objects.count(), 2)
+        self.assertEqual(Play.objects.count(), 2)
+        self.assertEqual(Performance.objects.count(), 2)
+        self.assertEqual(TheatreHall.objects.get(name="Main").rows, 20)
+        self.assertEqual(
+            Play.objects.get(title="Play 0").actors.count(), 1
+        )
+
+    def test_import_reports_unknown_references(self):
+        batch = season()
+        batch["plays"][1]["genres"] = ["Opera"]
+        batch["performances"][0]["theatre_hall"] = "Studio"
+
+        res = self.client.post(IMPORT_URL, batch, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("genres", res.data["plays"][1])
+        self.assertIn("theatre_hall", res.data["performances"][0])
+        self.assertFalse(Play.objects.exists())
+        self.assertFalse(Genre.objects.exists())
+
+    def test_import_dry_run_writes_nothing(self):
+        res = self.client.post(
+            f"{IMPORT_URL}?dry_run=true", season(), format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["plays"], {"created": 2, "existing": 0})
+        self.assertFalse(Play.objects.exists())
+
+    def test_import_csv_files(self):
+        res = self.client.post(IMPORT_URL, {
+            "genres": SimpleUploadedFile(
+                "genres.csv", b"name\nDrama\nComedy\n"
+            ),
+            "actors": SimpleUploadedFile(
+                "actors.csv", b"first_name,last_name\nJudi,Dench\n"
+            ),
+            "plays": SimpleUploadedFile(
+                "plays.csv",
+                b"title,description,actors,genres\n"
+                b"Hamlet,Prince,Judi Dench,Drama;Comedy\n",
+            ),
+        })
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            Play.objects.get(title="Hamlet").genres.count(), 2
+        )
+
+    def test_import_rejects_unknown_csv_kinds(self):
+        res = self.client.post(IMPORT_URL, {
+            "genres": SimpleUploadedFile("genres.csv", b"name\nDrama\n"),
+            "venues": SimpleUploadedFile("venues.csv", b"name\nGlobe\n"),
+        })
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(list(res.data), ["venues"])
+        self.assertFalse(Genre.objects.exists())
+
+    def test_import_rejects_fields_sent_with_files(self):
+        res = self.client.post(IMPORT_URL, {
+            "genres": SimpleUploadedFile("genres.csv", b"name\nDrama\n"),
+            "plays": "Hamlet",
+        })
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(list(res.data), ["plays"])
+        self.assertFalse(Genre.objects.exists())
+
+    def test_import_query_count_is_constant(self):
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(IMPORT_URL, season(plays=2), format="json")
+        for model in (Play, Actor, Genre, TheatreHall):
+            model.objects.all().delete()
+
+        with CaptureQueriesContext(connection) as large:
+            self.client.post(IMPORT_URL, season(plays=50), format="json")
+
+        self.assertEqual(Play.objects.count(), 50)
+        self.assertEqual(len(large), len(small))
+
+    def test_import_invalidates_catalogue_cache(self):
+        version = get_catalogue_version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(IMPORT_URL, season(), format="json")
+
+        self.assertNotEqual(get_catalogue_version(), version)
+
+    def test_import_forbidden_for_customers(self):
+        self.client.force_authenticate(
+            get_user_model().objects.create_user("user@example.com", "pass")
+        )
+
+        res = self.client.post(IMPORT_URL, season(), format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_import_is_described_in_the_schema(self):
+        schema = SchemaGenerator().get_schema(request=None, public=True)
+
+        operation = schema["paths"][IMPORT_URL]["post"]
+        self.assertEqual(
+            set(operation["requestBody"]["content"]),
+            {"application/json", "multipart/form-data"},
+        )
+        self.assertEqual(
+            operation["responses"]["201"]["content"]["application/json"],
+            {"schema": {"$ref": "#/components/schemas/CatalogueImportReport"}},
+        )
+
+
+class ImportCatalogueCommandTests(TestCase):
+    def test_import_json_and_csv_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            batch = Path(directory, "season.json")
+            batch.write_text(json.dumps(season()))
+            genres = Path(directory, "genres.csv")
+            genres.write_text("name\nMusical\n")
+
+            call_command(
+                "import_catalogue", str(batch), str(genres), stdout=StringIO()
+            )
+
+        self.assertEqual(Play.objects.count(), 2)
+        self.assertTrue(Genre.objects.filter(name="Musical").exists())
+
+    def test_import_reports_errors(self):
+        batch = season()
+        batch["plays"][0]["actors"] = ["Nobody"]
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, "season.json")
+            path.write_text(json.dumps(batch))
+
+            with self.assertRaisesMessage(CommandError, "Nobody"):
+                call_command("import_catalogue", str(path), stdout=StringIO())
+
+        self.assertFalse(Play.objects.exists())
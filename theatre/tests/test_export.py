@@ -0,0 +1,141 @@
+import csv
+import json
+from datetime import datetime, timezone
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.models import Performance, Play, Reservation, TheatreHall, Ticket
+
+
+EXPORT_URL = reverse("theatre:reservation-export")
+
+
+class ReservationExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = get_user_model().objects.create_superuser(
+            email="admin@example.com",
+            password="adminpass",
+        )
+        self.client.force_authenticate(self.admin_user)
+
+        self.customer = get_user_model().objects.create_user(
+            "customer@example.com", "customerpass"
+        )
+        performance = Performance.objects.create(
+            play=Play.objects.create(title="Hamlet"),
+            theatre_hall=TheatreHall.objects.create(
+                name="Main", rows=10, seats_in_row=10
+            ),
+        )
+        self.old_reservation = self.reserve(
+            performance, [(1, 1)], datetime(2030, 1, 1, tzinfo=timezone.utc)
+        )
+        self.new_reservation = self.reserve(
+            performance,
+            [(2, 1), (2, 2)],
+            datetime(2030, 2, 1, tzinfo=timezone.utc),
+        )
+
+    def reserve(
+        self,
+        performance: Performance,
+        seats: list[tuple[int, int]],
+        created_at: datetime
+    ) -> Reservation:
+        reservation = Reservation.objects.create(user=self.customer)
+        # created_at is auto_now_add, so the date is set afterwards
+        Reservation.objects.filter(pk=reservation.pk).update(
+            created_at=created_at
+        )
+        Ticket.objects.bulk_create(
+            Ticket(
+                row=row,
+                seat=seat,
+                performance=performance,
+                reservation=reservation,
+            )
+            for row, seat in seats
+        )
+        return reservation
+
+    def test_export_csv(self):
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], "text/csv")
+        self.assertIn("attachment", res["Content-Disposition"])
+        rows = list(csv.DictReader(
+            StringIO(b"".join(res.streaming_content).decode())
+        ))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]["user_email"], "customer@example.com")
+        self.assertEqual(rows[0]["play"], "Hamlet")
+        self.assertEqual(rows[0]["theatre_hall"], "Main")
+        self.assertEqual(
+            [(row["row"], row["seat"]) for row in rows],
+            [("1", "1"), ("2", "1"), ("2", "2")],
+        )
+
+    def test_export_ndjson_for_period(self):
+        res = self.client.get(EXPORT_URL, {
+            "file_format": "ndjson",
+            "start": "2030-01-15",
+            "end": "2030-03-01",
+        })
+
+        self.assertEqual(res["Content-Type"], "application/x-ndjson")
+        rows = [
+            json.loads(line)
+            for line in b"".join(res.streaming_content).splitlines()
+        ]
+        self.assertEqual(
+            {row["reservation_id"] for row in rows},
+            {self.new_reservation.id},
+        )
+        self.assertEqual(len(rows), 2)
+
+    def test_export_invalid_period(self):
+        res = self.client.get(
+            EXPORT_URL, {"start": "2030-02-01", "end": "2030-01-01"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_forbidden_for_customers(self):
+        self.client.force_authenticate(self.customer)
+
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_command(self):
+        out = StringIO()
+
+        call_command(
+            "export_reservations",
+            "--format", "ndjson",
+            "--end", "2030-01-15",
+            stdout=out,
+        )
+
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(
+            [row["reservation_id"] for row in rows],
+            [self.old_reservation.id],
+        )
+
+    def test_export_command_invalid_period(self):
+        with self.assertRaises(CommandError):
+            call_command(
+                "export_reservations",
+                "--start", "2030-02-01",
+                "--end", "2030-01-01",
+                stdout=StringIO(),
+            )
@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.models import (
+    Actor,
+    Genre,
+    Performance,
+    Play,
+    Reservation,
+    TheatreHall,
+    Ticket,
+)
+
+
+PERFORMANCE_URL = reverse("theatre:performance-list")
+PLAY_URL = reverse("theatre:play-list")
+TICKET_URL = reverse("theatre:ticket-list")
+
+
+@override_settings(THEATRE_FAST_LIST_SERIALIZERS=True)
+class FastListSerializerTests(TestCase):
+    """
+    The fast list path must return the same bytes as the DRF serializers
+    for every way the list routes can be paginated and filtered.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        actors = [
+            Actor.objects.create(first_name="Ian", last_name=name)
+            for name in ("McKellen", "Holm", "Bloom")
+        ]
+        genres = [
+            Genre.objects.create(name=name)
+            for name in ("Tragedy", "Drama", "Comedy")
+        ]
+        halls = [
+            TheatreHall.objects.create(name=name, rows=4, seats_in_row=5)
+            for name in ("Main", "Studio")
+        ]
+        reservation = Reservation.objects.create(user=self.user)
+        show_time = datetime(2030, 1, 1, 19, 0, 30, 1500, timezone.utc)
+        for index, title in enumerate(("Othello", "Hamlet", "Macbeth")):
+            play = Play.objects.create(title=title, description="Tragedy")
+            # Added out of id order, the output must not depend on it
+            play.actors.add(*reversed(actors[index:]))
+            play.genres.add(*reversed(genres[:index + 1]))
+            for hall in halls:
+                performance = Performance.objects.create(
+                    play=play, theatre_hall=hall
+                )
+                performance.show_time = show_time + timedelta(hours=index)
+                performance.save()
+                Ticket.objects.create(
+                    row=index + 1,
+                    seat=1,
+                    performance=performance,
+                    reservation=reservation,
+                )
+        Play.objects.filter(title="Hamlet").update(poster="plays/hamlet.jpg")
+        Play.objects.create(title="Empty", description="No cast")
+
+    def assert_same_content(self, url: str, params: dict | None = None):
+        params = {"page_size": 100, **(params or {})}
+        with override_settings(THEATRE_FAST_LIST_SERIALIZERS=False):
+            with CaptureQueriesContext(connection) as queries:
+                expected = self.client.get(url, params)
+        cache.clear()
+        with CaptureQueriesContext(connection) as fast_queries:
+            fast = self.client.get(url, params)
+
+        self.assertEqual(fast.status_code, status.HTTP_200_OK)
+        self.assertTrue(fast.json()["results"])
+        self.assertEqual(fast.content, expected.content)
+        self.assertLessEqual(len(fast_queries), len(queries))
+
+    def test_performance_list(self):
+        self.assert_same_content(PERFORMANCE_URL)
+
+    def test_performance_list_filtered(self):
+        self.assert_same_content(PERFORMANCE_URL, {"page_size": 2, "page": 2})
+        self.assert_same_content(PERFORMANCE_URL, {"count": "false"})
+
+    def test_performance_list_cursor(self):
+        self.assert_same_content(
+            PERFORMANCE_URL, {"pagination": "cursor", "page_size": 2}
+        )
+
+    def test_play_list(self):
+        self.assert_same_content(PLAY_URL)
+
+    def test_play_list_search(self):
+        self.assert_same_content(PLAY_URL, {"q": "ham"})
+
+    def test_ticket_list(self):
+        self.assert_same_content(TICKET_URL)
+
+    def test_ticket_list_cursor(self):
+        self.assert_same_content(
+            TICKET_URL, {"pagination": "cursor", "page_size": 2}
+        )
+
+    def test_ticket_list_only_own_tickets(self):
+        self.client.force_authenticate(
+            get_user_model().objects.create_user("other@test.com", "pass")
+        )
+
+        res = self.client.get(TICKET_URL)
+
+        self.assertEqual(res.json()["results"], [])
@@ -0,0 +1,66 @@
+from unittest import mock
+
+from django.test import TestCase
+from health_check.plugins import plugin_dir
+
+from theatre.health import DatabasePoolHealthCheck, TieredCacheHealthCheck
+
+
+class DatabasePoolHealthCheckTests(TestCase):
+    def test_registered(self):
+        self.assertIn(
+            DatabasePoolHealthCheck,
+            [plugin for plugin, _ in plugin_dir._registry],
+        )
+
+    def test_persistent_connection_settings(self):
+        check = DatabasePoolHealthCheck()
+
+        check.run_check()
+
+        self.assertEqual(check.status, 1)
+        self.assertFalse(check.stats["pooled"])
+        self.assertIn("conn_max_age=", str(check.pretty_status()))
+
+    def test_pool_stats(self):
+        pool = mock.Mock()
+        pool.get_stats.return_value = {
+            "pool_size": 4,
+            "pool_max": 8,
+            "pool_available": 1,
+            "requests_waiting": 2,
+            "connections_num": 5,
+        }
+        check = DatabasePoolHealthCheck()
+
+        with mock.patch("theatre.health.connection") as patched:
+            patched.pool = pool
+            check.run_check()
+
+        self.assertEqual(check.stats, {
+            "pooled": True,
+            "size": 4,
+            "max_size": 8,
+            "in_use": 3,
+            "waiting": 2,
+            "created": 5,
+        })
+        self.assertEqual(check.status, 0)
+        self.assertFalse(check.critical_service)
+
+
+class TieredCacheHealthCheckTests(TestCase):
+    def test_registered(self):
+        self.assertIn(
+            TieredCacheHealthCheck,
+            [plugin for plugin, _ in plugin_dir._registry],
+        )
+
+    def test_stats(self):
+        check = TieredCacheHealthCheck()
+
+        check.run_check()
+
+        self.assertEqual(check.status, 1)
+        self.assertIn("local_hits", check.stats)
+        self.assertIn("evictions=", str(check.pretty_status()))
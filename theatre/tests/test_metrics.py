@@ -0,0 +1,163 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.metrics import Histogram, format_labels, registry
+from theatre.models import Performance, Play, TheatreHall
+
+
+PERFORMANCE_LIST = '{view="performance",action="list"}'
+
+
+class HistogramTests(TestCase):
+    def test_buckets_are_cumulative(self):
+        histogram = Histogram((1, 5))
+        for value in (0.5, 1, 3, 10):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.render("size", (("view", "play"),)), [
+            'size_bucket{view="play",le="1"} 2',
+            'size_bucket{view="play",le="5"} 3',
+            'size_bucket{view="play",le="+Inf"} 4',
+            'size_sum{view="play"} 14.5',
+            'size_count{view="play"} 4',
+        ])
+
+    def test_label_values_are_escaped(self):
+        self.assertEqual(
+            format_labels((("view", 'a"b\\c\n'),)), r'{view="a\"b\\c\n"}'
+        )
+
+
+@override_settings(METRICS_TOKEN="secret")
+class MetricsMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        registry.clear()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "testpass"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Performance.objects.create(
+            play=Play.objects.create(title="Hamlet", description="Tragedy"),
+            theatre_hall=TheatreHall.objects.create(
+                name="Main", rows=5, seats_in_row=6
+            ),
+        )
+
+    def get_metrics(self) -> str:
+        response = self.client.get(
+            "/metrics", HTTP_AUTHORIZATION="Bearer secret"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        return response.content.decode()
+
+    def test_records_viewset_basename_and_action(self):
+        self.client.get(reverse("theatre:performance-list"))
+
+        metrics = self.get_metrics()
+
+        self.assertIn(
+            "http_request_duration_seconds_count" + PERFORMANCE_LIST + " 1",
+            metrics,
+        )
+        self.assertIn(
+            'http_requests_total{view="performance",action="list",'
+            'status="200"} 1.0',
+            metrics,
+        )
+        self.assertIn(
+            "http_view_non_db_seconds_count"
+            + PERFORMANCE_LIST + " 1",
+            metrics,
+        )
+        self.assertIn(
+            "http_response_size_bytes_count" + PERFORMANCE_LIST + " 1",
+            metrics,
+        )
+        self.assertIn(
+            "http_db_queries_count" + PERFORMANCE_LIST + " 1", metrics
+        )
+        self.assertIn("cache_events_total", metrics)
+        self.assertNotIn('view="metrics"', metrics)
+
+    def test_counts_queries(self):
+        self.client.get(reverse("theatre:performance-list"))
+
+        metrics = self.get_metrics()
+
+        self.assertNotIn(
+            "http_db_queries_bucket"
+            '{view="performance",action="list",le="0"} 1',
+            metrics,
+        )
+
+    def test_flags_views_over_the_query_budget(self):
+        with override_settings(METRICS_QUERY_BUDGET=0):
+            with self.assertLogs("core.metrics", "WARNING") as logs:
+                self.client.get(reverse("theatre:performance-list"))
+
+        self.assertIn("performance list ran", logs.output[0])
+        self.assertIn(
+            "http_query_budget_exceeded_total" + PERFORMANCE_LIST + " 1.0",
+            self.get_metrics(),
+        )
+
+    def test_records_other_views_by_url_name(self):
+        self.client.post(reverse("accounts:create"), {})
+
+        self.assertIn(
+            'http_requests_total{view="accounts:create",action="post",'
+            'status="400"} 1.0',
+            self.get_metrics(),
+        )
+
+    # The debug toolbar would run the chain synchronously
+    @override_settings(MIDDLEWARE=[
+        name for name in settings.MIDDLEWARE if "debug_toolbar" not in name
+    ])
+    async def test_counts_queries_under_asgi(self):
+        token = await sync_to_async(RefreshToken.for_user)(self.user)
+        headers = {"authorization": f"Bearer {token.access_token}"}
+        await self.async_client.get(
+            reverse("theatre:performance-list"), headers=headers
+        )
+        await self.async_client.get(
+            reverse("theatre:async-performance-list"), headers=headers
+        )
+
+        metrics = await sync_to_async(self.get_metrics)()
+
+        for labels in (
+            'view="performance",action="list"',
+            'view="theatre:async-performance-list",action="get"',
+        ):
+            self.assertIn(f"http_db_queries_count{{{labels}}} 1", metrics)
+            self.assertIn(
+                f'http_db_queries_bucket{{{labels},le="0"}} 0', metrics
+            )
+
+    def test_token(self):
+        self.assertEqual(
+            self.client.get("/metrics").status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+
+    @override_settings(METRICS_TOKEN="")
+    def test_closed_without_token(self):
+        self.assertEqual(
+            self.client.get("/metrics").status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+        with override_settings(DEBUG=True):
+            self.assertEqual(
+                self.client.get("/metrics").status_code, status.HTTP_200_OK
+            )
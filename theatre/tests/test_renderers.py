@@ -0,0 +1,66 @@
+import datetime
+import uuid
+from decimal import Decimal
+from io import BytesIO
+
+from django.test import TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from core.renderers import FastJSONParser, FastJSONRenderer
+
+
+PAYLOAD = {
+    "id": 1,
+    "title": "Hamlet\u2028Prince of Denmark",
+    "created_at": datetime.datetime(
+        2030, 1, 1, 19, 0, 0, 123456, tzinfo=datetime.timezone.utc
+    ),
+    "date": datetime.date(2030, 1, 1),
+    "price": Decimal("12.50"),
+    "reference": uuid.UUID(int=1),
+    "label": gettext_lazy("Drama"),
+    "seats": {1: [1, 2, 3]},
+    "poster": None,
+}
+
+
+class FastJSONRendererTests(TestCase):
+    def test_matches_drf_renderer(self):
+        self.assertEqual(
+            FastJSONRenderer().render(PAYLOAD),
+            JSONRenderer().render(PAYLOAD),
+        )
+
+    def test_indented_output(self):
+        self.assertEqual(
+            FastJSONRenderer().render(
+                PAYLOAD, "application/json; indent=2"
+            ),
+            JSONRenderer().render(PAYLOAD, "application/json; indent=2"),
+        )
+
+    def test_empty_body(self):
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+
+class FastJSONParserTests(TestCase):
+    def test_parse(self):
+        self.assertEqual(
+            FastJSONParser().parse(BytesIO(b'{"row": 1, "seat": [2]}')),
+            {"row": 1, "seat": [2]},
+        )
+
+    def test_parse_other_charset(self):
+        self.assertEqual(
+            FastJSONParser().parse(
+                BytesIO('{"title": "Café"}'.encode("latin-1")),
+                parser_context={"encoding": "latin-1"},
+            ),
+            {"title": "Café"},
+        )
+
+    def test_invalid_json(self):
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(BytesIO(b'{"row": NaN}'))
@@ -0,0 +1,138 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.db_router import ReplicaRouter, is_pinned_to_primary, replica_reads
+from theatre.models import Genre, Performance, Play, Reservation, TheatreHall
+from theatre.views import GenreViewSet
+
+
+@override_settings(DATABASE_REPLICAS=["default"])
+class ReplicaRoutingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.performance = Performance.objects.create(
+            play=Play.objects.create(title="Hamlet", description="Tragedy"),
+            theatre_hall=TheatreHall.objects.create(
+                name="Main", rows=5, seats_in_row=6
+            ),
+        )
+        # The test database stands in for the replica
+        patcher = mock.patch(
+            "core.db_router.random.choice",
+            side_effect=lambda aliases: aliases[0],
+        )
+        self.choose_replica = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_router_reads_primary_by_default(self):
+        router = ReplicaRouter()
+
+        self.assertIsNone(router.db_for_read(Play))
+        with replica_reads():
+            self.assertEqual(router.db_for_read(Play), "default")
+            self.assertEqual(router.db_for_write(Play), "default")
+
+    def test_router_does_not_migrate_replicas(self):
+        self.assertFalse(ReplicaRouter().allow_migrate("default", "theatre"))
+
+    def test_catalogue_reads_use_replicas(self):
+        res = self.client.get(reverse("theatre:performance-list"))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.choose_replica.assert_called()
+
+    def test_cached_responses_ignore_stale_replicas(self):
+        Genre.objects.create(name="Drama")
+        replicated = list(Genre.objects.values_list("pk", flat=True))
+        # Bumps the catalogue version before the replica catches up
+        Genre.objects.create(name="Comedy")
+        get_queryset = GenreViewSet.get_queryset
+
+        def lagging_replica(view):
+            queryset = get_queryset(view)
+            if ReplicaRouter().db_for_read(Genre):
+                return queryset.filter(pk__in=replicated)
+            return queryset
+
+        with mock.patch.object(GenreViewSet, "get_queryset", lagging_replica):
+            res = self.client.get(reverse("theatre:genre-list"))
+            cached = self.client.get(reverse("theatre:genre-list"))
+
+        for response in (res, cached):
+            self.assertEqual(
+                [genre["name"] for genre in response.data["results"]],
+                ["Comedy", "Drama"],
+            )
+
+    def test_reservation_reads_use_primary(self):
+        Reservation.objects.create(user=self.user)
+
+        res = self.client.get(reverse("theatre:reservation-list"))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.choose_replica.assert_not_called()
+
+    def test_seat_map_reads_use_primary(self):
+        res = self.client.get(
+            reverse("theatre:performance-seats", args=[self.performance.id])
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.choose_replica.assert_not_called()
+
+    def test_writes_pin_user_to_primary(self):
+        res = self.client.post(
+            reverse("theatre:seat_hold-list"),
+            {"row": 1, "seat": 1, "performance": self.performance.id},
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(is_pinned_to_primary(self.user.id))
+
+        self.client.get(reverse("theatre:performance-list"))
+
+        self.choose_replica.assert_not_called()
+
+    def test_failed_writes_do_not_pin(self):
+        self.client.post(
+            reverse("theatre:seat_hold-list"), {}, format="json"
+        )
+
+        self.assertFalse(is_pinned_to_primary(self.user.id))
+
+    async def test_async_catalogue_reads_use_replicas(self):
+        token = RefreshToken.for_user(self.user).access_token
+
+        res = await self.async_client.get(
+            reverse("theatre:async-performance-list"),
+            headers={"authorization": f"Bearer {token}"},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.choose_replica.assert_called()
+
+    async def test_async_seat_map_reads_use_primary(self):
+        token = RefreshToken.for_user(self.user).access_token
+
+        res = await self.async_client.get(
+            reverse(
+                "theatre:async-performance-seats", args=[self.performance.id]
+            ),
+            headers={"authorization": f"Bearer {token}"},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.choose_replica.assert_not_called()
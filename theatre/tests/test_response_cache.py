@@ -0,0 +1,96 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import NoReverseMatch, reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.tests.test_theatre_api import (
+    GENRE_URL,
+    PLAY_URL,
+    sample_actor,
+    sample_genre,
+    sample_play,
+)
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass"
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_list_is_served_from_cache(self):
+        sample_play()
+        self.client.get(PLAY_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(PLAY_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]), 1)
+
+    def test_genres_have_no_detail_route(self):
+        with self.assertRaises(NoReverseMatch):
+            reverse("theatre:genre-detail", args=[1])
+
+    def test_cache_key_includes_query_params(self):
+        for _ in range(3):
+            sample_play()
+        self.client.get(PLAY_URL, {"page_size": 1})
+
+        res = self.client.get(PLAY_URL, {"page_size": 2})
+
+        self.assertEqual(len(res.data["results"]), 2)
+
+    def test_save_invalidates_cache(self):
+        sample_genre(name="Drama")
+        self.client.get(GENRE_URL)
+
+        sample_genre(name="Comedy")
+        res = self.client.get(GENRE_URL)
+
+        self.assertEqual(len(res.data["results"]), 2)
+
+    def test_m2m_change_invalidates_cache(self):
+        play = sample_play()
+        url = reverse("theatre:play-detail", args=[play.id])
+        self.client.get(url)
+
+        play.actors.add(sample_actor())
+        res = self.client.get(url)
+
+        self.assertEqual(len(res.data["actors"]), 1)
+
+    def test_delete_invalidates_cache(self):
+        genre = sample_genre()
+        self.client.get(GENRE_URL)
+
+        genre.delete()
+        res = self.client.get(GENRE_URL)
+
+        self.assertEqual(res.data["results"], [])
+
+    def test_if_none_match_returns_not_modified(self):
+        sample_play()
+        etag = self.client.get(PLAY_URL)["ETag"]
+
+        res = self.client.get(PLAY_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etag)
+
+    def test_stale_etag_returns_fresh_response(self):
+        play = sample_play()
+        etag = self.client.get(PLAY_URL)["ETag"]
+
+        play.title = "New title"
+        play.save()
+        res = self.client.get(PLAY_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
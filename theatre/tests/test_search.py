@@ -0,0 +1,92 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from theatre.models import Actor, Play
+
+
+ACTOR_URL = reverse("theatre:actor-list")
+PLAY_URL = reverse("theatre:play-list")
+
+
+class SearchApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass"
+        )
+        self.client.force_authenticate(self.user)
+
+        self.hamlet = Play.objects.create(
+            title="Hamlet", description="Prince of Denmark"
+        )
+        self.lear = Play.objects.create(
+            title="King Lear", description="A king divides his kingdom"
+        )
+        self.macbeth = Play.objects.create(
+            title="Macbeth", description="Scottish king and Hamlet rival"
+        )
+
+    def search_titles(self, query: str) -> list[str]:
+        res = self.client.get(PLAY_URL, {"q": query})
+        return [play["title"] for play in res.data["results"]]
+
+    def test_search_plays_by_title_and_description(self):
+        self.assertEqual(self.search_titles("denmark"), ["Hamlet"])
+        self.assertEqual(
+            set(self.search_titles("king")), {"King Lear", "Macbeth"}
+        )
+
+    def test_search_plays_by_prefix(self):
+        self.assertEqual(self.search_titles("mac"), ["Macbeth"])
+        self.assertEqual(self.search_titles("king div"), ["King Lear"])
+
+    def test_search_plays_ranked_by_relevance(self):
+        self.assertEqual(self.search_titles("king"), ["King Lear", "Macbeth"])
+
+    def test_search_plays_sees_updates(self):
+        Play.objects.filter(pk=self.hamlet.pk).update(title="Othello")
+        self.hamlet.refresh_from_db()
+        self.hamlet.description = "The Moor of Venice"
+        self.hamlet.save()
+        self.macbeth.delete()
+
+        self.assertEqual(self.search_titles("hamlet"), [])
+        self.assertEqual(self.search_titles("venice"), ["Othello"])
+
+    def test_search_plays_is_paginated(self):
+        res = self.client.get(PLAY_URL, {"q": "king", "page_size": 1})
+
+        self.assertEqual(res.data["count"], 2)
+        self.assertEqual(len(res.data["results"]), 1)
+        self.assertIsNotNone(res.data["next"])
+
+    def test_search_without_terms_matches_nothing(self):
+        self.assertEqual(self.search_titles("!!"), [])
+
+    def test_search_actors(self):
+        Actor.objects.create(first_name="Laurence", last_name="Olivier")
+        Actor.objects.create(first_name="Olivia", last_name="Colman")
+        Actor.objects.create(first_name="Judi", last_name="Dench")
+
+        res = self.client.get(ACTOR_URL, {"q": "oliv"})
+
+        self.assertEqual(
+            {actor["full_name"] for actor in res.data["results"]},
+            {"Laurence Olivier", "Olivia Colman"},
+        )
+
+    def test_search_falls_back_without_search_index(self):
+        with mock.patch(
+            "theatre.search.has_search_table", return_value=False
+        ):
+            self.assertEqual(self.search_titles("mac"), ["Macbeth"])
+            self.assertEqual(
+                set(self.search_titles("king")), {"King Lear", "Macbeth"}
+            )
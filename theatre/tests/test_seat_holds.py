@@ -0,0 +1,147 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.holds import sweep_expired_holds
+from theatre.models import SeatHold, Ticket
+from theatre.seat_map import decode_seat_map
+from theatre.tests.test_theatre_api import RESERVATION_URL, sample_performance
+
+
+SEAT_HOLD_URL = reverse("theatre:seat_hold-list")
+
+
+class SeatHoldApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "holder@test.com", "testpass", is_staff=True
+        )
+        self.other_user = get_user_model().objects.create_user(
+            "other@test.com", "testpass", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.performance = sample_performance()
+
+    def hold(self, row: int, seat: int):
+        return self.client.post(
+            SEAT_HOLD_URL,
+            {"row": row, "seat": seat, "performance": self.performance.id}
+        )
+
+    def test_hold_seat(self):
+        res = self.hold(row=1, seat=1)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertIn("expires_at", res.data)
+        self.assertEqual(SeatHold.objects.get().user, self.user)
+
+    def test_hold_seat_again_extends_hold(self):
+        self.hold(row=1, seat=1)
+        SeatHold.objects.update(expires_at=timezone.now())
+
+        res = self.hold(row=1, seat=1)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertGreater(SeatHold.objects.get().expires_at, timezone.now())
+
+    def test_hold_seat_held_by_other_user(self):
+        self.hold(row=1, seat=1)
+        self.client.force_authenticate(self.other_user)
+
+        res = self.hold(row=1, seat=1)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("seat", res.data)
+
+    def test_expired_hold_can_be_taken_over(self):
+        self.hold(row=1, seat=1)
+        SeatHold.objects.update(expires_at=timezone.now())
+        self.client.force_authenticate(self.other_user)
+
+        res = self.hold(row=1, seat=1)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(SeatHold.objects.get().user, self.other_user)
+
+    def test_hold_seat_outside_hall(self):
+        res = self.hold(row=11, seat=1)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(SeatHold.objects.exists())
+
+    def test_reservation_converts_hold(self):
+        self.hold(row=1, seat=1)
+        self.hold(row=1, seat=2)
+        payload = {"tickets": [
+            {"row": 1, "seat": 1, "performance": self.performance.id}
+        ]}
+
+        res = self.client.post(RESERVATION_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Ticket.objects.count(), 1)
+        self.assertEqual(
+            list(SeatHold.objects.values_list("row", "seat")), [(1, 2)]
+        )
+
+    def test_reservation_of_seat_held_by_other_user(self):
+        self.hold(row=1, seat=1)
+        self.client.force_authenticate(self.other_user)
+        payload = {"tickets": [
+            {"row": 1, "seat": 1, "performance": self.performance.id}
+        ]}
+
+        res = self.client.post(RESERVATION_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("seat", res.data["tickets"][0])
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_release_hold(self):
+        hold_id = self.hold(row=1, seat=1).data["id"]
+
+        res = self.client.delete(
+            reverse("theatre:seat_hold-detail", args=[hold_id])
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(SeatHold.objects.exists())
+
+    def test_seat_map_includes_holds(self):
+        self.hold(row=2, seat=3)
+
+        res = self.client.get(
+            reverse("theatre:performance-seats", args=[self.performance.id])
+        )
+
+        self.assertEqual(
+            decode_seat_map(res.data["seats"], 10, 10), {(2, 3)}
+        )
+
+    def test_sweep_expired_holds(self):
+        self.hold(row=1, seat=1)
+        self.hold(row=1, seat=2)
+        SeatHold.objects.filter(seat=1).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        self.assertEqual(sweep_expired_holds(batch_size=1), 1)
+        self.assertEqual(
+            list(SeatHold.objects.values_list("seat", flat=True)), [2]
+        )
+
+    def test_sweep_seat_holds_command(self):
+        self.hold(row=1, seat=1)
+        SeatHold.objects.update(expires_at=timezone.now())
+
+        call_command("sweep_seat_holds", stdout=StringIO())
+
+        self.assertFalse(SeatHold.objects.exists())
@@ -0,0 +1,49 @@
+from datetime import datetime, timezone
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db.models import Max, Min
+from django.test import TestCase
+
+from theatre.cache import get_catalogue_version
+from theatre.models import Performance, Play, Ticket
+
+
+class SeedTheatreCommandTests(TestCase):
+    def seed(self, *args: str) -> None:
+        call_command(
+            "seed_theatre", "--scale", "0.001", *args, stdout=StringIO()
+        )
+
+    def test_seed_small_dataset(self):
+        self.seed(
+            "--reservations", "300",
+            "--start-date", "2030-01-01",
+            "--days", "7",
+        )
+
+        show_times = Performance.objects.aggregate(
+            first=Min("show_time"), last=Max("show_time")
+        )
+        self.assertEqual(Ticket.objects.count(), 1500)
+        self.assertEqual(Play.objects.count(), 2)
+        self.assertGreaterEqual(
+            show_times["first"], datetime(2030, 1, 1, tzinfo=timezone.utc)
+        )
+        self.assertLess(
+            show_times["last"], datetime(2030, 1, 8, tzinfo=timezone.utc)
+        )
+
+    def test_same_seed_twice_fails_cleanly(self):
+        self.seed()
+
+        with self.assertRaises(CommandError):
+            self.seed()
+
+    def test_seeding_invalidates_cached_responses(self):
+        version = get_catalogue_version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.seed()
+
+        self.assertNotEqual(get_catalogue_version(), version)
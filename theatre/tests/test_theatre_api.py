@@ -1,12 +1,26 @@
 import uuid
+from datetime import datetime, timedelta, timezone
+from unittest import mock
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import IntegrityError, connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from theatre.models import Actor, Genre, Performance, Play, TheatreHall
+from theatre.models import (
+    Actor,
+    Genre,
+    Performance,
+    Play,
+    Reservation,
+    TheatreHall,
+    Ticket,
+)
+from theatre.seat_map import decode_seat_map
 from theatre.serializers import (
     ActorSerializer,
     GenreSerializer,
@@ -63,6 +77,13 @@ def sample_performance(**params):
     return Performance.objects.create(**defaults)
 
 
+def scheduled_performance(show_time: datetime, **params):
+    performance = sample_performance(**params)
+    # show_time is auto_now_add, so the schedule is set afterwards
+    Performance.objects.filter(pk=performance.pk).update(show_time=show_time)
+    return performance
+
+
 def sample_reservation(**params):
     return {
         "tickets": [
@@ -83,6 +104,7 @@ class UnauthenticatedApiTests(TestCase):
 
 class AuthenticatedApiTests(TestCase):
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.user = get_user_model().objects.create_user(
             "test@test.com",
@@ -127,6 +149,20 @@ class AuthenticatedApiTests(TestCase):
         self.assertEqual(res.data["results"], serializer.data)
         self.assertEqual(res.data["count"], plays.count())
 
+    def test_list_plays_query_count(self):
+        actors = [sample_actor() for _ in range(40)]
+        genres = [sample_genre() for _ in range(3)]
+        for _ in range(10):
+            play = sample_play()
+            play.actors.add(*actors)
+            play.genres.add(*genres)
+
+        with self.assertNumQueries(4):
+            res = self.client.get(PLAY_URL)
+
+        self.assertEqual(len(res.data["results"]), 10)
+        self.assertEqual(len(res.data["results"][0]["actors"]), 40)
+
     def test_filter_plays_by_genres(self):
         genre1 = sample_genre(name="Genre 1")
         genre2 = sample_genre(name="Genre 2")
@@ -193,6 +229,108 @@ class AuthenticatedApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data, serializer.data)
 
+    def test_list_performances_with_availability(self):
+        performance = sample_performance(
+            theatre_hall=sample_theatre_hall(rows=3, seats_in_row=5)
+        )
+        sample_performance()
+        Ticket.objects.create(
+            row=1,
+            seat=1,
+            performance=performance,
+            reservation=Reservation.objects.create(user=self.user)
+        )
+
+        with self.assertNumQueries(2):
+            res = self.client.get(PERFORMANCE_URL)
+
+        availability = {
+            item["id"]: (item["capacity"], item["tickets_available"])
+            for item in res.data["results"]
+        }
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(availability[performance.id], (15, 14))
+        self.assertEqual(len(availability), 2)
+
+    def test_filter_performances_by_time_range(self):
+        monday = datetime(2030, 1, 7, 19, tzinfo=timezone.utc)
+        scheduled_performance(monday - timedelta(days=1))
+        in_week = scheduled_performance(monday)
+        scheduled_performance(monday + timedelta(days=7))
+
+        res = self.client.get(PERFORMANCE_URL, {
+            "show_time__gte": "2030-01-07T00:00:00Z",
+            "show_time__lt": "2030-01-14T00:00:00Z",
+        })
+
+        self.assertEqual(
+            [item["id"] for item in res.data["results"]], [in_week.id]
+        )
+
+    def test_filter_performances_by_date(self):
+        evening = scheduled_performance(
+            datetime(2030, 1, 7, 19, tzinfo=timezone.utc)
+        )
+        scheduled_performance(datetime(2030, 1, 8, 0, tzinfo=timezone.utc))
+
+        res = self.client.get(PERFORMANCE_URL, {"date": "2030-01-07"})
+
+        self.assertEqual(
+            [item["id"] for item in res.data["results"]], [evening.id]
+        )
+
+    def test_filter_upcoming_performances_of_play(self):
+        play = sample_play()
+        future = datetime.now(timezone.utc) + timedelta(days=1)
+        upcoming = scheduled_performance(future, play=play)
+        scheduled_performance(future)
+        scheduled_performance(
+            datetime.now(timezone.utc) - timedelta(days=1), play=play
+        )
+
+        res = self.client.get(
+            PERFORMANCE_URL, {"upcoming": "true", "play": play.id}
+        )
+
+        self.assertEqual(
+            [item["id"] for item in res.data["results"]], [upcoming.id]
+        )
+
+    def test_performance_seat_map(self):
+        performance = sample_performance(
+            theatre_hall=sample_theatre_hall(rows=3, seats_in_row=5)
+        )
+        reservation = Reservation.objects.create(user=self.user)
+        Ticket.objects.create(
+            row=1, seat=1, performance=performance, reservation=reservation
+        )
+        Ticket.objects.create(
+            row=3, seat=5, performance=performance, reservation=reservation
+        )
+
+        url = reverse("theatre:performance-seats", args=[performance.id])
+        with self.assertNumQueries(2):
+            res = self.client.get(url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["taken"], 2)
+        self.assertEqual(res.data["available"], 13)
+        self.assertEqual(
+            decode_seat_map(res.data["seats"], 3, 5), {(1, 1), (3, 5)}
+        )
+
+    def test_retrieve_play_detail_query_count(self):
+        play = sample_play()
+        play.genres.add(*[sample_genre() for _ in range(3)])
+        play.actors.add(*[sample_actor() for _ in range(40)])
+
+        url = reverse("theatre:play-detail", args=[play.id])
+        with self.assertNumQueries(3):
+            res = self.client.get(url)
+
+        self.assertEqual(len(res.data["actors"]), 40)
+        self.assertEqual(len(res.data["genres"]), 3)
+
     def test_create_reservation_forbidden(self):
         self.client.force_authenticate(user=None)
         payload = sample_reservation()
@@ -226,9 +364,50 @@ class AuthenticatedApiTests(TestCase):
         self.assertIn("next", res.data)
         self.assertIn("previous", res.data)
 
+    def test_pagination_without_count(self):
+        for _ in range(15):
+            sample_play()
+
+        with self.assertNumQueries(3):
+            first_page = self.client.get(PLAY_URL, {"count": "false"})
+        last_page = self.client.get(first_page.data["next"])
+
+        self.assertIsNone(first_page.data["count"])
+        self.assertEqual(len(first_page.data["results"]), 10)
+        self.assertEqual(len(last_page.data["results"]), 5)
+        self.assertIsNone(last_page.data["next"])
+        self.assertIsNotNone(last_page.data["previous"])
+
+    def test_cursor_pagination(self):
+        performance = sample_performance()
+        reservation = Reservation.objects.create(user=self.user)
+        tickets = [
+            Ticket.objects.create(
+                row=1,
+                seat=seat,
+                performance=performance,
+                reservation=reservation
+            )
+            for seat in range(1, 13)
+        ]
+
+        first_page = self.client.get(
+            TICKET_URL, {"pagination": "cursor", "page_size": 5}
+        )
+        pages = [first_page.data]
+        while pages[-1]["next"]:
+            pages.append(self.client.get(pages[-1]["next"]).data)
+
+        self.assertNotIn("count", first_page.data)
+        self.assertEqual(
+            [item["id"] for page in pages for item in page["results"]],
+            [ticket.id for ticket in tickets]
+        )
+
 
 class AdminApiTests(TestCase):
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.admin_user = get_user_model().objects.create_superuser(
             email="admin@example.com",
@@ -256,6 +435,107 @@ class AdminApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertIn("poster", res.data)
 
+    def test_create_reservation(self):
+        payload = sample_reservation()
+        res = self.client.post(RESERVATION_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data["tickets"]), 2)
+        self.assertEqual(Ticket.objects.count(), 2)
+
+    def test_create_reservation_query_count_is_constant(self):
+        performance = sample_performance()
+
+        def book(row: int, seats: int) -> int:
+            payload = {"tickets": [
+                {"row": row, "seat": seat, "performance": performance.id}
+                for seat in range(1, seats + 1)
+            ]}
+            with CaptureQueriesContext(connection) as queries:
+                res = self.client.post(RESERVATION_URL, payload, format="json")
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            return len(queries)
+
+        self.assertEqual(book(row=1, seats=2), book(row=2, seats=10))
+
+    def test_create_reservation_loads_each_hall_once(self):
+        def book(performances: int) -> int:
+            payload = {"tickets": [
+                {"row": 1, "seat": 1, "performance": sample_performance().id}
+                for _ in range(performances)
+            ]}
+            with CaptureQueriesContext(connection) as queries:
+                res = self.client.post(RESERVATION_URL, payload, format="json")
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            return len(queries)
+
+        self.assertEqual(book(performances=1), book(performances=5))
+
+    def test_create_reservation_seat_outside_hall(self):
+        performance = sample_performance(
+            theatre_hall=sample_theatre_hall(rows=10, seats_in_row=20)
+        )
+        payload = {"tickets": [
+            {"row": 10, "seat": 20, "performance": performance.id},
+            {"row": 90, "seat": 1, "performance": performance.id},
+            {"row": 1, "seat": 21, "performance": performance.id},
+        ]}
+        res = self.client.post(RESERVATION_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data["tickets"][0], {})
+        self.assertIn("row", res.data["tickets"][1])
+        self.assertIn("seat", res.data["tickets"][2])
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_create_reservation_duplicate_seats(self):
+        performance = sample_performance()
+        payload = {"tickets": [
+            {"row": 1, "seat": 1, "performance": performance.id},
+            {"row": 1, "seat": 1, "performance": performance.id},
+        ]}
+        res = self.client.post(RESERVATION_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data["tickets"][0], {})
+        self.assertIn("seat", res.data["tickets"][1])
+        self.assertFalse(Reservation.objects.exists())
+
+    def test_create_reservation_taken_seat(self):
+        performance = sample_performance()
+        Ticket.objects.create(
+            row=1,
+            seat=2,
+            performance=performance,
+            reservation=Reservation.objects.create(user=self.admin_user)
+        )
+        payload = {"tickets": [
+            {"row": 1, "seat": 1, "performance": performance.id},
+            {"row": 1, "seat": 2, "performance": performance.id},
+        ]}
+        res = self.client.post(RESERVATION_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data["tickets"][0], {})
+        self.assertIn("seat", res.data["tickets"][1])
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_create_reservation_seat_taken_concurrently(self):
+        performance = sample_performance()
+        payload = {"tickets": [
+            {"row": 1, "seat": 1, "performance": performance.id},
+        ]}
+        # The competing reservation is not visible when the insert fails
+        with mock.patch(
+            "theatre.serializers.Ticket.objects.bulk_create",
+            side_effect=IntegrityError,
+        ):
+            res = self.client.post(RESERVATION_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("non_field_errors", res.data)
+        self.assertFalse(Reservation.objects.exists())
+
 
 class ForbiddenApiTests(TestCase):
     def setUp(self):
@@ -0,0 +1,177 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory
+
+from core.throttling import (
+    ScopedSlidingWindowThrottle,
+    SlidingWindowThrottle,
+    UserSlidingWindowThrottle,
+)
+from theatre.models import Performance, Play, TheatreHall
+
+
+RATES = {"anon": "3/minute", "user": "3/minute", "reservations": "1/minute"}
+
+
+def throttle_at(throttle_class: type, now: float):
+    throttle = throttle_class()
+    throttle.timer = lambda: now
+    return throttle
+
+
+@mock.patch.object(SlidingWindowThrottle, "THROTTLE_RATES", RATES)
+class SlidingWindowThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpass"
+        )
+        request = APIRequestFactory().get("/")
+        request.user = self.user
+        self.request = request
+
+    def allow(self, now: float) -> bool:
+        return throttle_at(UserSlidingWindowThrottle, now).allow_request(
+            self.request, None
+        )
+
+    def test_limits_within_window(self):
+        self.assertEqual(
+            [self.allow(60 + second) for second in range(4)],
+            [True, True, True, False],
+        )
+
+    def test_previous_window_is_weighted(self):
+        for _ in range(3):
+            self.allow(60)
+
+        # Two thirds of the previous window still count: 3 * 2/3 = 2
+        self.assertTrue(self.allow(140))
+        self.assertFalse(self.allow(140))
+        # A quarter counts: 3 * 1/4 + 1 = 1.75
+        self.assertTrue(self.allow(165))
+
+    def test_wait_until_a_request_fits(self):
+        for _ in range(3):
+            self.allow(60)
+        throttle = throttle_at(UserSlidingWindowThrottle, 130)
+
+        self.assertFalse(throttle.allow_request(self.request, None))
+        # 3 * (1 - (10 + 10) / 60) + 1 = 3 at 140
+        self.assertAlmostEqual(throttle.wait(), 10.0)
+        self.assertTrue(self.allow(140))
+
+    def test_counters_are_shared(self):
+        # Every worker builds its own throttle objects
+        for second in range(3):
+            throttle_at(UserSlidingWindowThrottle, 60 + second).allow_request(
+                self.request, None
+            )
+
+        self.assertFalse(self.allow(63))
+
+    def test_workers_share_the_counters(self):
+        # Separate clients of the configured backend, like two workers
+        clients = [
+            caches.create_connection(settings.THROTTLE_CACHE_ALIAS)
+            for _ in range(2)
+        ]
+        self.assertIsNot(clients[0], clients[1])
+        workers = [
+            type("WorkerThrottle", (UserSlidingWindowThrottle,), {
+                "cache": client
+            })
+            for client in clients
+        ]
+
+        self.assertEqual(
+            [
+                throttle_at(workers[second % 2], 60 + second).allow_request(
+                    self.request, None
+                )
+                for second in range(4)
+            ],
+            [True, True, True, False],
+        )
+
+    def test_concurrent_requests_cannot_overshoot(self):
+        for _ in range(2):
+            self.allow(60)
+        shared = caches[settings.THROTTLE_CACHE_ALIAS]
+        get = shared.get
+        other = []
+
+        def get_during_other_request(*args, **kwargs):
+            # Another worker takes the last slot while this one decides
+            if not other:
+                other.append(None)
+                other[0] = self.allow(61)
+            return get(*args, **kwargs)
+
+        with mock.patch.object(
+            shared, "get", side_effect=get_during_other_request
+        ):
+            self.assertTrue(self.allow(61))
+
+        self.assertEqual(other, [False])
+        # The rejected request was not counted
+        self.assertEqual(shared.get("throttle_user_%s:1" % self.user.pk), 3)
+
+
+@mock.patch.object(SlidingWindowThrottle, "THROTTLE_RATES", RATES)
+class ScopedThrottleApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_superuser(
+            "admin@test.com",
+            "testpass"
+        )
+        self.client.force_authenticate(self.user)
+        self.performance = Performance.objects.create(
+            play=Play.objects.create(title="Hamlet", description="Tragedy"),
+            theatre_hall=TheatreHall.objects.create(
+                name="Main", rows=5, seats_in_row=6
+            ),
+        )
+
+    def reserve(self, seat: int):
+        return self.client.post(
+            reverse("theatre:reservation-list"),
+            {"tickets": [{
+                "row": 1, "seat": seat, "performance": self.performance.id
+            }]},
+            format="json",
+        )
+
+    def test_reservation_posts_have_own_scope(self):
+        with mock.patch.object(
+            ScopedSlidingWindowThrottle, "timer", return_value=60
+        ), mock.patch.object(
+            UserSlidingWindowThrottle, "get_rate", return_value=None
+        ):
+            self.assertEqual(self.reserve(1).status_code, 201)
+            response = self.reserve(2)
+            catalogue = self.client.get(reverse("theatre:play-list"))
+
+        self.assertEqual(
+            response.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertEqual(response["Retry-After"], "60")
+        self.assertEqual(catalogue.status_code, status.HTTP_200_OK)
+
+    def test_views_without_scope_are_not_limited(self):
+        view = mock.Mock(spec=[])
+
+        self.assertTrue(
+            ScopedSlidingWindowThrottle().allow_request(
+                APIRequestFactory().get("/"), view
+            )
+        )
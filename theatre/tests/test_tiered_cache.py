@@ -0,0 +1,158 @@
+import threading
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from core.cache import TieredCache, is_shared_between_processes
+
+
+def tiered_cache(**options) -> TieredCache:
+    return TieredCache("", {
+        "OPTIONS": {"SHARED_ALIAS": "shared", "LOCAL_TIMEOUT": 5, **options}
+    })
+
+
+class TieredCacheTests(TestCase):
+    def setUp(self):
+        caches["shared"].clear()
+        self.cache = tiered_cache(MAX_ENTRIES=2)
+
+    def test_reads_fill_the_local_tier(self):
+        caches["shared"].set("key", "value")
+
+        self.assertEqual(self.cache.get("key"), "value")
+        caches["shared"].delete("key")
+        self.assertEqual(self.cache.get("key"), "value")
+        self.assertIsNone(self.cache.get("missing"))
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["shared_hits"], 1)
+        self.assertEqual(stats["local_hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_local_entries_expire(self):
+        self.cache.set("key", "value")
+        caches["shared"].set("key", "changed")
+
+        self.assertEqual(self.cache.get("key"), "value")
+        with mock.patch("core.cache.monotonic", return_value=10 ** 9):
+            self.assertEqual(self.cache.get("key"), "changed")
+
+    def test_least_recently_used_entries_are_evicted(self):
+        self.cache.set("first", 1)
+        self.cache.set("second", 2)
+        self.cache.get("first")
+        self.cache.set("third", 3)
+
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+        self.assertEqual(self.cache.stats()["local_entries"], 2)
+        self.assertEqual(
+            self.cache.get_many(["first", "second", "third"]),
+            {"first": 1, "second": 2, "third": 3},
+        )
+        self.assertEqual(self.cache.stats()["shared_hits"], 1)
+
+    def test_counters_change_in_the_shared_tier(self):
+        self.cache.set("counter", 1)
+
+        self.assertEqual(self.cache.incr("counter"), 2)
+        self.assertEqual(caches["shared"].get("counter"), 2)
+        self.assertEqual(self.cache.get("counter"), 2)
+
+    def test_delete_and_clear_both_tiers(self):
+        self.cache.set("key", "value")
+        self.cache.delete("key")
+        self.assertFalse(self.cache.has_key("key"))
+
+        self.cache.set("key", "value")
+        self.cache.clear()
+        self.assertIsNone(self.cache.get("key"))
+
+    def test_shared_between_processes_by_the_shared_tier(self):
+        self.assertFalse(is_shared_between_processes("default"))
+        with override_settings(CACHES={
+            "default": {
+                "BACKEND": "core.cache.TieredCache",
+                "OPTIONS": {"SHARED_ALIAS": "shared"},
+            },
+            "shared": {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": "redis://127.0.0.1:6379/0",
+            },
+        }):
+            self.assertTrue(is_shared_between_processes("default"))
+
+
+class GetOrComputeTests(TestCase):
+    def setUp(self):
+        caches["shared"].clear()
+        self.cache = tiered_cache()
+
+    def test_computes_once_and_caches(self):
+        compute = mock.Mock(return_value="value")
+
+        self.assertEqual(self.cache.get_or_compute("key", compute), "value")
+        self.assertEqual(self.cache.get_or_compute("key", compute), "value")
+        compute.assert_called_once()
+
+    def test_none_is_not_cached(self):
+        compute = mock.Mock(return_value=None)
+
+        self.cache.get_or_compute("key", compute)
+        self.cache.get_or_compute("key", compute)
+
+        self.assertEqual(compute.call_count, 2)
+        self.assertFalse(self.cache.has_key("key"))
+
+    def test_concurrent_misses_are_coalesced(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "value"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    self.cache.get_or_compute("key", compute)
+                )
+            )
+            for _ in range(5)
+        ]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["value"] * 5)
+
+    def test_waits_for_another_process(self):
+        caches["shared"].add("key:computing", True)
+        cache = tiered_cache(LOCK_POLL_INTERVAL=0)
+        compute = mock.Mock(return_value="mine")
+
+        def other_process(seconds):
+            caches["shared"].set("key", "theirs")
+
+        with mock.patch("core.cache.sleep", side_effect=other_process):
+            self.assertEqual(cache.get_or_compute("key", compute), "theirs")
+        compute.assert_not_called()
+        self.assertEqual(cache.stats()["coalesced"], 1)
+
+    def test_keeps_the_lock_of_a_slow_process(self):
+        caches["shared"].add("key:computing", True)
+        cache = tiered_cache(LOCK_TIMEOUT=0)
+
+        self.assertEqual(cache.get_or_compute("key", lambda: "mine"), "mine")
+        # The other process is still computing and holds its lock
+        self.assertTrue(caches["shared"].has_key("key:computing"))
@@ -0,0 +1,32 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db.utils import OperationalError
+from django.test import SimpleTestCase
+
+
+ENSURE_CONNECTION = (
+    "django.db.backends.base.base.BaseDatabaseWrapper.ensure_connection"
+)
+
+
+@mock.patch("time.sleep")
+class WaitForDbCommandTests(SimpleTestCase):
+    def test_wait_until_database_is_ready(self, patched_sleep):
+        with mock.patch(ENSURE_CONNECTION, side_effect=[
+            OperationalError, OperationalError, None
+        ]) as patched_connect:
+            call_command("wait_for_db", stdout=StringIO())
+
+        self.assertEqual(patched_connect.call_count, 3)
+        self.assertEqual(patched_sleep.call_count, 2)
+
+    def test_give_up_after_timeout(self, patched_sleep):
+        with mock.patch(ENSURE_CONNECTION, side_effect=OperationalError):
+            with self.assertRaises(CommandError):
+                call_command(
+                    "wait_for_db", "--timeout", "0", stdout=StringIO()
+                )
+
+        patched_sleep.assert_not_called()
@@ -1,11 +1,20 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 
+from theatre.async_views import (
+    performance_detail,
+    performance_list,
+    performance_seats,
+    play_list,
+)
 from theatre.views import (
     ActorViewSet,
+    CatalogueImportView,
     GenreViewSet,
     PerformanceViewSet,
     PlayViewSet,
     ReservationViewSet,
+    SeatHoldViewSet,
     TheatreHallViewSet,
     TicketViewSet,
 )
@@ -21,6 +30,29 @@ router.register("theatre-halls", TheatreHallViewSet, basename="theatre_hall")
 router.register("performances", PerformanceViewSet, basename="performance")
 router.register("reservations", ReservationViewSet, basename="reservation")
 router.register("tickets", TicketViewSet, basename="ticket")
+router.register("seat-holds", SeatHoldViewSet, basename="seat_hold")
 
 
-urlpatterns = router.urls
+urlpatterns = router.urls + [
+    path(
+        "catalogue/import/",
+        CatalogueImportView.as_view(),
+        name="catalogue-import",
+    ),
+    path(
+        "async/performances/",
+        performance_list,
+        name="async-performance-list",
+    ),
+    path(
+        "async/performances/<int:pk>/",
+        performance_detail,
+        name="async-performance-detail",
+    ),
+    path(
+        "async/performances/<int:pk>/seats/",
+        performance_seats,
+        name="async-performance-seats",
+    ),
+    path("async/plays/", play_list, name="async-play-list"),
+]
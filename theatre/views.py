@@ -1,33 +1,68 @@
+import io
+
+from django.db.models import Count, F, Prefetch
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.request import Request
-
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.db_router import ReplicaReadMixin
+from theatre.cache import CachedListMixin, CachedRetrieveMixin
+from theatre.export import EXPORT_CONTENT_TYPES, export_queryset, stream_export
+from theatre.fast_serializers import (
+    FastListMixin,
+    FastPerformanceListSerializer,
+    FastPlayListSerializer,
+    FastTicketListSerializer,
+)
+from theatre.filters import PerformanceFilter
+from theatre.holds import active_holds, release_holds, taken_seats
+from theatre.importer import (
+    IMPORT_KINDS,
+    CatalogueImporter,
+    CatalogueImportError,
+    read_csv,
+)
 from theatre.models import (
     Actor,
     Genre,
     Performance,
     Play,
     Reservation,
+    SeatHold,
     TheatreHall,
     Ticket,
 )
 from theatre.pagination import CustomPagination
 from theatre.permissions import IsAdminOrIfAuthenticatedReadOnly
+from theatre.search import SEARCH_QUERY_PARAM, search
+from theatre.seat_map import build_seat_map
 from theatre.serializers import (
     ActorImageSerializer,
     ActorSerializer,
+    CatalogueImportReportSerializer,
+    CatalogueImportSerializer,
     GenreSerializer,
     PerformanceDetailSerializer,
     PerformanceListSerializer,
+    PerformanceSeatMapSerializer,
     PerformanceSerializer,
     PlayDetailSerializer,
     PlayImageSerializer,
     PlayListSerializer,
     PlaySerializer,
     ReservationDetailSerializer,
+    ReservationExportSerializer,
     ReservationListSerializer,
     ReservationSerializer,
+    SeatHoldSerializer,
     TheatreHallDetailSerializer,
     TheatreHallListSerializer,
     TheatreHallSerializer,
@@ -38,6 +73,8 @@ from theatre.serializers import (
 
 
 class GenreViewSet(
+    ReplicaReadMixin,
+    CachedListMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     viewsets.GenericViewSet
@@ -48,12 +85,26 @@ class GenreViewSet(
     pagination_class = CustomPagination
 
 
-class ActorViewSet(viewsets.ModelViewSet):
+class ActorViewSet(
+    ReplicaReadMixin,
+    CachedListMixin,
+    CachedRetrieveMixin,
+    viewsets.ModelViewSet
+):
     queryset = Actor.objects.order_by("last_name")
     serializer_class = ActorSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
     pagination_class = CustomPagination
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        query = self.request.query_params.get(SEARCH_QUERY_PARAM)
+        if self.action == "list" and query:
+            return search(queryset, query)
+
+        return queryset
+
     def get_serializer_class(self):
         if self.action == "upload_image":
             return ActorImageSerializer
@@ -69,13 +120,46 @@ class ActorViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class PlayViewSet(viewsets.ModelViewSet):
-    queryset = Play.objects.prefetch_related("actors", "genres")
+class PlayViewSet(
+    ReplicaReadMixin,
+    CachedListMixin,
+    CachedRetrieveMixin,
+    FastListMixin,
+    viewsets.ModelViewSet
+):
+    queryset = Play.objects.all()
     serializer_class = PlaySerializer
+    fast_list_serializer_class = FastPlayListSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
     pagination_class = CustomPagination
     filterset_fields = ("actors", "genres")
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        if self.action == "list":
+            query = self.request.query_params.get(SEARCH_QUERY_PARAM)
+            if query:
+                queryset = search(queryset, query)
+
+            return queryset.only("id", "title", "poster").prefetch_related(
+                Prefetch(
+                    "actors",
+                    queryset=Actor.objects.only(
+                        "id", "first_name", "last_name"
+                    ).order_by("id")
+                ),
+                Prefetch("genres", queryset=Genre.objects.order_by("id")),
+            )
+
+        if self.action == "retrieve":
+            return queryset.prefetch_related("actors", "genres")
+
+        return queryset.prefetch_related(
+            Prefetch("actors", queryset=Actor.objects.only("id")),
+            Prefetch("genres", queryset=Genre.objects.only("id")),
+        )
+
     def get_serializer_class(self):
         if self.action == "list":
             return PlayListSerializer
@@ -95,7 +179,12 @@ class PlayViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class TheatreHallViewSet(viewsets.ModelViewSet):
+class TheatreHallViewSet(
+    ReplicaReadMixin,
+    CachedListMixin,
+    CachedRetrieveMixin,
+    viewsets.ModelViewSet
+):
     queryset = TheatreHall.objects.all()
     serializer_class = TheatreHallSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
@@ -110,26 +199,76 @@ class TheatreHallViewSet(viewsets.ModelViewSet):
         return TheatreHallSerializer
 
 
-class PerformanceViewSet(viewsets.ModelViewSet):
-    queryset = Performance.objects.select_related("play", "theatre_hall")
+class PerformanceViewSet(
+    ReplicaReadMixin,
+    FastListMixin,
+    viewsets.ModelViewSet
+):
+    queryset = Performance.objects.select_related(
+        "play", "theatre_hall"
+    ).order_by("show_time", "id")
     serializer_class = PerformanceSerializer
+    fast_list_serializer_class = FastPerformanceListSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
     pagination_class = CustomPagination
-    filterset_fields = ("play", "theatre_hall", "show_time")
+    filterset_class = PerformanceFilter
+    cursor_ordering = "show_time"
+    # Seat maps show tickets and holds, which users expect to see
+    # right after they reserve
+    replica_actions = {"list", "retrieve"}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        if self.action == "list":
+            capacity = (
+                F("theatre_hall__rows") * F("theatre_hall__seats_in_row")
+            )
+            return queryset.annotate(
+                capacity=capacity,
+                tickets_available=capacity - Count("tickets"),
+            )
+
+        if self.action == "retrieve":
+            return queryset.prefetch_related(
+                Prefetch("play__actors", queryset=Actor.objects.only("id")),
+                Prefetch("play__genres", queryset=Genre.objects.only("id")),
+            )
+
+        return queryset
 
     def get_serializer_class(self):
         if self.action == "list":
             return PerformanceListSerializer
         if self.action == "retrieve":
             return PerformanceDetailSerializer
+        if self.action == "seats":
+            return PerformanceSeatMapSerializer
         return PerformanceSerializer
 
+    @action(detail=True, methods=["GET"], url_path="seats")
+    def seats(self, request: Request, pk: int = None):
+        """
+        Return the sold and held seats of the whole hall as a packed bitmap.
+        """
+        performance = self.get_object()
+        hall = performance.theatre_hall
+        serializer = self.get_serializer(build_seat_map(
+            performance.id,
+            hall.rows,
+            hall.seats_in_row,
+            taken_seats(performance.id),
+        ))
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
 
 class ReservationViewSet(viewsets.ModelViewSet):
     queryset = Reservation.objects.all()
     serializer_class = ReservationSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
     pagination_class = CustomPagination
+    cursor_ordering = "-created_at"
+    throttle_scopes = {"create": "reservations"}
 
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -146,24 +285,58 @@ class ReservationViewSet(viewsets.ModelViewSet):
                 "tickets__performance__theatre_hall"
             )
 
-        return queryset.filter(user=self.request.user)
+        return queryset.filter(user_id=self.request.user.id)
 
     def perform_create(self, serializer: ReservationSerializer):
-        serializer.save(user=self.request.user)
+        serializer.save(user_id=self.request.user.id)
 
     def get_serializer_class(self):
         if self.action == "list":
             return ReservationListSerializer
         if self.action == "retrieve":
             return ReservationDetailSerializer
+        if self.action == "export":
+            return ReservationExportSerializer
         return ReservationSerializer
 
+    @action(
+        detail=False,
+        methods=["GET"],
+        url_path="export",
+        permission_classes=(IsAdminUser,),
+    )
+    def export(self, request: Request):
+        """
+        Stream the tickets of every reservation created in [start, end)
+        as flat CSV or NDJSON rows.
+        """
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        file_format = serializer.validated_data["file_format"]
+
+        queryset = export_queryset(
+            serializer.validated_data.get("start"),
+            serializer.validated_data.get("end"),
+        )
+        filename = (
+            f"reservations-{timezone.now():%Y%m%d%H%M%S}.{file_format}"
+        )
+        return StreamingHttpResponse(
+            stream_export(queryset, file_format),
+            content_type=EXPORT_CONTENT_TYPES[file_format],
+            headers={
+                "Content-Disposition": f'attachment; filename="{filename}"'
+            },
+        )
+
 
-class TicketViewSet(viewsets.ModelViewSet):
+class TicketViewSet(FastListMixin, viewsets.ModelViewSet):
     queryset = Ticket.objects.all()
     serializer_class = TicketSerializer
+    fast_list_serializer_class = FastTicketListSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
     pagination_class = CustomPagination
+    cursor_ordering = "id"
 
     def get_queryset(self):
         queryset = super().get_queryset().select_related(
@@ -172,7 +345,7 @@ class TicketViewSet(viewsets.ModelViewSet):
             "reservation",
         )
 
-        return queryset.filter(reservation__user=self.request.user)
+        return queryset.filter(reservation__user_id=self.request.user.id)
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -180,3 +353,113 @@ class TicketViewSet(viewsets.ModelViewSet):
         if self.action == "retrieve":
             return TicketDetailSerializer
         return TicketSerializer
+
+
+class SeatHoldViewSet(
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet
+):
+    queryset = SeatHold.objects.order_by("expires_at")
+    serializer_class = SeatHoldSerializer
+    permission_classes = (IsAuthenticated,)
+    pagination_class = CustomPagination
+    throttle_scopes = {"create": "seat_holds"}
+
+    def get_queryset(self):
+        return active_holds().filter(
+            user_id=self.request.user.id
+        ).order_by("expires_at")
+
+    def perform_create(self, serializer: SeatHoldSerializer):
+        serializer.save(user_id=self.request.user.id)
+
+    def perform_destroy(self, instance: SeatHold):
+        release_holds(
+            self.request.user.id,
+            [(instance.performance_id, instance.row, instance.seat)]
+        )
+
+
+class CatalogueImportView(APIView):
+    """
+    Upsert genres, actors, halls, plays and performances in one
+    transaction from a JSON body, or from CSV files uploaded under
+    the name of their kind (e.g. plays=@plays.csv).
+    Pass ?dry_run=true to validate without writing anything.
+    """
+
+    permission_classes = (IsAdminUser,)
+
+    @staticmethod
+    def check_csv_upload(request: Request) -> None:
+        """
+        Reject files named after no import kind,
+        and fields sent along with the files.
+        """
+        errors = {
+            kind: [
+                f"Unknown import kind, expected one of "
+                f"{', '.join(IMPORT_KINDS)}."
+            ]
+            for kind in request.FILES
+            if kind not in IMPORT_KINDS
+        }
+        errors.update({
+            field: ["Send either CSV files or a JSON body, not both."]
+            for field in request.data
+            if field not in request.FILES
+        })
+        if errors:
+            raise ValidationError(errors)
+
+    @extend_schema(
+        request={
+            "application/json": CatalogueImportSerializer,
+            "multipart/form-data": {
+                "type": "object",
+                "properties": {
+                    kind: {"type": "string", "format": "binary"}
+                    for kind in IMPORT_KINDS
+                },
+            },
+        },
+        parameters=[
+            OpenApiParameter(
+                "dry_run",
+                OpenApiTypes.BOOL,
+                description="Validate and report without writing anything",
+            ),
+        ],
+        responses={
+            status.HTTP_200_OK: CatalogueImportReportSerializer,
+            status.HTTP_201_CREATED: CatalogueImportReportSerializer,
+        },
+    )
+    def post(self, request: Request):
+        data = request.data
+        if request.FILES:
+            self.check_csv_upload(request)
+            data = {
+                kind: read_csv(
+                    kind, io.TextIOWrapper(file.file, encoding="utf-8-sig")
+                )
+                for kind, file in request.FILES.items()
+            }
+
+        serializer = CatalogueImportSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        dry_run = request.query_params.get("dry_run") == "true"
+        try:
+            report = CatalogueImporter(serializer.validated_data).run(
+                dry_run=dry_run
+            )
+        except CatalogueImportError as error:
+            raise ValidationError(error.errors)
+
+        return Response(
+            report,
+            status=status.HTTP_200_OK if dry_run else status.HTTP_201_CREATED
+        )
@@ -14,12 +14,17 @@ env_path = Path(__file__).resolve().parent.parent / ".env"
 load_dotenv(env_path)
 
 
-def get_env_variable(variable_name: str) -> str:
+def get_env_variable(
+    variable_name: str,
+    default: str | None = None
+) -> str:
     """
     Retrieve the value of an environment variable.
     :param variable_name: The name of the environment variable to retrieve.
+    :param default: The value to use when the variable is not set.
     :return: The value of the environment variable.
-    :raises KeyError: If the environment variable is not found.
+    :raises KeyError: If the environment variable is not found
+    and no default is given.
     """
     try:
         var_value = os.environ[variable_name]
@@ -29,6 +34,12 @@ def get_env_variable(variable_name: str) -> str:
         )
         return var_value
     except KeyError:
+        if default is not None:
+            logging.info(
+                f"The {variable_name} environment variable is not set,"
+                f" using the default"
+            )
+            return default
         error_msg = f"Set the {variable_name} environment variable"
         logging.error(error_msg)
         raise KeyError({"error": error_msg})